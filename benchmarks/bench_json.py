@@ -0,0 +1,82 @@
+"""
+Benchmark de serialização JSON: provedor padrão do Flask x PedidosJSONProvider
+
+Serializa a resposta de uma listagem com 10 mil pedidos (3 itens cada),
+como faria jsonify nas rotas.
+
+Uso:
+    python benchmarks/bench_json.py [quantidade_de_pedidos] [repeticoes]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import src.json_provider as json_provider
+from src.json_provider import PedidosJSONProvider
+from src.models.pedido import ItemPedido, Pedido, StatusPedido
+
+
+def montar_pedidos(quantidade):
+    """Pedidos serializados com to_dict(), como nas listagens"""
+    inicio = datetime(2024, 1, 1, 12, 0, 0)
+    pedidos = []
+    for i in range(quantidade):
+        pedido = Pedido(id=i + 1, cliente_id='12345678901', status=list(StatusPedido)[i % 4],
+                        total=Decimal('39.40'), data_criacao=inicio + timedelta(seconds=i),
+                        data_atualizacao=inicio + timedelta(seconds=i, microseconds=1500))
+        for j, (nome, categoria, preco) in enumerate([('Hambúrguer', 'Lanche', '18.90'),
+                                                       ('Batata Frita', 'Acompanhamento', '8.00'),
+                                                       ('Refrigerante', 'Bebida', '6.25')]):
+            pedido.itens.append(ItemPedido(id=i * 3 + j + 1, produto_id=j + 1, nome_produto=nome, categoria=categoria,
+                                           quantidade=1 + j % 2, preco_unitario=Decimal(preco),
+                                           observacoes='Sem cebola' if j == 0 else None))
+        pedidos.append(pedido.to_dict())
+    return pedidos
+
+
+def medir(app, documento, repeticoes):
+    """Melhor tempo de app.json.response(documento), em segundos"""
+    melhores = []
+    with app.app_context():
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            response = app.json.response(documento)
+            melhores.append(time.perf_counter() - inicio)
+    return min(melhores), len(response.get_data())
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    documento = {'pedidos': montar_pedidos(quantidade), 'total': quantidade}
+    
+    padrao = Flask('padrao')
+    padrao.json = DefaultJSONProvider(padrao)
+    provedor = Flask('provedor')
+    provedor.json = PedidosJSONProvider(provedor)
+    
+    resultados = [('Flask DefaultJSONProvider (antes)', *medir(padrao, documento, repeticoes))]
+    
+    if json_provider.orjson is not None:
+        resultados.append(('PedidosJSONProvider + orjson', *medir(provedor, documento, repeticoes)))
+    orjson, json_provider.orjson = json_provider.orjson, None
+    try:
+        resultados.append(('PedidosJSONProvider (fallback stdlib)', *medir(provedor, documento, repeticoes)))
+    finally:
+        json_provider.orjson = orjson
+    
+    base = resultados[0][1]
+    print(f'{quantidade} pedidos, melhor de {repeticoes} execuções')
+    for nome, segundos, tamanho in resultados:
+        print(f'{nome:40s} {segundos * 1000:9.1f} ms  {tamanho / 1024:8.0f} KiB  {base / segundos:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Relatório de partida a frio: tempo de `import src.main` (-X importtime) e de create_app()
+
+Cada execução é um interpretador novo, como um worker recém-criado ou uma
+instância do App Runner subindo. Os orçamentos verificados nos testes
+ficam em tests/unit/test_inicializacao.py.
+
+Uso:
+    python benchmarks/bench_partida.py [execucoes] [modulos_no_relatorio]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CODIGO = (
+    'import time; from src.main import create_app; '
+    'inicio = time.perf_counter(); create_app(); print(time.perf_counter() - inicio)'
+)
+
+
+def executar(ambiente):
+    """Uma partida: (relatório do importtime por módulo, segundos de create_app())"""
+    saida = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CODIGO],
+        cwd=RAIZ, env=ambiente, capture_output=True, text=True, check=True
+    )
+    modulos = {}
+    for linha in saida.stderr.splitlines():
+        partes = [parte.strip() for parte in linha.split('|')]
+        if len(partes) == 3 and partes[1].isdigit():
+            proprio = int(partes[0].rsplit(':', 1)[1])
+            modulos[partes[2]] = (proprio, int(partes[1]))
+    return modulos, float(saida.stdout)
+
+
+def main():
+    execucoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    no_relatorio = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        ambiente = {**os.environ, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(diretorio, 'pedidos.db')}"}
+        ambiente.pop('PRODUTOS_SYNC_URL', None)
+        resultados = [executar(ambiente) for _ in range(execucoes)]
+    
+    importacao = [modulos['src.main'][1] / 1e6 for modulos, _ in resultados]
+    criacao = [segundos for _, segundos in resultados]
+    print(f'{execucoes} partida(s) a frio')
+    print(f'  import src.main   mediana {statistics.median(importacao) * 1000:7.1f} ms   mínimo {min(importacao) * 1000:7.1f} ms')
+    print(f'  create_app()      mediana {statistics.median(criacao) * 1000:7.1f} ms   mínimo {min(criacao) * 1000:7.1f} ms')
+    
+    # Pacotes de topo que mais pesam na importação (tempo acumulado, última execução)
+    modulos = resultados[-1][0]
+    topo = sorted(
+        ((acumulado, nome) for nome, (_, acumulado) in modulos.items() if '.' not in nome),
+        reverse=True
+    )[:no_relatorio]
+    print('\nPacotes de topo por tempo acumulado de importação:')
+    for acumulado, nome in topo:
+        print(f'  {acumulado / 1000:8.1f} ms  {nome}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark de criação de pedidos: N x POST /api/pedidos contra um POST /api/pedidos/batch
+
+Usa um banco SQLite em arquivo temporário e o cliente de teste do Flask,
+medindo só o trabalho do serviço (sem rede).
+
+Uso:
+    python benchmarks/bench_pedidos_lote.py [quantidade_de_pedidos]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from src.json_provider import PedidosJSONProvider
+from src.models.pedido import Pedido, db
+from src.routes.pedidos import pedidos_bp
+
+
+def criar_app(caminho):
+    app = Flask('bench')
+    app.json = PedidosJSONProvider(app)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{caminho}'
+    db.init_app(app)
+    app.register_blueprint(pedidos_bp, url_prefix='/api')
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def montar_pedido(i):
+    return {
+        'cliente_id': '12345678901',
+        'itens': [
+            {'produto_id': 1, 'nome_produto': 'Hambúrguer', 'categoria': 'Lanche', 'quantidade': 1 + i % 2,
+             'preco_unitario': 18.90, 'observacoes': 'Sem cebola'},
+            {'produto_id': 2, 'nome_produto': 'Batata Frita', 'categoria': 'Acompanhamento', 'quantidade': 1,
+             'preco_unitario': 8.00},
+            {'produto_id': 3, 'nome_produto': 'Refrigerante', 'categoria': 'Bebida', 'quantidade': 1,
+             'preco_unitario': 6.25},
+        ]
+    }
+
+
+def medir(nome, quantidade, enviar):
+    with tempfile.TemporaryDirectory() as diretorio:
+        app = criar_app(os.path.join(diretorio, 'bench.db'))
+        pedidos = [montar_pedido(i) for i in range(quantidade)]
+        with app.test_client() as cliente:
+            inicio = time.perf_counter()
+            enviar(cliente, pedidos)
+            segundos = time.perf_counter() - inicio
+        with app.app_context():
+            assert Pedido.query.count() == quantidade
+            db.engine.dispose()
+    return nome, segundos
+
+
+def individual(cliente, pedidos):
+    for pedido in pedidos:
+        assert cliente.post('/api/pedidos', json=pedido).status_code == 201
+
+
+def em_lote(cliente, pedidos):
+    assert cliente.post('/api/pedidos/batch', json={'pedidos': pedidos}).status_code == 201
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    resultados = [
+        medir('N x POST /api/pedidos', quantidade, individual),
+        medir('POST /api/pedidos/batch', quantidade, em_lote),
+    ]
+    
+    base = resultados[0][1]
+    print(f'{quantidade} pedidos com 3 itens, SQLite em arquivo')
+    for nome, segundos in resultados:
+        print(f'{nome:30s} {segundos * 1000:9.1f} ms  {quantidade / segundos:9.0f} pedidos/s  {base / segundos:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
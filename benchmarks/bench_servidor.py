@@ -0,0 +1,154 @@
+"""
+Benchmark de vazão: servidor de desenvolvimento (Werkzeug, debug) x gunicorn (gunicorn.conf.py)
+
+Cada servidor sobe num processo próprio contra um banco SQLite novo com
+pedidos pré-carregados. Processos clientes, cada um com uma conexão
+keep-alive, listam pedidos (GET /api/pedidos?limit=20) durante o tempo
+informado; são medidas requisições por segundo e latências.
+
+Uso:
+    python benchmarks/bench_servidor.py [segundos] [clientes] [workers] [threads]
+"""
+import http.client
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PEDIDOS_INICIAIS = 200
+CAMINHO = '/api/pedidos?limit=20'
+
+PEDIDO = {
+    'cliente_id': '12345678901',
+    'itens': [
+        {'produto_id': 1, 'nome_produto': 'Hambúrguer', 'categoria': 'Lanche', 'quantidade': 1, 'preco_unitario': 18.90},
+        {'produto_id': 2, 'nome_produto': 'Batata Frita', 'categoria': 'Acompanhamento', 'quantidade': 1,
+         'preco_unitario': 8.00},
+    ]
+}
+
+
+def porta_livre():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def aguardar(porta, processo, limite=30):
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim and processo.poll() is None:
+        try:
+            conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=2)
+            conexao.request('GET', '/api/health')
+            if conexao.getresponse().status == 200:
+                conexao.close()
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError('Servidor não respondeu')
+
+
+def popular(porta):
+    conexao = http.client.HTTPConnection('127.0.0.1', porta)
+    corpo = json.dumps(PEDIDO)
+    for _ in range(PEDIDOS_INICIAIS):
+        conexao.request('POST', '/api/pedidos', body=corpo, headers={'Content-Type': 'application/json'})
+        conexao.getresponse().read()
+    conexao.close()
+
+
+def cliente(porta, segundos):
+    """Laço de um processo cliente: (requisições, erros, latências em ms)"""
+    conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=30)
+    latencias = []
+    erros = 0
+    fim = time.monotonic() + segundos
+    while time.monotonic() < fim:
+        inicio = time.perf_counter()
+        try:
+            conexao.request('GET', CAMINHO)
+            resposta = conexao.getresponse()
+            resposta.read()
+            if resposta.status != 200:
+                erros += 1
+        except (OSError, http.client.HTTPException):
+            erros += 1
+            conexao.close()
+            conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=30)
+            continue
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    conexao.close()
+    return len(latencias), erros, latencias
+
+
+def medir(nome, comando, ambiente, segundos, clientes):
+    porta = porta_livre()
+    ambiente = {**ambiente, 'PORT': str(porta)}
+    processo = subprocess.Popen(
+        [arg.replace('{porta}', str(porta)) for arg in comando],
+        cwd=RAIZ, env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+    try:
+        aguardar(porta, processo)
+        popular(porta)
+        with ProcessPoolExecutor(clientes) as executor:
+            resultados = list(executor.map(cliente, [porta] * clientes, [segundos] * clientes))
+    finally:
+        # O reloader do servidor de desenvolvimento cria um processo filho: encerrar o grupo todo
+        if processo.poll() is None:
+            os.killpg(processo.pid, signal.SIGTERM)
+        processo.wait()
+    
+    total = sum(requisicoes for requisicoes, _, _ in resultados)
+    erros = sum(erros for _, erros, _ in resultados)
+    latencias = sorted(latencia for _, _, lista in resultados for latencia in lista)
+    p99 = latencias[int(len(latencias) * 0.99)] if latencias else 0
+    print(f'{nome:<34} {total / segundos:8.0f} req/s   p50 {statistics.median(latencias or [0]):6.1f} ms'
+          f'   p99 {p99:6.1f} ms   erros {erros}')
+    return total / segundos
+
+
+def main():
+    segundos = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    clientes = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    workers = sys.argv[3] if len(sys.argv) > 3 else str(os.cpu_count())
+    threads = sys.argv[4] if len(sys.argv) > 4 else '4'
+    
+    print(f'{clientes} clientes keep-alive, {segundos:.0f} s, GET {CAMINHO}')
+    vazoes = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        servidores = {
+            'desenvolvimento (flask run --debug)': [
+                sys.executable, '-m', 'flask', '--app', 'src.main', 'run', '--debug', '--port', '{porta}'
+            ],
+            f'gunicorn ({workers} workers x {threads} threads)': [
+                sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--access-logfile', os.devnull,
+                'src.wsgi:app'
+            ],
+        }
+        for indice, (nome, comando) in enumerate(servidores.items()):
+            ambiente = {
+                **os.environ,
+                'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(diretorio, f'pedidos_{indice}.db')}",
+                'WEB_CONCURRENCY': workers,
+                'WSGI_THREADS': threads,
+            }
+            ambiente.pop('PRODUTOS_SYNC_URL', None)
+            subprocess.run([sys.executable, '-m', 'flask', '--app', 'src.main', 'inicializar-banco'],
+                           cwd=RAIZ, env=ambiente, capture_output=True, check=True)
+            vazoes[nome] = medir(nome, comando, ambiente, segundos, clientes)
+    
+    base, gunicorn = vazoes.values()
+    print(f'\nGanho de vazão: {gunicorn / base:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
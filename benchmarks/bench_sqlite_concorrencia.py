@@ -0,0 +1,100 @@
+"""
+Benchmark de concorrência no SQLite: PRAGMAs padrão x perfil de produção (WAL)
+
+Threads escritoras criam pedidos (como os quiosques) enquanto threads
+leitoras listam pedidos (como a tela da cozinha), todas contra o
+mesmo banco em arquivo, pelo cliente de teste do Flask.
+
+Uso:
+    python benchmarks/bench_sqlite_concorrencia.py [segundos] [escritores] [leitores]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from src.json_provider import PedidosJSONProvider
+from src.models.pedido import db
+from src.models.sqlite import PRAGMAS_PADRAO, aplicar_pragmas_sqlite
+from src.routes.pedidos import pedidos_bp
+
+PEDIDO = {
+    'cliente_id': '12345678901',
+    'itens': [
+        {'produto_id': 1, 'nome_produto': 'Hambúrguer', 'categoria': 'Lanche', 'quantidade': 1, 'preco_unitario': 18.90},
+        {'produto_id': 2, 'nome_produto': 'Batata Frita', 'categoria': 'Acompanhamento', 'quantidade': 1,
+         'preco_unitario': 8.00},
+    ]
+}
+
+
+def criar_app(caminho, pragmas):
+    app = Flask('bench')
+    app.json = PedidosJSONProvider(app)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{caminho}'
+    db.init_app(app)
+    app.register_blueprint(pedidos_bp, url_prefix='/api')
+    with app.app_context():
+        if pragmas is not None:
+            aplicar_pragmas_sqlite(db.engine, pragmas)
+        db.create_all()
+    return app
+
+
+def executar(app, segundos, escritores, leitores):
+    contagem = Counter()
+    lock = threading.Lock()
+    fim = time.monotonic() + segundos
+    
+    def laco(requisicao, tipo):
+        with app.test_client() as cliente:
+            while time.monotonic() < fim:
+                status = requisicao(cliente).status_code
+                with lock:
+                    contagem[tipo if status < 400 else 'erros'] += 1
+    
+    threads = [threading.Thread(target=laco, args=(lambda c: c.post('/api/pedidos', json=PEDIDO), 'escritas'))
+               for _ in range(escritores)]
+    threads += [threading.Thread(target=laco, args=(lambda c: c.get('/api/pedidos?limit=50'), 'leituras'))
+                for _ in range(leitores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return contagem
+
+
+def medir(nome, pragmas, segundos, escritores, leitores):
+    with tempfile.TemporaryDirectory() as diretorio:
+        app = criar_app(os.path.join(diretorio, 'bench.db'), pragmas)
+        contagem = executar(app, segundos, escritores, leitores)
+        with app.app_context():
+            db.engine.dispose()
+    return nome, contagem
+
+
+def main():
+    segundos = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    escritores = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    leitores = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    
+    resultados = [
+        medir('PRAGMAs padrão (antes)', None, segundos, escritores, leitores),
+        medir('Perfil de produção (WAL)', PRAGMAS_PADRAO, segundos, escritores, leitores),
+    ]
+    
+    print(f'{escritores} escritores + {leitores} leitores, {segundos:.0f} s cada')
+    for nome, contagem in resultados:
+        total = contagem['escritas'] + contagem['leituras']
+        print(f"{nome:28s} {contagem['escritas'] / segundos:8.0f} escritas/s  {contagem['leituras'] / segundos:8.0f} "
+              f"leituras/s  {total / segundos:8.0f} req/s  {contagem['erros']:5d} erros")
+
+
+if __name__ == '__main__':
+    main()
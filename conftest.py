@@ -16,7 +16,7 @@ os.environ['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 # Importar após configurar ambiente
-from src.main import app, db
+from src.main import create_app, db
 
 @pytest.fixture(scope='session')
 def test_app():
@@ -24,7 +24,7 @@ def test_app():
     Fixture para criar aplicação Flask de teste
     """
     # Forçar configuração de teste
-    app.config.update({
+    app = create_app({
         'TESTING': True,
         'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
         'WTF_CSRF_ENABLED': False,
@@ -38,9 +38,6 @@ def test_app():
     
     # Criar contexto da aplicação e configurar banco
     with app.app_context():
-        # Garantir que o db está inicializado com a app
-        db.init_app(app)
-        
         # Criar todas as tabelas
         db.create_all()
         print("✅ Tabelas do banco criadas para testes")
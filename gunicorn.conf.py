@@ -0,0 +1,79 @@
+"""
+Configuração do gunicorn para produção
+
+    flask --app src.main inicializar-banco
+    gunicorn -c gunicorn.conf.py src.wsgi:app
+
+Variáveis:
+    PORT                    porta (padrão 5000)
+    WEB_CONCURRENCY         workers (processos); padrão: número de CPUs
+    WSGI_THREADS            threads por worker para requisições comuns (padrão 4); também
+                            dimensiona o pool do banco (src/config.py)
+    CONEXOES_LONGAS_MAXIMO  streams SSE e long-polls simultâneos por worker (padrão 32), com
+                            threads próprias; acima disso a API responde 503 com Retry-After
+    GUNICORN_TIMEOUT        segundos sem sinal de vida até o worker ser reiniciado (padrão 30)
+    GRACEFUL_TIMEOUT        segundos para concluir as requisições em andamento após SIGTERM (padrão 30)
+"""
+import gc
+import multiprocessing
+import os
+import signal
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY') or multiprocessing.cpu_count())
+threads_requisicoes = int(os.environ.get('WSGI_THREADS') or 4)
+conexoes_longas = int(os.environ.get('CONEXOES_LONGAS_MAXIMO') or 32)
+# No gthread cada stream SSE ou long-poll aberto ocupa uma thread até terminar.
+# Essas conexões têm uma cota própria de threads, limitada na aplicação
+# (CONEXOES_LONGAS_MAXIMO, 503 acima dela): as WSGI_THREADS restantes
+# continuam livres para o resto da API mesmo com todas as telas conectadas
+threads = threads_requisicoes + conexoes_longas
+worker_class = 'gthread'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+accesslog = '-'
+errorlog = '-'
+
+# Carrega a aplicação no mestre; os workers herdam o código já importado
+preload_app = True
+
+# O pool do banco de cada worker é dimensionado por WSGI_THREADS (conexões longas
+# só leem o banco de passagem); a aplicação é lida depois deste arquivo
+os.environ.setdefault('WSGI_THREADS', str(threads_requisicoes))
+os.environ.setdefault('CONEXOES_LONGAS_MAXIMO', str(conexoes_longas))
+os.environ.setdefault('WEB_CONCURRENCY', str(workers))
+
+# Sem coletas durante o preload: objetos liberados deixariam buracos nas páginas que os workers vão compartilhar
+gc.disable()
+
+
+def pre_fork(server, worker):
+    # Move tudo o que foi carregado para a geração permanente: o GC dos workers
+    # não percorre (nem escreve nos cabeçalhos de) esses objetos, e as páginas
+    # continuam compartilhadas por copy-on-write
+    gc.freeze()
+    gc.enable()
+
+
+def post_worker_init(worker):
+    from src.wsgi import iniciar_worker, liberar_conexoes_longas
+    
+    app = worker.wsgi
+    iniciar_worker(app)
+    
+    # O SIGTERM do gunicorn só para de aceitar conexões e espera as requisições
+    # em andamento; streams SSE nunca terminariam sozinhos dentro do graceful_timeout
+    ao_sair = signal.getsignal(signal.SIGTERM)
+    
+    def ao_sigterm(sinal, quadro):
+        liberar_conexoes_longas(app)
+        ao_sair(sinal, quadro)
+    
+    signal.signal(signal.SIGTERM, ao_sigterm)
+
+
+def worker_exit(server, worker):
+    from src.wsgi import encerrar_worker
+    
+    encerrar_worker(worker.wsgi, timeout=5)
@@ -0,0 +1,129 @@
+"""
+Configuração do banco de dados a partir de variáveis de ambiente
+
+Perfis:
+
+- SQLite (padrão, arquivo em src/database/pedidos.db): um único processo
+  escritor por vez; os PRAGMAs de src/models/sqlite.py (WAL, busy_timeout)
+  cuidam da concorrência. Com arquivo, o SQLAlchemy 2 também usa QueuePool
+  (por padrão 5 + 10 conexões, pouco para os workers do gunicorn.conf.py):
+  pool_size segue o mesmo cálculo do PostgreSQL e o excedente cobre as
+  conexões longas (CONEXOES_LONGAS_MAXIMO), que só custam um arquivo
+  aberto. Bancos em memória não usam QueuePool e ficam sem opções.
+- PostgreSQL (SQLALCHEMY_DATABASE_URI ou DATABASE_URL=postgresql://...):
+  cada processo (worker WSGI) tem seu próprio pool, dimensionado pelo
+  número de threads do worker (WSGI_THREADS) mais uma conexão para cada
+  thread de fundo. O total aberto no servidor é
+  WEB_CONCURRENCY x (DB_POOL_SIZE + DB_MAX_OVERFLOW), que deve caber em
+  max_connections; com DB_MAX_CONEXOES definido, esse limite é dividido
+  entre os workers automaticamente.
+
+Variáveis:
+    SQLALCHEMY_DATABASE_URI / DATABASE_URL   URI do banco
+    WEB_CONCURRENCY, WSGI_THREADS            workers e threads por worker
+    CONEXOES_LONGAS_MAXIMO                   streams SSE e long-polls por worker (excedente do SQLite)
+    DB_MAX_CONEXOES                          conexões disponíveis para o serviço inteiro
+    DB_POOL_SIZE, DB_MAX_OVERFLOW            sobrescrevem o dimensionamento automático
+    DB_POOL_RECYCLE, DB_POOL_TIMEOUT         segundos
+    DB_POOL_PRE_PING                         1/0
+    SQLALCHEMY_ENGINE_OPTIONS                JSON mesclado por cima das opções acima
+"""
+import json
+import os
+from typing import Any, Dict, Mapping, Optional
+
+from src.services.eventos import CONEXOES_LONGAS_PADRAO
+
+CAMINHO_SQLITE_PADRAO = os.path.join(os.path.dirname(__file__), 'database', 'pedidos.db')
+
+# Conexões extras por processo para threads de fundo (sincronização de produtos
+# e propagação de eventos entre workers)
+CONEXOES_FUNDO = 2
+
+# Abaixo do tempo ocioso típico de proxies/balanceadores que derrubam conexões
+POOL_RECYCLE_PADRAO = 1800
+POOL_TIMEOUT_PADRAO = 30
+
+_VERDADEIROS = ('1', 'true', 'yes', 'sim', 'on')
+
+
+def uri_banco(ambiente: Optional[Mapping[str, str]] = None) -> str:
+    """URI do banco: SQLALCHEMY_DATABASE_URI, DATABASE_URL ou o SQLite do projeto"""
+    ambiente = os.environ if ambiente is None else ambiente
+    uri = ambiente.get('SQLALCHEMY_DATABASE_URI') or ambiente.get('DATABASE_URL')
+    if not uri:
+        return f'sqlite:///{CAMINHO_SQLITE_PADRAO}'
+    # Heroku e afins ainda usam o esquema antigo, que o SQLAlchemy 2 não aceita
+    if uri.startswith('postgres://'):
+        uri = 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+
+def _inteiro(ambiente: Mapping[str, str], nome: str, padrao: int) -> int:
+    valor = ambiente.get(nome)
+    return int(valor) if valor not in (None, '') else padrao
+
+
+def _sqlite_em_memoria(uri: str) -> bool:
+    return uri in ('sqlite://', 'sqlite:///') or ':memory:' in uri or 'mode=memory' in uri
+
+
+def opcoes_engine(uri: str, ambiente: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS para a URI informada
+    
+    Args:
+        uri: URI do banco
+        ambiente: Variáveis de ambiente (os.environ se omitido)
+    
+    Returns:
+        Dict: Opções do create_engine; vazio para SQLite em memória, que não usa QueuePool
+    """
+    ambiente = os.environ if ambiente is None else ambiente
+    opcoes: Dict[str, Any] = {}
+    threads = _inteiro(ambiente, 'WSGI_THREADS', 1)
+    pool_size = threads + CONEXOES_FUNDO
+    
+    if uri.startswith('sqlite'):
+        if not _sqlite_em_memoria(uri):
+            opcoes.update({
+                'pool_size': _inteiro(ambiente, 'DB_POOL_SIZE', pool_size),
+                'max_overflow': _inteiro(ambiente, 'DB_MAX_OVERFLOW',
+                                         _inteiro(ambiente, 'CONEXOES_LONGAS_MAXIMO', CONEXOES_LONGAS_PADRAO)),
+                'pool_timeout': _inteiro(ambiente, 'DB_POOL_TIMEOUT', POOL_TIMEOUT_PADRAO),
+            })
+    else:
+        max_overflow = max(2, pool_size // 2)
+        
+        # Orçamento por worker quando o total de conexões do banco é limitado
+        maximo = _inteiro(ambiente, 'DB_MAX_CONEXOES', 0)
+        if maximo:
+            por_worker = max(1, maximo // max(1, _inteiro(ambiente, 'WEB_CONCURRENCY', 1)))
+            pool_size = min(pool_size, por_worker)
+            max_overflow = por_worker - pool_size
+        
+        pool_size = _inteiro(ambiente, 'DB_POOL_SIZE', pool_size)
+        opcoes.update({
+            'pool_size': pool_size,
+            'max_overflow': _inteiro(ambiente, 'DB_MAX_OVERFLOW', max_overflow),
+            'pool_recycle': _inteiro(ambiente, 'DB_POOL_RECYCLE', POOL_RECYCLE_PADRAO),
+            'pool_timeout': _inteiro(ambiente, 'DB_POOL_TIMEOUT', POOL_TIMEOUT_PADRAO),
+            'pool_pre_ping': ambiente.get('DB_POOL_PRE_PING', '1').lower() in _VERDADEIROS,
+        })
+    
+    extras = ambiente.get('SQLALCHEMY_ENGINE_OPTIONS')
+    if extras:
+        opcoes.update(json.loads(extras))
+    return opcoes
+
+
+def configurar_banco(config: Dict[str, Any], ambiente: Optional[Mapping[str, str]] = None) -> None:
+    """Preenche URI e opções do engine na configuração do Flask, criando o diretório do SQLite se preciso"""
+    uri = uri_banco(ambiente)
+    config['SQLALCHEMY_DATABASE_URI'] = uri
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = opcoes_engine(uri, ambiente)
+    
+    if uri.startswith('sqlite:///') and ':memory:' not in uri:
+        diretorio = os.path.dirname(uri[len('sqlite:///'):])
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
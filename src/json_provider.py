@@ -0,0 +1,76 @@
+"""
+Provedor JSON das respostas da API
+"""
+import datetime
+import decimal
+import enum
+import typing as t
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+
+def _codificar_padrao(obj: t.Any) -> t.Any:
+    """Converte os tipos do domínio que o JSON não representa nativamente"""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    return DefaultJSONProvider.default(obj)
+
+
+class PedidosJSONProvider(DefaultJSONProvider):
+    """
+    Codifica Decimal, datetime e StatusPedido (Enum) nativamente, no mesmo
+    formato usado pelos to_dict() dos modelos, e usa o orjson quando ele está
+    instalado, com fallback para o json da biblioteca padrão.
+    
+    A saída é UTF-8 (sem escapes \\uXXXX) nos dois caminhos.
+    """
+    
+    default = staticmethod(_codificar_padrao)
+    ensure_ascii = False
+    
+    # Argumentos do json.dumps que o orjson sabe reproduzir
+    _ARGUMENTOS_ORJSON = frozenset({'sort_keys', 'indent'})
+    
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        if orjson is None or not self._ARGUMENTOS_ORJSON.issuperset(kwargs):
+            return super().dumps(obj, **kwargs)
+        try:
+            return self._orjson_dumps(obj, kwargs.get('sort_keys', self.sort_keys), kwargs.get('indent')).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # Casos fora do alcance do orjson (ex.: inteiros acima de 64 bits)
+            return super().dumps(obj, **kwargs)
+    
+    def response(self, *args: t.Any, **kwargs: t.Any):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = None
+        if self.compact is False or (self.compact is None and self._app.debug):
+            indent = 2
+        try:
+            dados = self._orjson_dumps(obj, self.sort_keys, indent, nova_linha=True)
+        except orjson.JSONEncodeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(dados, mimetype=self.mimetype)
+    
+    @staticmethod
+    def _orjson_dumps(obj: t.Any, sort_keys: bool, indent: t.Optional[int], nova_linha: bool = False) -> bytes:
+        # Datas passam pelo default para manter o formato de isoformat()
+        opcoes = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            opcoes |= orjson.OPT_SORT_KEYS
+        if indent:
+            opcoes |= orjson.OPT_INDENT_2
+        if nova_linha:
+            opcoes |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, default=_codificar_padrao, option=opcoes)
@@ -3,64 +3,133 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
+from typing import Any, Dict, Optional
+
 from flask import Flask, send_from_directory, jsonify
 from flask_cors import CORS
+from src.config import configurar_banco
+from src.json_provider import PedidosJSONProvider
 from src.models.pedido import db
+from src.models.migracoes import comando_inicializar_banco, inicializar_banco
+from src.models.sqlite import PRAGMAS_PADRAO, aplicar_pragmas_sqlite
+from src.services.idempotencia import comando_expurgar_idempotencia
+from src.services.sync_produtos import iniciar_sync_produtos
 from src.routes.pedidos import pedidos_bp
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'pedidos_service_secret_key_2024'
-
-# Configurar CORS para permitir comunicação entre microsserviços
-CORS(app, origins="*")
-
-# Registrar blueprints
-app.register_blueprint(pedidos_bp, url_prefix='/api')
-
-# Configuração do banco de dados
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'pedidos.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
-
-# Criar tabelas
-with app.app_context():
-    db.create_all()
-
-@app.route('/api/info', methods=['GET'])
-def service_info():
-    """Informações sobre o microsserviço"""
-    return jsonify({
-        'service': 'pedidos-service',
-        'version': '1.0.0',
-        'description': 'Microsservico responsavel pelo gerenciamento de pedidos',
-        'endpoints': {
-            'health': '/api/health',
-            'pedidos': '/api/pedidos',
-            'produtos': '/api/produtos',
-            'fila': '/api/pedidos/fila'
-        }
-    })
-
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
+
+def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
+    """
+    Cria e configura a aplicação
+
+    Não abre conexões nem altera o schema: as tabelas são criadas pelo
+    comando `flask --app src.main inicializar-banco` (passo de implantação),
+    a fila de produção é carregada no primeiro acesso e a sincronização
+    puxada do catálogo é iniciada por quem executa o servidor
+    (iniciar_sync_produtos), para que a aplicação possa ser importada e
+    pré-carregada sem efeitos colaterais.
+
+    Args:
+        config: Configurações aplicadas por cima das lidas do ambiente
+
+    Returns:
+        Flask: Aplicação pronta para servir
+    """
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.config['SECRET_KEY'] = 'pedidos_service_secret_key_2024'
+    app.json = PedidosJSONProvider(app)
+
+    # Configuração do banco de dados (SQLALCHEMY_DATABASE_URI / DATABASE_URL e pool; ver src/config.py)
+    configurar_banco(app.config)
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Sincronização puxada do catálogo (opcional, desligada sem PRODUTOS_SYNC_URL)
+    app.config['PRODUTOS_SYNC_URL'] = os.environ.get('PRODUTOS_SYNC_URL')
+    if 'PRODUTOS_SYNC_TRAVA' in os.environ:
+        app.config['PRODUTOS_SYNC_TRAVA'] = os.environ['PRODUTOS_SYNC_TRAVA']
+    # Propagação de eventos entre workers (ver src/services/propagacao.py; 0 desliga)
+    if 'EVENTOS_PROPAGACAO_SEGUNDOS' in os.environ:
+        app.config['EVENTOS_PROPAGACAO_SEGUNDOS'] = float(os.environ['EVENTOS_PROPAGACAO_SEGUNDOS'])
+    # Streams SSE e long-polls simultâneos por processo (ver gunicorn.conf.py)
+    if 'CONEXOES_LONGAS_MAXIMO' in os.environ:
+        app.config['CONEXOES_LONGAS_MAXIMO'] = int(os.environ['CONEXOES_LONGAS_MAXIMO'])
+    if config:
+        app.config.update(config)
+
+    # Configurar CORS para permitir comunicação entre microsserviços
+    CORS(app, origins="*")
+
+    db.init_app(app)
+    with app.app_context():
+        # WAL, busy_timeout e demais PRAGMAs em cada conexão (só para SQLite)
+        aplicar_pragmas_sqlite(db.engine, app.config.get('SQLITE_PRAGMAS', PRAGMAS_PADRAO))
+
+    # Registrar blueprints
+    app.register_blueprint(pedidos_bp, url_prefix='/api')
+    _registrar_rotas(app)
+
+    # flask --app src.main inicializar-banco (a cada deploy, antes de subir o servidor)
+    app.cli.add_command(comando_inicializar_banco)
+    # flask --app src.main expurgar-idempotencia (agendar periodicamente, ex.: cron)
+    app.cli.add_command(comando_expurgar_idempotencia)
+
+    return app
+
+
+def _registrar_rotas(app: Flask) -> None:
+    @app.route('/api/info', methods=['GET'])
+    def service_info():
+        """Informações sobre o microsserviço"""
+        return jsonify({
+            'service': 'pedidos-service',
+            'version': '1.0.0',
+            'description': 'Microsservico responsavel pelo gerenciamento de pedidos',
+            'endpoints': {
+                'health': '/api/health',
+                'pedidos': '/api/pedidos',
+                'produtos': '/api/produtos',
+                'fila': '/api/pedidos/fila'
+            }
+        })
+
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        static_folder_path = app.static_folder
+        if static_folder_path is None:
+                return "Static folder not configured", 404
+
+        if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
+            return send_from_directory(static_folder_path, path)
         else:
-            return jsonify({
-                'service': 'pedidos-service',
-                'message': 'Microsserviço de Pedidos está funcionando!',
-                'api_docs': '/api/info'
-            })
+            index_path = os.path.join(static_folder_path, 'index.html')
+            if os.path.exists(index_path):
+                return send_from_directory(static_folder_path, 'index.html')
+            else:
+                return jsonify({
+                    'service': 'pedidos-service',
+                    'message': 'Microsserviço de Pedidos está funcionando!',
+                    'api_docs': '/api/info'
+                })
+
+
+_app: Optional[Flask] = None
+
+
+def __getattr__(nome: str) -> Any:
+    # `src.main.app` (flask --app src.main, from src.main import app) é criado
+    # só no primeiro acesso, para que importar o módulo continue barato
+    global _app
+    if nome == 'app':
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
 
 if __name__ == '__main__':
     # print("Iniciando o microsserviço de Pedidos...")
+    app = create_app()
+    with app.app_context():
+        # Conveniência do servidor de desenvolvimento: banco pronto sem passo separado
+        inicializar_banco()
+    iniciar_sync_produtos(app)
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,73 @@
+"""
+Migrações incrementais do schema para bancos já existentes
+"""
+from typing import List
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import inspect, text
+
+from src.models.pedido import PedidosMeta, db
+
+def aplicar_migracoes() -> List[str]:
+    """
+    Cria as colunas anuláveis e os índices declarados nos modelos que ainda não existem no banco.
+    
+    O db.create_all() só cria tabelas ausentes; bancos criados antes de uma
+    coluna ou índice ser declarado continuariam sem eles. A operação é idempotente.
+    
+    Returns:
+        List[str]: Colunas ('tabela.coluna') e índices criados
+    """
+    criados = []
+    inspetor = inspect(db.engine)
+    preparador = db.engine.dialect.identifier_preparer
+    
+    for tabela in db.metadata.sorted_tables:
+        colunas = {coluna['name'] for coluna in inspetor.get_columns(tabela.name)}
+        for coluna in tabela.columns:
+            if coluna.name in colunas or not coluna.nullable or coluna.primary_key:
+                continue
+            tipo = coluna.type.compile(dialect=db.engine.dialect)
+            with db.engine.begin() as conexao:
+                conexao.execute(text(
+                    f'ALTER TABLE {preparador.format_table(tabela)} '
+                    f'ADD COLUMN {preparador.format_column(coluna)} {tipo}'
+                ))
+            criados.append(f'{tabela.name}.{coluna.name}')
+        
+        existentes = {indice['name'] for indice in inspetor.get_indexes(tabela.name)}
+        for indice in tabela.indexes:
+            if indice.name not in existentes:
+                indice.create(bind=db.engine)
+                criados.append(indice.name)
+    
+    return criados
+
+
+def inicializar_banco() -> List[str]:
+    """
+    Cria as tabelas ausentes e aplica as migrações incrementais
+    
+    Passo explícito de implantação: a aplicação não toca no schema ao ser
+    criada. Também semeia a linha única de pedidos_meta, para que as
+    gravações concorrentes só precisem incrementá-la. Idempotente, pode
+    rodar a cada deploy.
+    
+    Returns:
+        List[str]: Colunas e índices criados por aplicar_migracoes()
+    """
+    db.create_all()
+    criados = aplicar_migracoes()
+    if db.session.get(PedidosMeta, 1) is None:
+        db.session.add(PedidosMeta(id=1, versao=0))
+        db.session.commit()
+    return criados
+
+
+@click.command('inicializar-banco')
+@with_appcontext
+def comando_inicializar_banco():
+    """Cria as tabelas e aplica as migrações pendentes"""
+    criados = inicializar_banco()
+    click.echo(f'Schema atualizado ({len(criados)} coluna(s)/índice(s) criado(s))')
@@ -13,6 +13,15 @@ class StatusPedido(Enum):
 
 class Pedido(db.Model):
     __tablename__ = 'pedidos'
+    __table_args__ = (
+        # Índices alinhados às consultas: listagem geral e paginação por cursor,
+        # fila de produção / filtro por status e pedidos de um cliente
+        db.Index('ix_pedidos_data_criacao_id', 'data_criacao', 'id'),
+        db.Index('ix_pedidos_status_data_criacao', 'status', 'data_criacao', 'id'),
+        db.Index('ix_pedidos_cliente_id_data_criacao', 'cliente_id', 'data_criacao', 'id'),
+        # Marca d'água das listagens (ETag): max(data_atualizacao) resolvido pelo índice
+        db.Index('ix_pedidos_data_atualizacao', 'data_atualizacao'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     cliente_id = db.Column(db.String(11), nullable=True)  # CPF do cliente (opcional)
@@ -47,7 +56,7 @@ class ItemPedido(db.Model):
     __tablename__ = 'itens_pedido'
     
     id = db.Column(db.Integer, primary_key=True)
-    pedido_id = db.Column(db.Integer, db.ForeignKey('pedidos.id'), nullable=False)
+    pedido_id = db.Column(db.Integer, db.ForeignKey('pedidos.id'), nullable=False, index=True)
     produto_id = db.Column(db.Integer, nullable=False)  # ID do produto (vem do serviço de produtos)
     nome_produto = db.Column(db.String(100), nullable=False)  # Cache do nome do produto
     categoria = db.Column(db.String(50), nullable=False)  # Lanche, Acompanhamento, Bebida, Sobremesa
@@ -95,3 +104,58 @@ class Produto(db.Model):
             'disponivel': self.disponivel
         }
 
+
+class PedidosMeta(db.Model):
+    """Contador de alterações da tabela de pedidos (linha única): incrementado na transação de cada gravação"""
+    __tablename__ = 'pedidos_meta'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    versao = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<PedidosMeta versao={self.versao}>'
+
+class CatalogoMeta(db.Model):
+    """Metadados do cache local de produtos (linha única): versão incrementada a cada sincronização"""
+    __tablename__ = 'catalogo_meta'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    versao = db.Column(db.Integer, nullable=False, default=0)
+    hash_conteudo = db.Column(db.String(64))  # Hash canônico da última carga completa (None se desconhecido)
+    # Maior data_atualizacao informada pelo serviço de produtos na sincronização puxada (None: nunca puxou)
+    marca_sync = db.Column(db.DateTime)
+    data_atualizacao = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<CatalogoMeta versao={self.versao}>'
+
+class ProdutoStaging(db.Model):
+    """Tabela de sombra onde uma carga completa do catálogo é montada antes da troca atômica"""
+    __tablename__ = 'produtos_staging'
+    
+    lote = db.Column(db.String(32), primary_key=True)  # Identificador da sincronização em andamento
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    nome = db.Column(db.String(100), nullable=False)
+    categoria = db.Column(db.String(50), nullable=False)
+    preco = db.Column(Numeric(10, 2), nullable=False)
+    descricao = db.Column(db.Text, nullable=True)
+    disponivel = db.Column(db.Boolean, nullable=False, default=True)
+    data_atualizacao = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    criado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ProdutoStaging {self.lote}:{self.id}>'
+
+class ChaveIdempotencia(db.Model):
+    """Resposta de um POST /api/pedidos guardada pelo Idempotency-Key enviado pelo cliente"""
+    __tablename__ = 'chaves_idempotencia'
+    
+    chave = db.Column(db.String(255), primary_key=True)
+    impressao = db.Column(db.String(64), nullable=False)  # SHA-256 do corpo da requisição original
+    pedido_id = db.Column(db.Integer, nullable=False)
+    status_http = db.Column(db.Integer, nullable=False)
+    resposta = db.Column(db.Text, nullable=False)  # Corpo JSON devolvido na primeira execução
+    criado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f'<ChaveIdempotencia {self.chave} -> {self.pedido_id}>'
@@ -0,0 +1,53 @@
+"""
+Perfil de produção do SQLite: PRAGMAs aplicados a cada nova conexão
+"""
+from typing import Dict, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# WAL permite leitores simultâneos a um escritor; synchronous=NORMAL é seguro
+# em WAL (perde no máximo as últimas transações numa queda de energia, sem
+# corromper o banco) e evita um fsync por commit; busy_timeout faz a conexão
+# esperar pelo lock em vez de falhar com "database is locked"
+PRAGMAS_PADRAO: Dict[str, Union[int, str]] = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,           # ms
+    'cache_size': -20000,           # negativo = KiB (~20 MB por conexão)
+    'mmap_size': 268435456,         # 256 MB lidos via memória mapeada
+    'temp_store': 'MEMORY',
+}
+
+
+def aplicar_pragmas_sqlite(engine: Engine, pragmas: Optional[Dict[str, Union[int, str]]] = None) -> bool:
+    """
+    Registra os PRAGMAs para todas as conexões que o engine abrir a partir de agora
+    
+    Args:
+        engine: Engine do SQLAlchemy (ignorado se não for SQLite)
+        pragmas: PRAGMAs e valores; PRAGMAS_PADRAO se omitido
+    
+    Returns:
+        bool: True se o engine é SQLite e os PRAGMAs foram registrados
+    """
+    if engine.dialect.name != 'sqlite':
+        return False
+    pragmas = dict(PRAGMAS_PADRAO if pragmas is None else pragmas)
+    
+    @event.listens_for(engine, 'connect')
+    def _ao_conectar(conexao_dbapi, registro):
+        cursor = conexao_dbapi.cursor()
+        try:
+            for nome, valor in pragmas.items():
+                cursor.execute(f'PRAGMA {nome}={valor}')
+        finally:
+            cursor.close()
+    
+    return True
+
+
+def ler_pragmas(engine: Engine, nomes) -> Dict[str, Union[int, str]]:
+    """Valores atuais dos PRAGMAs numa conexão do engine"""
+    with engine.connect() as conexao:
+        return {nome: conexao.exec_driver_sql(f'PRAGMA {nome}').scalar() for nome in nomes}
@@ -1,10 +1,117 @@
-from flask import Blueprint, jsonify, request
-from src.models.pedido import Pedido, ItemPedido, Produto, StatusPedido, db
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from src.models.pedido import Pedido, StatusPedido, db
+from src.services.eventos import (
+    HEARTBEAT_PADRAO_SEGUNDOS, aguardar_evento, fluxo_sse, obter_barramento, obter_limite_conexoes,
+    publicar_evento
+)
+from src.services.catalogo import (
+    gravar_hash_catalogo, incrementar_versao_catalogo, ler_meta_catalogo, obter_catalogo,
+    publicar_versao_catalogo
+)
+from src.services.estatisticas import obter_estatisticas
+from src.services.sincronizacao import (
+    TAMANHO_LOTE_NDJSON, HashCatalogo, aplicar_delta, carregar_lote_ndjson, descartar_lote,
+    gravar_lote, hash_catalogo, normalizar_produto, novo_lote, trocar_catalogo
+)
+from src.services.fila import obter_fila, registrar_pedido, registrar_status_em_lote
+from src.services.idempotencia import (
+    HEADER as HEADER_IDEMPOTENCIA, TAMANHO_MAXIMO_CHAVE, buscar_chave, impressao_requisicao, registrar_chave,
+    repetir_resposta
+)
+from src.services.itens_pedido import montar_itens
+from src.services.pedidos_lote import (
+    LIMITE_PEDIDOS_LOTE, TAMANHO_LOTE_PEDIDOS, atualizar_status_em_lote, criar_pedidos_em_lote
+)
+from src.services.versao_pedidos import incrementar_versao_pedidos, ler_versao_pedidos
+from src.utils import codificar_cursor, decodificar_cursor
 from datetime import datetime
-from decimal import Decimal
+import hashlib
 
 pedidos_bp = Blueprint('pedidos', __name__)
 
+# Tamanho de página da listagem de pedidos
+LIMITE_PADRAO_PEDIDOS = 50
+LIMITE_MAXIMO_PEDIDOS = 200
+
+# Pedidos lidos do banco por lote no modo streaming da listagem
+TAMANHO_LOTE_STREAM = 500
+
+# Janela da série por hora das estatísticas
+HORAS_PADRAO_ESTATISTICAS = 24
+HORAS_MAXIMO_ESTATISTICAS = 24 * 7
+
+# Espera máxima do long-poll de status
+LONG_POLL_MAXIMO_SEGUNDOS = 60
+
+# Retry-After sugerido quando o limite de streams/long-polls do processo foi atingido
+RETRY_CONEXOES_LONGAS_SEGUNDOS = 5
+
+# Pedidos por requisição na atualização de status em lote
+LIMITE_STATUS_LOTE = 1000
+
+def _consulta_pedidos():
+    """Consulta de pedidos que carrega os itens em lote (SELECT ... IN), evitando N+1 no to_dict()"""
+    return Pedido.query.options(selectinload(Pedido.itens))
+
+def _notificar_alteracao(evento, pedido):
+    """Propaga um pedido recém-gravado para a fila em memória e para os assinantes do stream"""
+    registrar_pedido(pedido)
+    publicar_evento(evento, pedido)
+
+def _etag_pedido(pedido):
+    """ETag forte de um pedido: muda sempre que data_atualizacao muda"""
+    return f'pedido-{pedido.id}-{pedido.data_atualizacao.isoformat()}'
+
+def _etag_listagem():
+    """ETag das listagens: versão dos pedidos (ver versao_pedidos.py) combinada com os parâmetros da requisição"""
+    versao = ler_versao_pedidos()
+    parametros = sorted(request.args.items(multi=True))
+    resumo = hashlib.sha1(repr((versao, parametros)).encode('utf-8')).hexdigest()
+    return f'pedidos-{resumo}'
+
+def _gerar_json_pedidos(query, tamanho_lote):
+    """
+    Serializa a listagem como um documento JSON incremental.
+    
+    Os pedidos são lidos em lotes (yield_per) e cada lote é enviado assim que
+    codificado, então a memória por requisição não cresce com o histórico.
+    """
+    dumps = current_app.json.dumps
+    total = 0
+    lote = []
+    
+    yield '{"pedidos": ['
+    for pedido in query.yield_per(tamanho_lote):
+        lote.append(dumps(pedido.to_dict()))
+        total += 1
+        if len(lote) == tamanho_lote:
+            yield (', ' if total > len(lote) else '') + ', '.join(lote)
+            lote = []
+    if lote:
+        yield (', ' if total > len(lote) else '') + ', '.join(lote)
+    yield f'], "total": {total}}}'
+
+def _resposta_condicional(etag, gerar_resposta):
+    """Responde 304 se o cliente já tem a versão `etag`, sem serializar nada; caso contrário gera a resposta"""
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = gerar_resposta()
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def _conexoes_longas_esgotadas():
+    """503 quando o processo já tem CONEXOES_LONGAS_MAXIMO streams/long-polls abertos"""
+    return (
+        jsonify({'erro': 'Limite de conexões de acompanhamento atingido, tente novamente'}),
+        503,
+        {'Retry-After': str(RETRY_CONEXOES_LONGAS_SEGUNDOS)}
+    )
+
 @pedidos_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check do microsserviço"""
@@ -16,13 +123,22 @@ def health_check():
 
 @pedidos_bp.route('/pedidos', methods=['GET'])
 def listar_pedidos():
-    """Lista todos os pedidos"""
+    """Lista pedidos paginados por cursor (mais recentes primeiro)"""
     try:
         # Parâmetros de filtro opcionais
         status = request.args.get('status')
         cliente_id = request.args.get('cliente_id')
+        cursor = request.args.get('cursor')
+        
+        try:
+            limite = int(request.args.get('limit', LIMITE_PADRAO_PEDIDOS))
+        except ValueError:
+            return jsonify({'erro': 'Limite inválido'}), 400
+        if limite < 1:
+            return jsonify({'erro': 'Limite inválido'}), 400
+        limite = min(limite, LIMITE_MAXIMO_PEDIDOS)
         
-        query = Pedido.query
+        query = _consulta_pedidos()
         
         if status:
             try:
@@ -34,13 +150,42 @@ def listar_pedidos():
         if cliente_id:
             query = query.filter(Pedido.cliente_id == cliente_id)
         
-        # Ordenar por data de criação (mais recentes primeiro)
-        pedidos = query.order_by(Pedido.data_criacao.desc()).all()
+        # Paginação por chave (keyset): continua a partir do último pedido visto,
+        # sem OFFSET, para que qualquer página custe o mesmo que a primeira
+        if cursor:
+            try:
+                data_cursor, id_cursor = decodificar_cursor(cursor)
+            except ValueError:
+                return jsonify({'erro': 'Cursor inválido'}), 400
+            query = query.filter(or_(
+                Pedido.data_criacao < data_cursor,
+                and_(Pedido.data_criacao == data_cursor, Pedido.id < id_cursor)
+            ))
         
-        return jsonify({
-            'pedidos': [pedido.to_dict() for pedido in pedidos],
-            'total': len(pedidos)
-        })
+        # Modo streaming (exportações): todos os pedidos do filtro, sem limite de página
+        if request.args.get('stream', '').lower() in ('1', 'true'):
+            tamanho_lote = current_app.config.get('TAMANHO_LOTE_STREAM', TAMANHO_LOTE_STREAM)
+            query = query.order_by(Pedido.data_criacao.desc(), Pedido.id.desc())
+            return Response(stream_with_context(_gerar_json_pedidos(query, tamanho_lote)), mimetype='application/json')
+        
+        def gerar_resposta():
+            # Ordenar por data de criação (mais recentes primeiro), com o id como desempate;
+            # um registro extra indica se existe próxima página
+            pedidos = query.order_by(Pedido.data_criacao.desc(), Pedido.id.desc()).limit(limite + 1).all()
+            
+            proximo_cursor = None
+            if len(pedidos) > limite:
+                pedidos = pedidos[:limite]
+                proximo_cursor = codificar_cursor(pedidos[-1].data_criacao, pedidos[-1].id)
+            
+            return jsonify({
+                'pedidos': [pedido.to_dict() for pedido in pedidos],
+                'total': len(pedidos),
+                'limit': limite,
+                'next_cursor': proximo_cursor
+            })
+        
+        return _resposta_condicional(_etag_listagem(), gerar_resposta)
     except Exception as e:
         return jsonify({'erro': str(e)}), 500
 
@@ -54,40 +199,98 @@ def criar_pedido():
         if not data or 'itens' not in data or not data['itens']:
             return jsonify({'erro': 'Itens do pedido são obrigatórios'}), 400
         
-        # Criar o pedido
+        # Repetições com o mesmo Idempotency-Key devolvem a resposta original
+        chave = request.headers.get(HEADER_IDEMPOTENCIA)
+        if chave is not None:
+            if not chave or len(chave) > TAMANHO_MAXIMO_CHAVE:
+                return jsonify({'erro': f'{HEADER_IDEMPOTENCIA} inválida'}), 400
+            impressao = impressao_requisicao(data)
+            registro = buscar_chave(chave)
+            if registro is not None:
+                return repetir_resposta(registro, impressao)
+        
+        # Montar os itens antes de gravar qualquer coisa; itens só com
+        # produto_id e quantidade são precificados pelo catálogo local
+        try:
+            itens, total = montar_itens(data['itens'])
+        except ValueError as e:
+            return jsonify({'erro': str(e)}), 400
+        
+        # Criar o pedido com os itens pelo relacionamento: um único flush grava
+        # tudo (ids via RETURNING) e a resposta é serializada do estado em memória,
+        # antes que o commit expire os objetos e force uma releitura
+        # Criação e atualização com o mesmo instante: é assim que outros
+        # processos distinguem um pedido novo de uma mudança de status
+        agora = datetime.utcnow()
         pedido = Pedido(
-            cliente_id=data.get('cliente_id')
+            cliente_id=data.get('cliente_id'),
+            total=total,
+            data_criacao=agora,
+            data_atualizacao=agora
         )
+        for item in itens:
+            pedido.itens.append(item)
         
         db.session.add(pedido)
-        db.session.flush()  # Para obter o ID do pedido
-        
-        # Adicionar itens ao pedido
-        total = Decimal('0.00')
-        for item_data in data['itens']:
-            # Validar item
-            if not all(k in item_data for k in ['produto_id', 'nome_produto', 'categoria', 'quantidade', 'preco_unitario']):
-                return jsonify({'erro': 'Dados incompletos do item'}), 400
-            
-            item = ItemPedido(
-                pedido_id=pedido.id,
-                produto_id=item_data['produto_id'],
-                nome_produto=item_data['nome_produto'],
-                categoria=item_data['categoria'],
-                quantidade=item_data['quantidade'],
-                preco_unitario=Decimal(str(item_data['preco_unitario'])),
-                observacoes=item_data.get('observacoes')
-            )
-            
-            db.session.add(item)
-            total += item.preco_unitario * item.quantidade
+        db.session.flush()
+        incrementar_versao_pedidos()
+        resposta = pedido.to_dict()
+        
+        if chave is not None:
+            registrar_chave(chave, impressao, pedido.id, 201, resposta)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            if chave is None:
+                raise
+            # Requisição concorrente com a mesma chave gravou primeiro: este pedido
+            # é descartado e a resposta dela é devolvida
+            db.session.rollback()
+            registro = buscar_chave(chave)
+            if registro is None:
+                raise
+            return repetir_resposta(registro, impressao)
         
-        # Atualizar total do pedido
-        pedido.total = total
+        _notificar_alteracao('pedido_criado', resposta)
         
-        db.session.commit()
+        return jsonify(resposta), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'erro': str(e)}), 500
+
+@pedidos_bp.route('/pedidos/batch', methods=['POST'])
+def criar_pedidos_lote():
+    """Cria vários pedidos numa requisição, com INSERTs em lote e resultado por pedido"""
+    try:
+        data = request.json
+        
+        if not data or not isinstance(data.get('pedidos'), list) or not data['pedidos']:
+            return jsonify({'erro': 'Lista de pedidos é obrigatória'}), 400
+        
+        limite = current_app.config.get('PEDIDOS_LOTE_LIMITE', LIMITE_PEDIDOS_LOTE)
+        if len(data['pedidos']) > limite:
+            return jsonify({'erro': f'No máximo {limite} pedidos por requisição'}), 400
+        
+        tamanho_lote = current_app.config.get('PEDIDOS_LOTE_TAMANHO', TAMANHO_LOTE_PEDIDOS)
+        resultados, criados = criar_pedidos_em_lote(data['pedidos'], tamanho_lote)
         
-        return jsonify(pedido.to_dict()), 201
+        for pedido in criados:
+            _notificar_alteracao('pedido_criado', pedido)
+        
+        # 201 se todos foram criados, 207 se parte falhou, 400 se nenhum foi aceito
+        if len(criados) == len(resultados):
+            status_http = 201
+        elif criados:
+            status_http = 207
+        else:
+            status_http = 400
+        
+        return jsonify({
+            'criados': len(criados),
+            'rejeitados': len(resultados) - len(criados),
+            'resultados': resultados
+        }), status_http
         
     except Exception as e:
         db.session.rollback()
@@ -100,7 +303,8 @@ def obter_pedido(pedido_id):
         pedido = Pedido.query.get(pedido_id)
         if not pedido:
             return jsonify({'erro': 'Pedido não encontrado'}), 404
-        return jsonify(pedido.to_dict())
+        # Os itens só são carregados se o cliente não tiver a versão atual
+        return _resposta_condicional(_etag_pedido(pedido), lambda: jsonify(pedido.to_dict()))
     except Exception as e:
         return jsonify({'erro': str(e)}), 500
 
@@ -124,20 +328,140 @@ def atualizar_status_pedido(pedido_id):
         
         pedido.status = novo_status
         pedido.data_atualizacao = datetime.utcnow()
+        incrementar_versao_pedidos()
+        
+        db.session.commit()
+        
+        resposta = pedido.to_dict()
+        _notificar_alteracao('status_alterado', resposta)
+        
+        return jsonify(resposta)
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'erro': str(e)}), 500
+
+@pedidos_bp.route('/pedidos/status', methods=['PUT'])
+def atualizar_status_pedidos():
+    """Atualiza o status de vários pedidos com um único UPDATE"""
+    try:
+        data = request.json
+        
+        if not data or 'status' not in data:
+            return jsonify({'erro': 'Status é obrigatório'}), 400
+        
+        ids = data.get('ids')
+        if not isinstance(ids, list) or not ids or not all(
+            isinstance(pedido_id, int) and not isinstance(pedido_id, bool) for pedido_id in ids
+        ):
+            return jsonify({'erro': 'Lista de ids é obrigatória'}), 400
+        
+        limite = current_app.config.get('PEDIDOS_STATUS_LOTE_LIMITE', LIMITE_STATUS_LOTE)
+        if len(ids) > limite:
+            return jsonify({'erro': f'No máximo {limite} pedidos por requisição'}), 400
+        
+        try:
+            novo_status = StatusPedido(data['status'])
+        except ValueError:
+            return jsonify({'erro': 'Status inválido'}), 400
         
+        agora = datetime.utcnow()
+        atualizados = atualizar_status_em_lote(ids, novo_status, agora)
         db.session.commit()
         
-        return jsonify(pedido.to_dict())
+        resposta = {
+            'status': novo_status.value,
+            'data_atualizacao': agora.isoformat(),
+            'atualizados': atualizados,
+            'nao_encontrados': sorted(set(ids) - set(atualizados))
+        }
+        
+        # Uma única notificação para a fila e para o stream, com todos os ids
+        if atualizados:
+            registrar_status_em_lote(atualizados, resposta['status'], resposta['data_atualizacao'])
+            publicar_evento('status_alterado_lote', {
+                'ids': atualizados,
+                'status': resposta['status'],
+                'data_atualizacao': resposta['data_atualizacao']
+            })
+        
+        return jsonify(resposta)
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'erro': str(e)}), 500
 
+@pedidos_bp.route('/pedidos/<int:pedido_id>/status', methods=['GET'])
+def aguardar_status_pedido(pedido_id):
+    """Long-poll: responde quando o status for diferente de `since` ou ao fim de `wait` segundos"""
+    try:
+        since = request.args.get('since')
+        if since:
+            try:
+                StatusPedido(since)
+            except ValueError:
+                return jsonify({'erro': 'Status inválido'}), 400
+        
+        try:
+            espera = float(request.args.get('wait', 0))
+        except ValueError:
+            return jsonify({'erro': 'Tempo de espera inválido'}), 400
+        espera_maxima = current_app.config.get('LONG_POLL_MAXIMO_SEGUNDOS', LONG_POLL_MAXIMO_SEGUNDOS)
+        espera = max(0.0, min(espera, espera_maxima))
+        
+        # Marcar a posição no barramento antes de ler o banco: uma mudança gravada
+        # entre a leitura e a espera ainda será vista como evento
+        barramento = obter_barramento()
+        sequencia = barramento.ultima_sequencia
+        
+        def ler_status():
+            linha = db.session.query(Pedido.status, Pedido.data_atualizacao).filter(Pedido.id == pedido_id).first()
+            # Liberar a conexão antes de bloquear na espera
+            db.session.close()
+            return linha
+        
+        linha = ler_status()
+        if not linha:
+            return jsonify({'erro': 'Pedido não encontrado'}), 404
+        status, data_atualizacao = linha.status.value, linha.data_atualizacao.isoformat()
+        
+        if since and status == since and espera > 0:
+            limite = obter_limite_conexoes()
+            if not limite.tentar():
+                return _conexoes_longas_esgotadas()
+            
+            def alterou_pedido(e):
+                # Eventos individuais trazem o pedido; os de lote, a lista de ids
+                if e.dados.get('id') != pedido_id and pedido_id not in e.dados.get('ids', ()):
+                    return False
+                return e.dados.get('status') != since
+            
+            try:
+                evento = aguardar_evento(barramento, sequencia, espera, alterou_pedido)
+            finally:
+                limite.liberar()
+            if evento:
+                status, data_atualizacao = evento.dados['status'], evento.dados['data_atualizacao']
+            else:
+                # Timeout: conferir uma vez no banco (a mudança pode ter ocorrido em outro worker)
+                linha = ler_status()
+                if linha:
+                    status, data_atualizacao = linha.status.value, linha.data_atualizacao.isoformat()
+        
+        return jsonify({
+            'id': pedido_id,
+            'status': status,
+            'data_atualizacao': data_atualizacao,
+            'alterado': bool(since) and status != since
+        })
+    except Exception as e:
+        return jsonify({'erro': str(e)}), 500
+
 @pedidos_bp.route('/pedidos/cliente/<string:cliente_id>', methods=['GET'])
 def listar_pedidos_cliente(cliente_id):
     """Lista pedidos de um cliente específico"""
     try:
-        pedidos = Pedido.query.filter(Pedido.cliente_id == cliente_id).order_by(Pedido.data_criacao.desc()).all()
+        pedidos = _consulta_pedidos().filter(Pedido.cliente_id == cliente_id).order_by(Pedido.data_criacao.desc()).all()
         
         return jsonify({
             'pedidos': [pedido.to_dict() for pedido in pedidos],
@@ -153,17 +477,13 @@ def listar_produtos():
     try:
         categoria = request.args.get('categoria')
         
-        query = Produto.query.filter(Produto.disponivel == True)
-        
-        if categoria:
-            query = query.filter(Produto.categoria == categoria)
+        # Resposta pré-codificada da versão atual do catálogo: entre
+        # sincronizações o cardápio é servido sem acessar o banco
+        corpo, etag = obter_catalogo().payload(categoria)
         
-        produtos = query.order_by(Produto.categoria, Produto.nome).all()
-        
-        return jsonify({
-            'produtos': [produto.to_dict() for produto in produtos],
-            'total': len(produtos)
-        })
+        return _resposta_condicional(
+            etag, lambda: current_app.response_class(corpo, mimetype='application/json')
+        )
     except Exception as e:
         return jsonify({'erro': str(e)}), 500
 
@@ -177,46 +497,160 @@ def listar_categorias():
 def fila_pedidos():
     """Lista pedidos na fila de produção (visão da cozinha)"""
     try:
-        # Pedidos que não estão finalizados, ordenados por data de criação
-        pedidos = Pedido.query.filter(
-            Pedido.status.in_([StatusPedido.RECEBIDO, StatusPedido.EM_PREPARACAO, StatusPedido.PRONTO])
-        ).order_by(Pedido.data_criacao.asc()).all()
+        # Pedidos que não estão finalizados, ordenados por data de criação,
+        # servidos da fila mantida em memória
+        fila = obter_fila()
         
-        return jsonify({
-            'fila': [pedido.to_dict() for pedido in pedidos],
-            'total': len(pedidos)
-        })
+        def gerar_resposta():
+            pedidos = fila.listar()
+            return jsonify({
+                'fila': pedidos,
+                'total': len(pedidos)
+            })
+        
+        return _resposta_condicional(fila.etag, gerar_resposta)
+    except Exception as e:
+        return jsonify({'erro': str(e)}), 500
+
+@pedidos_bp.route('/pedidos/stats', methods=['GET'])
+def estatisticas_pedidos():
+    """Contagens e receita agregadas no banco (painéis e indicador de pedidos aguardando)"""
+    try:
+        try:
+            horas = int(request.args.get('horas', HORAS_PADRAO_ESTATISTICAS))
+        except ValueError:
+            return jsonify({'erro': 'Janela de horas inválida'}), 400
+        if not 1 <= horas <= HORAS_MAXIMO_ESTATISTICAS:
+            return jsonify({'erro': 'Janela de horas inválida'}), 400
+        
+        return jsonify(obter_estatisticas(horas))
     except Exception as e:
         return jsonify({'erro': str(e)}), 500
 
+@pedidos_bp.route('/pedidos/stream', methods=['GET'])
+def stream_pedidos():
+    """Stream SSE com criação e mudanças de status de pedidos (telas da cozinha e de retirada)"""
+    ultimo_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    heartbeat = current_app.config.get('SSE_HEARTBEAT_SEGUNDOS', HEARTBEAT_PADRAO_SEGUNDOS)
+    
+    limite = obter_limite_conexoes()
+    if not limite.tentar():
+        return _conexoes_longas_esgotadas()
+    resposta = Response(
+        fluxo_sse(obter_barramento(), ultimo_id, heartbeat),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # O servidor fecha a resposta quando o stream termina ou o cliente desconecta
+    resposta.call_on_close(limite.liberar)
+    return resposta
+
 # Endpoints para sincronização de produtos (usado pelo serviço de produtos)
+def _catalogo_inalterado(versao, **extras):
+    """Resposta de uma carga idêntica ao catálogo atual: nada foi gravado nem invalidado"""
+    return jsonify({
+        'mensagem': 'Catálogo inalterado',
+        'resultado': 'not_modified',
+        'versao': versao,
+        **extras
+    }), 200
+
+def _sincronizar_produtos_ndjson():
+    """Carga completa do catálogo em NDJSON, lida incrementalmente e gravada em lotes"""
+    lote = None
+    try:
+        tamanho_lote = current_app.config.get('SYNC_TAMANHO_LOTE_NDJSON', TAMANHO_LOTE_NDJSON)
+        lote = novo_lote()
+        db.session.commit()
+        
+        acumulador = HashCatalogo()
+        try:
+            total = carregar_lote_ndjson(lote, request.stream, tamanho_lote, acumulador)
+        except ValueError as e:
+            db.session.rollback()
+            descartar_lote(lote)
+            db.session.commit()
+            return jsonify({'erro': str(e)}), 400
+        
+        # O hash só é conhecido ao fim do corpo; carga repetida descarta o lote sem trocar o catálogo
+        hash_conteudo = acumulador.hexdigest()
+        versao, hash_atual = ler_meta_catalogo()
+        if hash_conteudo == hash_atual:
+            descartar_lote(lote)
+            db.session.commit()
+            return _catalogo_inalterado(versao, total=total)
+        
+        trocar_catalogo(lote)
+        versao = incrementar_versao_catalogo(hash_conteudo)
+        db.session.commit()
+        publicar_versao_catalogo(versao)
+        
+        return jsonify({'mensagem': 'Produtos sincronizados com sucesso', 'versao': versao, 'total': total}), 200
+    
+    except Exception as e:
+        db.session.rollback()
+        if lote is not None:
+            # Lotes que também falharem aqui são expurgados por novo_lote()
+            descartar_lote(lote)
+            db.session.commit()
+        return jsonify({'erro': str(e)}), 500
+
 @pedidos_bp.route('/produtos/sync', methods=['POST'])
 def sincronizar_produtos():
     """Sincroniza produtos com o serviço de produtos"""
+    if request.mimetype == 'application/x-ndjson':
+        return _sincronizar_produtos_ndjson()
+    
     try:
         data = request.json
         
         if not data or 'produtos' not in data:
             return jsonify({'erro': 'Lista de produtos é obrigatória'}), 400
         
-        # Limpar produtos existentes
-        Produto.query.delete()
-        
-        # Adicionar novos produtos
-        for produto_data in data['produtos']:
-            produto = Produto(
-                id=produto_data['id'],
-                nome=produto_data['nome'],
-                categoria=produto_data['categoria'],
-                preco=Decimal(str(produto_data['preco'])),
-                descricao=produto_data.get('descricao'),
-                disponivel=produto_data.get('disponivel', True)
-            )
-            db.session.add(produto)
+        try:
+            produtos = [normalizar_produto(produto_data) for produto_data in data['produtos']]
+        except ValueError as e:
+            return jsonify({'erro': str(e)}), 400
+        
+        modo_delta = (request.args.get('modo') or data.get('modo')) == 'delta'
+        
+        # Carga idêntica à última gravada: responde sem escrever no banco nem invalidar caches
+        hash_conteudo = hash_catalogo(produtos)
+        versao, hash_atual = ler_meta_catalogo()
+        if hash_conteudo == hash_atual:
+            return _catalogo_inalterado(versao, **({'modo': 'delta'} if modo_delta else {}))
+        
+        # Modo diferencial: grava apenas produtos novos, alterados e removidos
+        if modo_delta:
+            contagens = aplicar_delta(produtos)
+            alterou = contagens['inseridos'] or contagens['atualizados'] or contagens['removidos']
+            # Sem mudanças, a versão (e os caches derivados dela) é preservada
+            if alterou:
+                versao = incrementar_versao_catalogo(hash_conteudo)
+            else:
+                gravar_hash_catalogo(hash_conteudo)
+            db.session.commit()
+            if alterou:
+                publicar_versao_catalogo(versao)
+            
+            return jsonify({
+                'mensagem': 'Produtos sincronizados com sucesso',
+                'modo': 'delta',
+                'versao': versao,
+                **contagens
+            }), 200
+        
+        # Montar o novo catálogo na tabela de sombra e trocá-lo atomicamente:
+        # leitores veem o catálogo anterior até o commit, nunca um cardápio parcial
+        lote = novo_lote()
+        gravar_lote(lote, produtos)
+        trocar_catalogo(lote)
         
+        versao = incrementar_versao_catalogo(hash_conteudo)
         db.session.commit()
+        publicar_versao_catalogo(versao)
         
-        return jsonify({'mensagem': 'Produtos sincronizados com sucesso'}), 200
+        return jsonify({'mensagem': 'Produtos sincronizados com sucesso', 'versao': versao}), 200
         
     except Exception as e:
         db.session.rollback()
@@ -0,0 +1,65 @@
+"""
+Cache em memória com capacidade limitada e expiração por tempo
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_AUSENTE = object()
+
+
+class CacheTTL:
+    """
+    Cache LRU com expiração por tempo (TTL), seguro para uso entre threads.
+    
+    Ao atingir a capacidade, a entrada usada há mais tempo é descartada.
+    """
+    
+    def __init__(self, capacidade: int = 1024, ttl: float = 60.0, relogio: Callable[[], float] = time.monotonic):
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._relogio = relogio
+        self._lock = threading.Lock()
+        self._entradas: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def obter(self, chave: Hashable, padrao: Any = None) -> Any:
+        """Valor associado à chave, ou `padrao` se ausente ou expirado"""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return padrao
+            valor, expira_em = entrada
+            if expira_em <= self._relogio():
+                del self._entradas[chave]
+                return padrao
+            self._entradas.move_to_end(chave)
+            return valor
+    
+    def definir(self, chave: Hashable, valor: Any, ttl: Optional[float] = None) -> None:
+        """Armazena o valor, descartando as entradas mais antigas se exceder a capacidade"""
+        expira_em = self._relogio() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entradas[chave] = (valor, expira_em)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.capacidade:
+                self._entradas.popitem(last=False)
+    
+    def obter_ou_calcular(self, chave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """Valor em cache, ou o resultado de `calcular()` (que passa a ser armazenado)"""
+        valor = self.obter(chave, _AUSENTE)
+        if valor is _AUSENTE:
+            valor = calcular()
+            self.definir(chave, valor)
+        return valor
+    
+    def remover(self, chave: Hashable) -> None:
+        with self._lock:
+            self._entradas.pop(chave, None)
+    
+    def limpar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entradas)
@@ -0,0 +1,155 @@
+"""
+Cache versionado do catálogo local de produtos
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+from flask import current_app
+
+from src.models.pedido import CatalogoMeta, Produto, db
+from src.services.cache import CacheTTL
+
+EXTENSAO = 'cache_catalogo'
+
+# Intervalo para conferir no banco se outro processo sincronizou o catálogo
+REVALIDACAO_PADRAO_SEGUNDOS = 30
+
+# Quantidade de filtros de categoria mantidos em cache
+CAPACIDADE_PADRAO = 64
+
+
+def ler_versao_catalogo() -> int:
+    """Versão atual do catálogo gravada no banco (0 se nunca sincronizado)"""
+    versao = db.session.query(CatalogoMeta.versao).filter(CatalogoMeta.id == 1).scalar()
+    return versao or 0
+
+
+def ler_meta_catalogo() -> Tuple[int, Optional[str]]:
+    """Versão e hash de conteúdo do catálogo gravados no banco, numa leitura pela chave primária"""
+    linha = db.session.query(CatalogoMeta.versao, CatalogoMeta.hash_conteudo).filter(CatalogoMeta.id == 1).first()
+    if linha is None:
+        return 0, None
+    return linha.versao or 0, linha.hash_conteudo
+
+
+def _meta_catalogo() -> CatalogoMeta:
+    meta = db.session.get(CatalogoMeta, 1)
+    if meta is None:
+        meta = CatalogoMeta(id=1, versao=0)
+        db.session.add(meta)
+    return meta
+
+
+def incrementar_versao_catalogo(hash_conteudo: Optional[str] = None) -> int:
+    """
+    Incrementa a versão do catálogo na transação corrente e devolve o novo valor
+    
+    Args:
+        hash_conteudo: Hash da carga completa gravada; None quando o conteúdo
+            resultante não é conhecido por inteiro (ex.: atualização parcial)
+    """
+    meta = _meta_catalogo()
+    meta.versao += 1
+    meta.hash_conteudo = hash_conteudo
+    return meta.versao
+
+
+def gravar_hash_catalogo(hash_conteudo: str) -> None:
+    """Registra o hash de uma carga completa que não alterou o catálogo. Não faz commit."""
+    _meta_catalogo().hash_conteudo = hash_conteudo
+
+
+def ler_marca_sync() -> Optional[datetime]:
+    """Marca d'água da sincronização puxada: maior data_atualizacao já recebida do serviço de produtos"""
+    return db.session.query(CatalogoMeta.marca_sync).filter(CatalogoMeta.id == 1).scalar()
+
+
+def avancar_marca_sync(data: datetime) -> None:
+    """Avança a marca d'água da sincronização puxada (nunca a recua). Não faz commit."""
+    meta = _meta_catalogo()
+    if meta.marca_sync is None or data > meta.marca_sync:
+        meta.marca_sync = data
+
+
+class CatalogoCache:
+    """
+    Respostas de GET /api/produtos já codificadas (bytes + ETag) por filtro de categoria.
+    
+    As entradas são chaveadas pela versão do catálogo, que só muda quando
+    /api/produtos/sync grava um novo catálogo; entre sincronizações as
+    leituras não acessam o banco. Sincronizações feitas por outro processo
+    são detectadas relendo a versão a cada intervalo de revalidação.
+    """
+    
+    def __init__(self, intervalo_revalidacao: float = REVALIDACAO_PADRAO_SEGUNDOS, capacidade: int = CAPACIDADE_PADRAO):
+        self.intervalo_revalidacao = intervalo_revalidacao
+        self.versao: Optional[int] = None
+        self._validado_em: Optional[float] = None
+        self._lock = threading.Lock()
+        self._payloads = CacheTTL(capacidade=capacidade, ttl=float('inf'))
+    
+    def precisa_revalidar(self) -> bool:
+        if self.versao is None:
+            return True
+        if not self.intervalo_revalidacao:
+            return False
+        return time.monotonic() - self._validado_em >= self.intervalo_revalidacao
+    
+    def definir_versao(self, versao: int) -> None:
+        """Registra a versão vigente; payloads de versões anteriores deixam de ser servidos"""
+        with self._lock:
+            if versao != self.versao:
+                self._payloads.limpar()
+            self.versao = versao
+            self._validado_em = time.monotonic()
+    
+    def payload(self, categoria: Optional[str]) -> Tuple[bytes, str]:
+        """Corpo JSON e ETag da listagem para o filtro de categoria (gerados do banco na primeira vez)"""
+        versao = self.versao
+        chave = (versao, categoria)
+        entrada = self._payloads.obter(chave)
+        if entrada is None:
+            entrada = (_codificar_produtos(categoria), _etag_catalogo(versao, categoria))
+            self._payloads.definir(chave, entrada)
+        return entrada
+
+
+def _etag_catalogo(versao: Optional[int], categoria: Optional[str]) -> str:
+    # A categoria vem crua da query string: aspas ou caracteres fora do
+    # Latin-1 não podem ir para o cabeçalho, então a tag leva um resumo dela
+    if not categoria:
+        return f'catalogo-{versao}-*'
+    return f"catalogo-{versao}-{hashlib.sha1(categoria.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _codificar_produtos(categoria: Optional[str]) -> bytes:
+    query = Produto.query.filter(Produto.disponivel == True)
+    if categoria:
+        query = query.filter(Produto.categoria == categoria)
+    produtos = query.order_by(Produto.categoria, Produto.nome).all()
+    
+    return current_app.json.response({
+        'produtos': [produto.to_dict() for produto in produtos],
+        'total': len(produtos)
+    }).get_data()
+
+
+def obter_catalogo() -> CatalogoCache:
+    """Cache do catálogo da aplicação corrente, com a versão revalidada quando vencida"""
+    catalogo = current_app.extensions.get(EXTENSAO)
+    if catalogo is None:
+        intervalo = current_app.config.get('CATALOGO_REVALIDACAO_SEGUNDOS', REVALIDACAO_PADRAO_SEGUNDOS)
+        catalogo = current_app.extensions.setdefault(EXTENSAO, CatalogoCache(intervalo))
+    if catalogo.precisa_revalidar():
+        catalogo.definir_versao(ler_versao_catalogo())
+    return catalogo
+
+
+def publicar_versao_catalogo(versao: int) -> None:
+    """Aplica ao cache do processo a versão recém-gravada por uma sincronização"""
+    catalogo = current_app.extensions.get(EXTENSAO)
+    if catalogo is not None:
+        catalogo.definir_versao(versao)
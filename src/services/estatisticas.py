@@ -0,0 +1,74 @@
+"""
+Estatísticas agregadas de pedidos, calculadas no banco
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from flask import current_app
+from sqlalchemy import func
+
+from src.models.pedido import Pedido, StatusPedido, db
+from src.services.cache import CacheTTL
+from src.services.fila import STATUS_EM_PRODUCAO
+
+EXTENSAO = 'cache_estatisticas'
+
+CACHE_PADRAO_SEGUNDOS = 5
+
+
+def _hora_de_criacao():
+    """Expressão que trunca data_criacao para a hora, no formato ISO, conforme o banco"""
+    if db.engine.dialect.name == 'postgresql':
+        return func.to_char(func.date_trunc('hour', Pedido.data_criacao), 'YYYY-MM-DD"T"HH24:00:00')
+    return func.strftime('%Y-%m-%dT%H:00:00', Pedido.data_criacao)
+
+
+def calcular_estatisticas(horas: int, agora: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Contagens por status, contagens por hora e somas de receita, via GROUP BY.
+    
+    Args:
+        horas: Janela (em horas até agora) da série por hora
+        agora: Instante de referência (UTC); padrão é o horário atual
+        
+    Returns:
+        Dict: Estatísticas com tamanho independente do número de pedidos
+    """
+    agora = agora or datetime.utcnow()
+    
+    por_status = {status.value: {'pedidos': 0, 'receita': Decimal('0.00')} for status in StatusPedido}
+    linhas = db.session.query(
+        Pedido.status, func.count(Pedido.id), func.coalesce(func.sum(Pedido.total), 0)
+    ).group_by(Pedido.status).all()
+    for status, quantidade, receita in linhas:
+        por_status[status.value] = {'pedidos': quantidade, 'receita': Decimal(str(receita))}
+    
+    hora = _hora_de_criacao()
+    inicio = (agora - timedelta(hours=horas)).replace(minute=0, second=0, microsecond=0)
+    linhas = db.session.query(
+        hora, func.count(Pedido.id), func.coalesce(func.sum(Pedido.total), 0)
+    ).filter(Pedido.data_criacao >= inicio).group_by(hora).order_by(hora).all()
+    por_hora = [
+        {'hora': bucket, 'pedidos': quantidade, 'receita': Decimal(str(receita))}
+        for bucket, quantidade, receita in linhas
+    ]
+    
+    return {
+        'por_status': por_status,
+        'por_hora': por_hora,
+        'total_pedidos': sum(valores['pedidos'] for valores in por_status.values()),
+        'em_fila': sum(por_status[status.value]['pedidos'] for status in STATUS_EM_PRODUCAO),
+        'receita_total': sum((valores['receita'] for valores in por_status.values()), Decimal('0.00')),
+        'janela_horas': horas,
+        'gerado_em': agora,
+    }
+
+
+def obter_estatisticas(horas: int) -> Dict[str, Any]:
+    """Estatísticas da aplicação corrente, mantidas em cache por alguns segundos"""
+    cache = current_app.extensions.get(EXTENSAO)
+    if cache is None:
+        ttl = current_app.config.get('STATS_CACHE_SEGUNDOS', CACHE_PADRAO_SEGUNDOS)
+        cache = current_app.extensions.setdefault(EXTENSAO, CacheTTL(capacidade=64, ttl=ttl))
+    return cache.obter_ou_calcular(horas, lambda: calcular_estatisticas(horas))
@@ -0,0 +1,234 @@
+"""
+Barramento de eventos em memória para o stream SSE de pedidos
+"""
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from flask import current_app
+
+EXTENSAO = 'barramento_eventos'
+EXTENSAO_LIMITE = 'conexoes_longas'
+
+CAPACIDADE_PADRAO = 1000
+HEARTBEAT_PADRAO_SEGUNDOS = 15
+RETRY_MILISSEGUNDOS = 3000
+
+# Streams SSE e long-polls simultâneos por processo; cada um ocupa uma thread
+# do worker enquanto estiver aberto (ver gunicorn.conf.py)
+CONEXOES_LONGAS_PADRAO = 32
+
+
+@dataclass(frozen=True)
+class Evento:
+    """Evento publicado, já codificado no formato SSE"""
+    sequencia: int
+    tipo: str
+    dados: Dict[str, Any]
+    mensagem: bytes
+
+
+class BarramentoEventos:
+    """
+    Buffer circular de eventos com ids crescentes.
+    
+    Cada evento é codificado uma única vez na publicação; os assinantes apenas
+    aguardam numa Condition e leem do buffer compartilhado, então um escritor
+    atende centenas de assinantes sem consultas ao banco. Os ids levam a época
+    do processo, para que um Last-Event-ID de outra execução (ou de outro
+    worker) seja detectado. O buffer é local ao processo: as alterações
+    gravadas por outros workers chegam pelo PropagadorEventos
+    (src/services/propagacao.py).
+    """
+    
+    def __init__(self, capacidade: int = CAPACIDADE_PADRAO):
+        # Com o pid, workers criados no mesmo milissegundo não compartilham a época
+        self.epoca = f'{int(time.time() * 1000):x}.{os.getpid():x}'
+        self._condicao = threading.Condition()
+        self._eventos: deque = deque(maxlen=capacidade)
+        self._ultima_sequencia = 0
+        self._encerrado = False
+    
+    @property
+    def ultima_sequencia(self) -> int:
+        return self._ultima_sequencia
+    
+    @property
+    def encerrado(self) -> bool:
+        return self._encerrado
+    
+    def id_evento(self, sequencia: int) -> str:
+        return f'{self.epoca}-{sequencia}'
+    
+    def sequencia_do_id(self, id_evento: Optional[str]) -> Optional[int]:
+        """Sequência correspondente a um Last-Event-ID deste processo, ou None se desconhecido"""
+        if not id_evento:
+            return None
+        epoca, _, sequencia = id_evento.partition('-')
+        if epoca != self.epoca or not sequencia.isdigit():
+            return None
+        sequencia = int(sequencia)
+        return sequencia if sequencia <= self._ultima_sequencia else None
+    
+    def publicar(self, tipo: str, dados: Dict[str, Any], dados_json: str) -> Evento:
+        """Registra um evento e acorda todos os assinantes"""
+        with self._condicao:
+            self._ultima_sequencia += 1
+            sequencia = self._ultima_sequencia
+            mensagem = f'id: {self.id_evento(sequencia)}\nevent: {tipo}\ndata: {dados_json}\n\n'.encode('utf-8')
+            evento = Evento(sequencia, tipo, dados, mensagem)
+            self._eventos.append(evento)
+            self._condicao.notify_all()
+        return evento
+    
+    def eventos_desde(self, sequencia: int) -> Optional[List[Evento]]:
+        """Eventos posteriores à sequência informada, ou None se parte deles já saiu do buffer"""
+        with self._condicao:
+            return self._desde(sequencia)
+    
+    def aguardar(self, sequencia: int, timeout: float) -> Optional[List[Evento]]:
+        """Bloqueia até haver eventos após a sequência (ou até o timeout) e os devolve"""
+        with self._condicao:
+            self._condicao.wait_for(lambda: self._ultima_sequencia > sequencia or self._encerrado, timeout)
+            return self._desde(sequencia)
+    
+    def encerrar(self) -> None:
+        """Libera todos os assinantes (usado no desligamento do processo)"""
+        with self._condicao:
+            self._encerrado = True
+            self._condicao.notify_all()
+    
+    def _desde(self, sequencia: int) -> Optional[List[Evento]]:
+        if sequencia >= self._ultima_sequencia:
+            return []
+        primeira = self._eventos[0].sequencia if self._eventos else self._ultima_sequencia + 1
+        if sequencia + 1 < primeira:
+            return None
+        return [evento for evento in self._eventos if evento.sequencia > sequencia]
+
+
+class LimiteConexoes:
+    """
+    Teto de conexões longas (streams SSE e long-polls) abertas ao mesmo tempo.
+    
+    Sob o gunicorn gthread cada conexão longa prende uma thread até terminar;
+    sem um teto, algumas telas abertas esgotariam as threads e o restante da
+    API (inclusive /api/health) ficaria sem resposta. Acima do teto a rota
+    recusa na hora, em vez de enfileirar.
+    """
+    
+    def __init__(self, maximo: int):
+        self.maximo = maximo
+        self._semaforo = threading.BoundedSemaphore(maximo)
+        self._abertas = 0
+        self._trava = threading.Lock()
+    
+    @property
+    def abertas(self) -> int:
+        return self._abertas
+    
+    def tentar(self) -> bool:
+        """Reserva uma vaga sem bloquear; False se o teto foi atingido"""
+        if not self._semaforo.acquire(blocking=False):
+            return False
+        with self._trava:
+            self._abertas += 1
+        return True
+    
+    def liberar(self) -> None:
+        with self._trava:
+            self._abertas -= 1
+        self._semaforo.release()
+
+
+def aguardar_evento(barramento: BarramentoEventos, sequencia: int, timeout: float,
+                    predicado: Callable[[Evento], bool]) -> Optional[Evento]:
+    """
+    Aguarda, a partir da sequência informada, o primeiro evento que satisfaça o predicado.
+    
+    Returns:
+        Optional[Evento]: O evento encontrado, ou None no timeout, no encerramento
+        do barramento ou se eventos posteriores à sequência já saíram do buffer
+    """
+    limite = time.monotonic() + timeout
+    while not barramento.encerrado:
+        restante = limite - time.monotonic()
+        if restante <= 0:
+            return None
+        eventos = barramento.aguardar(sequencia, restante)
+        if eventos is None:
+            return None
+        for evento in eventos:
+            if predicado(evento):
+                return evento
+        if eventos:
+            sequencia = eventos[-1].sequencia
+    return None
+
+
+def obter_barramento() -> BarramentoEventos:
+    """Barramento de eventos da aplicação corrente"""
+    barramento = current_app.extensions.get(EXTENSAO)
+    if barramento is None:
+        capacidade = current_app.config.get('SSE_BUFFER_EVENTOS', CAPACIDADE_PADRAO)
+        barramento = current_app.extensions.setdefault(EXTENSAO, BarramentoEventos(capacidade))
+    return barramento
+
+
+def obter_limite_conexoes() -> LimiteConexoes:
+    """Limite de conexões longas da aplicação corrente (CONEXOES_LONGAS_MAXIMO)"""
+    limite = current_app.extensions.get(EXTENSAO_LIMITE)
+    if limite is None:
+        maximo = current_app.config.get('CONEXOES_LONGAS_MAXIMO', CONEXOES_LONGAS_PADRAO)
+        limite = current_app.extensions.setdefault(EXTENSAO_LIMITE, LimiteConexoes(maximo))
+    return limite
+
+
+def publicar_evento(tipo: str, dados: Dict[str, Any]) -> Evento:
+    """Publica um evento de pedido para os assinantes do stream"""
+    dados_json = current_app.json.dumps(dados, sort_keys=False)
+    return obter_barramento().publicar(tipo, dados, dados_json)
+
+
+def _mensagem_reset(barramento: BarramentoEventos) -> bytes:
+    # O cliente perdeu eventos (reinício do serviço ou buffer excedido) e deve recarregar o estado
+    return f'id: {barramento.id_evento(barramento.ultima_sequencia)}\nevent: reset\ndata: {{}}\n\n'.encode('utf-8')
+
+
+def fluxo_sse(barramento: BarramentoEventos, ultimo_id: Optional[str], heartbeat: float) -> Iterator[bytes]:
+    """
+    Gera o stream SSE a partir do Last-Event-ID informado pelo cliente.
+    
+    Envia os eventos perdidos que ainda estão no buffer, depois os novos à
+    medida que são publicados, e um comentário de heartbeat a cada intervalo
+    sem eventos para manter a conexão viva através de proxies. O ponto de
+    partida é fixado na chamada, antes de a resposta começar a ser enviada.
+    """
+    sequencia = barramento.sequencia_do_id(ultimo_id)
+    reset = sequencia is None and bool(ultimo_id)
+    if sequencia is None:
+        sequencia = barramento.ultima_sequencia
+    return _gerar_sse(barramento, sequencia, reset, heartbeat)
+
+
+def _gerar_sse(barramento: BarramentoEventos, sequencia: int, reset: bool, heartbeat: float) -> Iterator[bytes]:
+    yield f'retry: {RETRY_MILISSEGUNDOS}\n\n'.encode('utf-8')
+    if reset:
+        yield _mensagem_reset(barramento)
+    
+    while not barramento.encerrado:
+        eventos = barramento.aguardar(sequencia, heartbeat)
+        if barramento.encerrado:
+            return
+        if eventos is None:
+            sequencia = barramento.ultima_sequencia
+            yield _mensagem_reset(barramento)
+        elif not eventos:
+            yield b': heartbeat\n\n'
+        else:
+            for evento in eventos:
+                yield evento.mensagem
+            sequencia = eventos[-1].sequencia
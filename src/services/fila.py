@@ -0,0 +1,198 @@
+"""
+Fila de produção mantida em memória para a visão da cozinha
+"""
+import bisect
+import hashlib
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy.orm import selectinload
+
+from src.models.pedido import Pedido, StatusPedido
+
+EXTENSAO = 'fila_producao'
+
+# Status que mantêm um pedido na fila de produção
+STATUS_EM_PRODUCAO = (StatusPedido.RECEBIDO, StatusPedido.EM_PREPARACAO, StatusPedido.PRONTO)
+_VALORES_EM_PRODUCAO = frozenset(status.value for status in STATUS_EM_PRODUCAO)
+
+# Intervalo padrão para recarregar a fila do banco (alterações feitas por outros processos)
+RESSINCRONIZACAO_PADRAO_SEGUNDOS = 10
+
+
+class FilaProducao:
+    """
+    Pedidos não finalizados, já serializados, ordenados por (data_criacao, id).
+    
+    A fila é atualizada a cada commit de criação ou mudança de status e lida
+    sem acesso ao banco. Como vive no processo, alterações feitas por outros
+    workers só aparecem na próxima ressincronização (intervalo configurável).
+    """
+    
+    def __init__(self, intervalo_ressincronizacao: float = RESSINCRONIZACAO_PADRAO_SEGUNDOS):
+        self.intervalo_ressincronizacao = intervalo_ressincronizacao
+        self.versao = 0
+        self.lock_carga = threading.Lock()
+        self._lock = threading.Lock()
+        self._chaves: List[Tuple[datetime, int]] = []
+        self._pedidos: Dict[int, Dict[str, Any]] = {}
+        self._carregada_em: Optional[float] = None
+        self._etag: Optional[Tuple[int, str]] = None
+        self._alteracoes_durante_carga: Optional[List[Dict[str, Any]]] = None
+    
+    @staticmethod
+    def _chave(pedido: Dict[str, Any]) -> Tuple[datetime, int]:
+        return datetime.fromisoformat(pedido['data_criacao']), pedido['id']
+    
+    def precisa_recarregar(self) -> bool:
+        """Indica se a fila nunca foi carregada ou se passou do intervalo de ressincronização"""
+        if self._carregada_em is None:
+            return True
+        if not self.intervalo_ressincronizacao:
+            return False
+        return time.monotonic() - self._carregada_em >= self.intervalo_ressincronizacao
+    
+    def iniciar_carga(self) -> None:
+        """Passa a registrar as alterações concorrentes à leitura do banco"""
+        with self._lock:
+            self._alteracoes_durante_carga = []
+    
+    def carregar(self, pedidos: Iterable[Dict[str, Any]]) -> None:
+        """Substitui o conteúdo da fila, reaplicando alterações registradas durante a leitura"""
+        with self._lock:
+            assinatura_anterior = self._assinatura()
+            self._chaves = []
+            self._pedidos = {}
+            for pedido in pedidos:
+                self._inserir(pedido)
+            for pedido in self._alteracoes_durante_carga or []:
+                self._aplicar(pedido)
+            self._alteracoes_durante_carga = None
+            self._carregada_em = time.monotonic()
+            # Uma ressincronização sem mudanças não invalida a versão (nem o ETag)
+            if self._assinatura() != assinatura_anterior or self.versao == 0:
+                self.versao += 1
+    
+    def registrar(self, pedido: Dict[str, Any]) -> None:
+        """Insere, atualiza ou remove um pedido (serializado com to_dict) conforme o status"""
+        with self._lock:
+            if self._alteracoes_durante_carga is not None:
+                self._alteracoes_durante_carga.append(pedido)
+            self._aplicar(pedido)
+            self.versao += 1
+    
+    def registrar_status(self, pedido_ids: Iterable[int], status: str, data_atualizacao: str) -> List[int]:
+        """
+        Aplica uma mudança de status em lote aos pedidos que já estão na fila
+        
+        Returns:
+            List[int]: Ids que deveriam entrar na fila mas não estão nela (sem
+                os dados completos do pedido, a fila precisa ser recarregada)
+        """
+        ausentes = []
+        with self._lock:
+            for pedido_id in pedido_ids:
+                atual = self._pedidos.get(pedido_id)
+                if atual is None:
+                    if status in _VALORES_EM_PRODUCAO:
+                        ausentes.append(pedido_id)
+                    continue
+                pedido = {**atual, 'status': status, 'data_atualizacao': data_atualizacao}
+                if self._alteracoes_durante_carga is not None:
+                    self._alteracoes_durante_carga.append(pedido)
+                self._aplicar(pedido)
+            self.versao += 1
+        return ausentes
+    
+    def invalidar(self) -> None:
+        """Força a recarga do banco no próximo acesso"""
+        with self._lock:
+            self._carregada_em = None
+    
+    def listar(self) -> List[Dict[str, Any]]:
+        """Pedidos na ordem de produção (mais antigos primeiro)"""
+        with self._lock:
+            return [self._pedidos[pedido_id] for _, pedido_id in self._chaves]
+    
+    @property
+    def etag(self) -> str:
+        """
+        ETag do conteúdo atual, derivado de (id, data_atualizacao) de cada pedido.
+        
+        Depende só do conteúdo, então workers com a mesma fila geram o mesmo ETag.
+        """
+        with self._lock:
+            if self._etag is None or self._etag[0] != self.versao:
+                resumo = hashlib.sha1(repr(self._assinatura()).encode('utf-8')).hexdigest()
+                self._etag = (self.versao, f'fila-{resumo}')
+            return self._etag[1]
+    
+    def __len__(self) -> int:
+        return len(self._chaves)
+    
+    def _assinatura(self) -> List[Tuple[int, str]]:
+        return [(pedido_id, self._pedidos[pedido_id]['data_atualizacao']) for _, pedido_id in self._chaves]
+    
+    def _aplicar(self, pedido: Dict[str, Any]) -> None:
+        atual = self._pedidos.get(pedido['id'])
+        if atual is not None:
+            # Nunca substituir um estado mais novo por um mais antigo
+            if atual['data_atualizacao'] > pedido['data_atualizacao']:
+                return
+            self._remover(atual)
+        if pedido['status'] in _VALORES_EM_PRODUCAO:
+            self._inserir(pedido)
+    
+    def _inserir(self, pedido: Dict[str, Any]) -> None:
+        bisect.insort(self._chaves, self._chave(pedido))
+        self._pedidos[pedido['id']] = pedido
+    
+    def _remover(self, pedido: Dict[str, Any]) -> None:
+        chave = self._chave(pedido)
+        indice = bisect.bisect_left(self._chaves, chave)
+        if indice < len(self._chaves) and self._chaves[indice] == chave:
+            del self._chaves[indice]
+        del self._pedidos[pedido['id']]
+
+
+def consultar_pedidos_em_producao() -> List[Pedido]:
+    """Pedidos não finalizados, com itens carregados em lote, do mais antigo ao mais novo"""
+    return Pedido.query.options(selectinload(Pedido.itens)).filter(
+        Pedido.status.in_(STATUS_EM_PRODUCAO)
+    ).order_by(Pedido.data_criacao.asc(), Pedido.id.asc()).all()
+
+
+def reconstruir_fila(fila: FilaProducao) -> None:
+    """Recarrega a fila a partir do banco"""
+    fila.iniciar_carga()
+    fila.carregar(pedido.to_dict() for pedido in consultar_pedidos_em_producao())
+
+
+def obter_fila() -> FilaProducao:
+    """Fila da aplicação corrente, carregada do banco no primeiro acesso ou quando vencida"""
+    fila = current_app.extensions.get(EXTENSAO)
+    if fila is None:
+        intervalo = current_app.config.get('FILA_RESSINCRONIZACAO_SEGUNDOS', RESSINCRONIZACAO_PADRAO_SEGUNDOS)
+        fila = current_app.extensions.setdefault(EXTENSAO, FilaProducao(intervalo))
+    if fila.precisa_recarregar():
+        with fila.lock_carga:
+            if fila.precisa_recarregar():
+                reconstruir_fila(fila)
+    return fila
+
+
+def registrar_pedido(pedido: Dict[str, Any]) -> None:
+    """Propaga um pedido recém-gravado para a fila, se ela já estiver carregada (sem acessar o banco)"""
+    fila = current_app.extensions.get(EXTENSAO)
+    if fila is not None:
+        fila.registrar(pedido)
+
+
+def registrar_status_em_lote(pedido_ids: List[int], status: str, data_atualizacao: str) -> None:
+    """Propaga uma mudança de status em lote para a fila, se ela já estiver carregada"""
+    fila = current_app.extensions.get(EXTENSAO)
+    if fila is not None and fila.registrar_status(pedido_ids, status, data_atualizacao):
+        fila.invalidar()
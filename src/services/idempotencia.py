@@ -0,0 +1,88 @@
+"""
+Idempotência da criação de pedidos (header Idempotency-Key)
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import click
+from flask import Response, current_app, jsonify
+from flask.cli import with_appcontext
+
+from src.models.pedido import ChaveIdempotencia, db
+
+HEADER = 'Idempotency-Key'
+
+# Tempo durante o qual uma chave devolve a resposta original
+TTL_PADRAO_HORAS = 24
+
+TAMANHO_MAXIMO_CHAVE = 255
+
+
+def ttl_chaves() -> timedelta:
+    return timedelta(hours=current_app.config.get('IDEMPOTENCIA_TTL_HORAS', TTL_PADRAO_HORAS))
+
+
+def impressao_requisicao(dados: Any) -> str:
+    """SHA-256 da forma canônica do corpo, para detectar a mesma chave usada com outro pedido"""
+    canonico = json.dumps(dados, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonico.encode('utf-8')).hexdigest()
+
+
+def buscar_chave(chave: str, agora: Optional[datetime] = None) -> Optional[ChaveIdempotencia]:
+    """
+    Registro vigente da chave, numa leitura pela chave primária
+    
+    Um registro vencido é apagado (sem commit) para que a chave possa ser
+    reutilizada na mesma transação.
+    """
+    agora = agora or datetime.utcnow()
+    registro = db.session.get(ChaveIdempotencia, chave)
+    if registro is not None and registro.criado_em < agora - ttl_chaves():
+        db.session.delete(registro)
+        db.session.flush()
+        return None
+    return registro
+
+
+def registrar_chave(chave: str, impressao: str, pedido_id: int, status_http: int, resposta: Any) -> None:
+    """Grava a resposta na transação do pedido: os dois são confirmados (ou descartados) juntos"""
+    db.session.add(ChaveIdempotencia(
+        chave=chave,
+        impressao=impressao,
+        pedido_id=pedido_id,
+        status_http=status_http,
+        resposta=current_app.json.dumps(resposta, sort_keys=False)
+    ))
+
+
+def repetir_resposta(registro: ChaveIdempotencia, impressao: str):
+    """Devolve a resposta original, ou 422 se a chave foi usada com outro corpo"""
+    if registro.impressao != impressao:
+        return jsonify({'erro': f'{HEADER} já utilizada com outro pedido'}), 422
+    resposta = Response(registro.resposta, status=registro.status_http, mimetype='application/json')
+    resposta.headers['Idempotent-Replayed'] = 'true'
+    return resposta
+
+
+def expurgar_chaves_expiradas(agora: Optional[datetime] = None) -> int:
+    """
+    Apaga as chaves vencidas (usa o índice em criado_em)
+    
+    Returns:
+        int: Quantidade de chaves removidas
+    """
+    agora = agora or datetime.utcnow()
+    removidas = ChaveIdempotencia.query.filter(
+        ChaveIdempotencia.criado_em < agora - ttl_chaves()
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return removidas
+
+
+@click.command('expurgar-idempotencia')
+@with_appcontext
+def comando_expurgar_idempotencia():
+    """Remove as chaves de idempotência vencidas"""
+    click.echo(f'{expurgar_chaves_expiradas()} chave(s) de idempotência removida(s)')
@@ -0,0 +1,114 @@
+"""
+Montagem dos itens de um pedido a partir do payload do cliente
+"""
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.models.pedido import ItemPedido, Produto
+
+# Campos que, quando todos presentes, dispensam a consulta ao catálogo
+CAMPOS_PRECIFICADOS = ('nome_produto', 'categoria', 'preco_unitario')
+
+# Escala das colunas Numeric(10, 2): valores arredondados antes de montar os
+# itens, para que a resposta, a fila e o stream tragam o mesmo que o banco
+CENTAVOS = Decimal('0.01')
+
+
+def _item_precificado(item_data: Dict[str, Any]) -> bool:
+    return all(campo in item_data for campo in CAMPOS_PRECIFICADOS)
+
+
+def _quantidade(item_data: Dict[str, Any]) -> int:
+    quantidade = item_data['quantidade']
+    if isinstance(quantidade, bool) or not isinstance(quantidade, int) or quantidade <= 0:
+        raise ValueError('Quantidade inválida')
+    return quantidade
+
+
+def buscar_produtos_disponiveis(produto_ids) -> Dict[int, Produto]:
+    """Produtos disponíveis do catálogo local com os ids informados, numa única consulta IN"""
+    if not produto_ids:
+        return {}
+    produtos = Produto.query.filter(Produto.id.in_(produto_ids), Produto.disponivel == True)
+    return {produto.id: produto for produto in produtos}
+
+
+def produtos_a_resolver(itens_data: List[Dict[str, Any]]) -> Set[int]:
+    """
+    Ids dos produtos que precisam ser buscados no catálogo para precificar os itens
+    
+    Raises:
+        ValueError: Se um item estiver incompleto ou com produto_id inválido
+    """
+    if not isinstance(itens_data, list):
+        raise ValueError('Dados incompletos do item')
+    for item_data in itens_data:
+        if not isinstance(item_data, dict) or 'produto_id' not in item_data or 'quantidade' not in item_data:
+            raise ValueError('Dados incompletos do item')
+    
+    try:
+        return {int(item['produto_id']) for item in itens_data if not _item_precificado(item)}
+    except (TypeError, ValueError) as e:
+        raise ValueError('Dados inválidos do item') from e
+
+
+def montar_itens(itens_data: List[Dict[str, Any]],
+                 produtos: Optional[Dict[int, Produto]] = None) -> Tuple[List[ItemPedido], Decimal]:
+    """
+    Cria os itens do pedido e calcula o total
+    
+    Itens com nome_produto, categoria e preco_unitario são usados como
+    enviados, com o preço arredondado a centavos. Itens só com produto_id e quantidade são precificados pelo
+    catálogo local; todos eles são resolvidos numa única consulta.
+    
+    Args:
+        itens_data: Itens como recebidos no JSON
+        produtos: Produtos disponíveis já carregados (ex.: para vários pedidos
+            de uma vez); se omitido, são buscados aqui
+    
+    Returns:
+        Tuple[List[ItemPedido], Decimal]: Itens (ainda sem pedido) e total do pedido
+    
+    Raises:
+        ValueError: Se um item estiver incompleto ou inválido, ou se algum
+            produto não existir ou estiver indisponível
+    """
+    a_resolver = produtos_a_resolver(itens_data)
+    if produtos is None:
+        produtos = buscar_produtos_disponiveis(a_resolver)
+    ausentes = a_resolver - produtos.keys()
+    if ausentes:
+        raise ValueError(f"Produto(s) não encontrado(s) ou indisponível(is): {', '.join(map(str, sorted(ausentes)))}")
+    
+    itens = []
+    total = Decimal('0.00')
+    for item_data in itens_data:
+        quantidade = _quantidade(item_data)
+        if _item_precificado(item_data):
+            try:
+                preco_unitario = Decimal(str(item_data['preco_unitario'])).quantize(CENTAVOS, ROUND_HALF_UP)
+            except InvalidOperation as e:
+                raise ValueError('Dados inválidos do item') from e
+            item = ItemPedido(
+                produto_id=item_data['produto_id'],
+                nome_produto=item_data['nome_produto'],
+                categoria=item_data['categoria'],
+                quantidade=quantidade,
+                preco_unitario=preco_unitario,
+                observacoes=item_data.get('observacoes')
+            )
+        else:
+            produto = produtos[int(item_data['produto_id'])]
+            item = ItemPedido(
+                produto_id=produto.id,
+                nome_produto=produto.nome,
+                categoria=produto.categoria,
+                quantidade=quantidade,
+                preco_unitario=produto.preco,
+                observacoes=item_data.get('observacoes')
+            )
+        
+        itens.append(item)
+        total += item.preco_unitario * item.quantidade
+    
+    return itens, total.quantize(CENTAVOS, ROUND_HALF_UP)
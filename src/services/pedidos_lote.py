@@ -0,0 +1,169 @@
+"""
+Criação de pedidos em lote (quiosques que voltam a ficar online, integração com o PDV)
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+
+from src.models.pedido import ItemPedido, Pedido, StatusPedido, db
+from src.services.itens_pedido import buscar_produtos_disponiveis, montar_itens, produtos_a_resolver
+from src.services.versao_pedidos import incrementar_versao_pedidos
+
+# Pedidos gravados por transação
+TAMANHO_LOTE_PEDIDOS = 500
+
+# Pedidos aceitos numa única requisição
+LIMITE_PEDIDOS_LOTE = 5000
+
+_COLUNAS_ITEM = ('produto_id', 'nome_produto', 'categoria', 'quantidade', 'preco_unitario', 'observacoes')
+
+
+def _validar(pedidos_data: List[Any]) -> Tuple[List[Tuple[int, Pedido]], List[Dict[str, Any]]]:
+    """Monta os pedidos válidos (ainda sem id) e os resultados de erro dos inválidos"""
+    a_resolver = {}
+    rejeitados = []
+    for indice, pedido_data in enumerate(pedidos_data):
+        try:
+            if not isinstance(pedido_data, dict) or not pedido_data.get('itens'):
+                raise ValueError('Itens do pedido são obrigatórios')
+            a_resolver[indice] = produtos_a_resolver(pedido_data['itens'])
+        except ValueError as e:
+            rejeitados.append({'indice': indice, 'erro': str(e)})
+    
+    # Uma única consulta ao catálogo para todos os pedidos do lote
+    produtos = buscar_produtos_disponiveis(set().union(*a_resolver.values()))
+    
+    validos = []
+    for indice in a_resolver:
+        pedido_data = pedidos_data[indice]
+        try:
+            itens, total = montar_itens(pedido_data['itens'], produtos)
+        except ValueError as e:
+            rejeitados.append({'indice': indice, 'erro': str(e)})
+            continue
+        pedido = Pedido(cliente_id=pedido_data.get('cliente_id'), status=StatusPedido.RECEBIDO, total=total)
+        pedido.itens = itens
+        validos.append((indice, pedido))
+    
+    return validos, rejeitados
+
+
+def _inserir_retornando_ids(tabela, linhas: List[Dict[str, Any]]) -> List[int]:
+    """
+    INSERT em lote (multi-VALUES) devolvendo os ids na ordem das linhas
+    
+    No SQLite, sort_by_parameter_order faria o SQLAlchemy emitir um INSERT
+    por linha; lá os rowids de um INSERT multi-VALUES são atribuídos em
+    ordem crescente, então basta ordenar os ids devolvidos.
+    """
+    if db.engine.dialect.name == 'sqlite':
+        ids = db.session.execute(insert(tabela).returning(tabela.c.id), linhas).scalars().all()
+        return sorted(ids)
+    return db.session.execute(
+        insert(tabela).returning(tabela.c.id, sort_by_parameter_order=True), linhas
+    ).scalars().all()
+
+
+def _gravar(pedidos: List[Pedido], agora: datetime) -> None:
+    """
+    Insere pedidos e itens com dois INSERTs em lote com RETURNING.
+    
+    Os objetos não entram na sessão: os ids devolvidos são atribuídos a eles
+    para que to_dict() produza a resposta sem reler o banco. Não faz commit.
+    """
+    ids = _inserir_retornando_ids(Pedido.__table__, [{
+        'cliente_id': pedido.cliente_id,
+        'status': pedido.status,
+        'total': pedido.total,
+        'data_criacao': agora,
+        'data_atualizacao': agora,
+    } for pedido in pedidos])
+    
+    itens = []
+    for pedido, pedido_id in zip(pedidos, ids):
+        pedido.id = pedido_id
+        pedido.data_criacao = pedido.data_atualizacao = agora
+        for item in pedido.itens:
+            item.pedido_id = pedido_id
+            itens.append(item)
+    
+    ids_itens = _inserir_retornando_ids(ItemPedido.__table__, [
+        {'pedido_id': item.pedido_id, **{coluna: getattr(item, coluna) for coluna in _COLUNAS_ITEM}}
+        for item in itens
+    ])
+    for item, item_id in zip(itens, ids_itens):
+        item.id = item_id
+    incrementar_versao_pedidos()
+
+
+def criar_pedidos_em_lote(pedidos_data: List[Any], tamanho_lote: int = TAMANHO_LOTE_PEDIDOS,
+                          agora: Optional[datetime] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Valida todos os pedidos e grava os válidos, com um commit a cada `tamanho_lote` pedidos
+    
+    Args:
+        pedidos_data: Pedidos como recebidos no JSON (cliente_id e itens)
+        tamanho_lote: Pedidos por transação
+        agora: Data de criação gravada nos pedidos
+    
+    Returns:
+        Tuple[List[Dict], List[Dict]]: Resultado por pedido, na ordem recebida
+            ({'indice', 'id', 'status', 'total'} ou {'indice', 'erro'}), e os
+            pedidos criados serializados, para notificação
+    """
+    agora = agora or datetime.utcnow()
+    validos, resultados = _validar(pedidos_data)
+    criados = []
+    
+    for inicio in range(0, len(validos), tamanho_lote):
+        lote = validos[inicio:inicio + tamanho_lote]
+        try:
+            _gravar([pedido for _, pedido in lote], agora)
+            db.session.commit()
+        except Exception as e:
+            # Falha isolada no lote: os anteriores já foram gravados
+            db.session.rollback()
+            resultados.extend({'indice': indice, 'erro': str(e)} for indice, _ in lote)
+            continue
+        
+        for indice, pedido in lote:
+            pedido_dict = pedido.to_dict()
+            criados.append(pedido_dict)
+            resultados.append({
+                'indice': indice,
+                'id': pedido.id,
+                'status': pedido.status.value,
+                'total': pedido_dict['total'],
+            })
+    
+    resultados.sort(key=lambda resultado: resultado['indice'])
+    return resultados, criados
+
+
+def atualizar_status_em_lote(pedido_ids: List[int], status: StatusPedido,
+                             agora: Optional[datetime] = None) -> List[int]:
+    """
+    Muda o status de vários pedidos com um único UPDATE ... WHERE id IN (...)
+    
+    Args:
+        pedido_ids: Ids dos pedidos
+        status: Novo status
+        agora: Data de atualização gravada
+        
+    Returns:
+        List[int]: Ids efetivamente atualizados (os inexistentes ficam de fora), em ordem crescente
+    """
+    agora = agora or datetime.utcnow()
+    stmt = update(Pedido.__table__).where(Pedido.__table__.c.id.in_(pedido_ids)).values(
+        status=status, data_atualizacao=agora
+    )
+    if db.engine.dialect.update_returning:
+        atualizados = sorted(db.session.execute(stmt.returning(Pedido.__table__.c.id)).scalars())
+    else:
+        # Bancos sem UPDATE ... RETURNING: os ids existentes são lidos antes, na mesma transação
+        atualizados = sorted(db.session.execute(select(Pedido.id).where(Pedido.id.in_(pedido_ids))).scalars())
+        db.session.execute(stmt)
+    if atualizados:
+        incrementar_versao_pedidos()
+    return atualizados
@@ -0,0 +1,163 @@
+"""
+Propagação entre processos das alterações de pedidos (vários workers ou instâncias)
+"""
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from flask import Flask
+from sqlalchemy.orm import selectinload
+
+from src.models.pedido import Pedido, db
+from src.services.eventos import BarramentoEventos, obter_barramento, publicar_evento
+from src.services.fila import registrar_pedido
+
+EXTENSAO = 'propagacao_eventos'
+
+# Intervalo entre consultas: atraso máximo de um evento gravado por outro processo
+INTERVALO_PADRAO_SEGUNDOS = 1.0
+
+# Alterações com data_atualizacao até esta janela antes da mais recente vista
+# continuam sendo conferidas: a data é gravada antes do commit, então uma
+# transação pode ficar visível depois de outra com data posterior
+JANELA_PADRAO_SEGUNDOS = 10
+
+logger = logging.getLogger(__name__)
+
+
+class PropagadorEventos:
+    """
+    Republica no barramento local as alterações de pedidos gravadas por outros processos.
+    
+    O BarramentoEventos é local ao processo: com vários workers, assinantes
+    do stream e long-polls só veriam as gravações do próprio worker. Esta
+    thread consulta periodicamente os pedidos com data_atualizacao recente
+    (índice ix_pedidos_data_atualizacao), descarta os que já passaram pelo
+    barramento deste processo e publica os demais como pedido_criado
+    (data_criacao igual a data_atualizacao) ou status_alterado, atualizando
+    também a fila em memória. Mudanças em lote de outro processo chegam como
+    um status_alterado por pedido. A entrega é "ao menos uma vez": numa
+    corrida rara, uma gravação local pode ser publicada duas vezes.
+    """
+    
+    def __init__(self, app: Flask, intervalo: float = INTERVALO_PADRAO_SEGUNDOS,
+                 janela: float = JANELA_PADRAO_SEGUNDOS):
+        self.app = app
+        self.intervalo = intervalo
+        self.janela = timedelta(seconds=janela)
+        self.marca: Optional[datetime] = None
+        # (id, data_atualizacao ISO) já publicados neste processo -> data_atualizacao, para expurgo
+        self._vistos: Dict[Tuple[int, str], datetime] = {}
+        self._sequencia = 0
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _registrar_locais(self, barramento: BarramentoEventos) -> None:
+        """Marca como vistos os pedidos dos eventos publicados no barramento desde a última rodada"""
+        eventos = barramento.eventos_desde(self._sequencia)
+        if eventos is None:
+            # Parte dos eventos já saiu do buffer: no pior caso, são republicados
+            self._sequencia = barramento.ultima_sequencia
+            return
+        for evento in eventos:
+            data_atualizacao = evento.dados.get('data_atualizacao')
+            if not data_atualizacao:
+                continue
+            ids = evento.dados['ids'] if 'ids' in evento.dados else [evento.dados.get('id')]
+            for pedido_id in ids:
+                self._vistos[(pedido_id, data_atualizacao)] = datetime.fromisoformat(data_atualizacao)
+        if eventos:
+            self._sequencia = eventos[-1].sequencia
+    
+    def verificar(self) -> int:
+        """
+        Executa uma rodada de consulta
+        
+        Returns:
+            int: Quantidade de eventos publicados
+        """
+        with self.app.app_context():
+            barramento = obter_barramento()
+            primeira = self.marca is None
+            if primeira:
+                self.marca = datetime.utcnow()
+                self._sequencia = barramento.ultima_sequencia
+            desde = self.marca - self.janela
+            
+            linhas = db.session.query(Pedido.id, Pedido.data_atualizacao).filter(
+                Pedido.data_atualizacao > desde
+            ).all()
+            # Depois da consulta, para incluir o que este processo publicou enquanto ela rodava
+            self._registrar_locais(barramento)
+            
+            pendentes = set()
+            for linha in linhas:
+                self.marca = max(self.marca, linha.data_atualizacao)
+                chave = (linha.id, linha.data_atualizacao.isoformat())
+                if primeira:
+                    # Alterações anteriores à partida do processo não são republicadas
+                    self._vistos[chave] = linha.data_atualizacao
+                elif chave not in self._vistos:
+                    pendentes.add(linha.id)
+            
+            publicados = 0
+            if pendentes:
+                pedidos = Pedido.query.options(selectinload(Pedido.itens)).filter(Pedido.id.in_(pendentes))
+                for pedido in pedidos:
+                    pedido_dict = pedido.to_dict()
+                    chave = (pedido.id, pedido_dict['data_atualizacao'])
+                    if chave in self._vistos:
+                        continue
+                    self._vistos[chave] = pedido.data_atualizacao
+                    evento = 'pedido_criado' if pedido.data_criacao == pedido.data_atualizacao else 'status_alterado'
+                    registrar_pedido(pedido_dict)
+                    publicar_evento(evento, pedido_dict)
+                    publicados += 1
+            db.session.remove()
+            
+            limite = self.marca - self.janela
+            for chave in [chave for chave, data in self._vistos.items() if data <= limite]:
+                del self._vistos[chave]
+            return publicados
+    
+    def executar(self) -> None:
+        """Laço da thread: uma rodada a cada intervalo"""
+        while not self._parar.is_set():
+            try:
+                self.verificar()
+            except Exception as e:
+                logger.warning('Falha ao propagar alterações de pedidos: %s', e)
+            self._parar.wait(self.intervalo)
+    
+    def iniciar(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.executar, name='propagacao-eventos', daemon=True)
+            self._thread.start()
+    
+    def parar(self, timeout: Optional[float] = None) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def iniciar_propagacao_eventos(app: Flask) -> Optional[PropagadorEventos]:
+    """
+    Inicia a propagação entre processos, a cada EVENTOS_PROPAGACAO_SEGUNDOS (0 desliga).
+    
+    Necessária quando mais de um processo grava pedidos (workers do
+    gunicorn, várias instâncias); o servidor de desenvolvimento não a inicia.
+    """
+    intervalo = app.config.get('EVENTOS_PROPAGACAO_SEGUNDOS', INTERVALO_PADRAO_SEGUNDOS)
+    if not intervalo:
+        return None
+    
+    propagador = app.extensions.get(EXTENSAO)
+    if propagador is None:
+        propagador = PropagadorEventos(
+            app, intervalo,
+            janela=app.config.get('EVENTOS_PROPAGACAO_JANELA_SEGUNDOS', JANELA_PADRAO_SEGUNDOS),
+        )
+        app.extensions[EXTENSAO] = propagador
+        propagador.iniciar()
+    return propagador
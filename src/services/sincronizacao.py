@@ -0,0 +1,288 @@
+"""
+Sincronização do catálogo local de produtos
+"""
+import hashlib
+import json
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.models.pedido import Produto, ProdutoStaging, db
+
+# Campos comparados para decidir se um produto mudou
+CAMPOS_PRODUTO = ('nome', 'categoria', 'preco', 'descricao', 'disponivel')
+
+# Tamanho máximo das listas de ids em cláusulas IN
+TAMANHO_LOTE_IDS = 500
+
+# Produtos por commit na ingestão NDJSON
+TAMANHO_LOTE_NDJSON = 500
+
+# Idade a partir da qual um lote de staging é considerado abandonado
+VALIDADE_LOTE = timedelta(hours=1)
+
+_CENTAVOS = Decimal('0.01')
+
+# Os hashes dos produtos são somados módulo 2^256, o que torna o hash do
+# catálogo independente da ordem em que os produtos chegam
+_MODULO_HASH = 2 ** 256
+
+
+def normalizar_produto(dados: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte um produto recebido do serviço de produtos para os tipos do modelo
+    
+    Args:
+        dados: Produto como recebido no JSON
+        
+    Returns:
+        Dict: Produto com id inteiro, preço Decimal em centavos e disponibilidade booleana
+        
+    Raises:
+        ValueError: Se faltarem campos obrigatórios ou houver valores inválidos
+    """
+    try:
+        return {
+            'id': int(dados['id']),
+            'nome': dados['nome'],
+            'categoria': dados['categoria'],
+            'preco': Decimal(str(dados['preco'])).quantize(_CENTAVOS),
+            'descricao': dados.get('descricao'),
+            'disponivel': bool(dados.get('disponivel', True)),
+        }
+    except (KeyError, TypeError, ValueError, InvalidOperation) as e:
+        raise ValueError('Dados incompletos ou inválidos do produto') from e
+
+
+def hash_produto(produto: Dict[str, Any]) -> int:
+    """SHA-256 da forma canônica de um produto normalizado, como inteiro"""
+    canonico = json.dumps(
+        [produto['id'], produto['nome'], produto['categoria'], str(produto['preco']),
+         produto['descricao'], produto['disponivel']],
+        ensure_ascii=False, separators=(',', ':')
+    )
+    return int.from_bytes(hashlib.sha256(canonico.encode('utf-8')).digest(), 'big')
+
+
+class HashCatalogo:
+    """
+    Hash canônico de um catálogo, calculado incrementalmente produto a produto.
+    
+    Dois catálogos com os mesmos produtos têm o mesmo hash, em qualquer ordem;
+    serve para reconhecer cargas repetidas sem compará-las com o banco.
+    """
+    
+    def __init__(self):
+        self._soma = 0
+    
+    def adicionar(self, produto: Dict[str, Any]) -> None:
+        self._soma = (self._soma + hash_produto(produto)) % _MODULO_HASH
+    
+    def hexdigest(self) -> str:
+        return f'{self._soma:064x}'
+
+
+def hash_catalogo(produtos: Iterable[Dict[str, Any]]) -> str:
+    """Hash canônico de uma lista de produtos normalizados"""
+    acumulador = HashCatalogo()
+    for produto in produtos:
+        acumulador.adicionar(produto)
+    return acumulador.hexdigest()
+
+
+def _insert_com_upsert():
+    """INSERT ... ON CONFLICT (id) DO UPDATE no dialeto do banco, ou None se não suportado"""
+    dialeto = db.engine.dialect.name
+    if dialeto == 'sqlite':
+        stmt = sqlite.insert(Produto.__table__)
+    elif dialeto == 'postgresql':
+        stmt = postgresql.insert(Produto.__table__)
+    else:
+        return None
+    return stmt.on_conflict_do_update(
+        index_elements=[Produto.__table__.c.id],
+        set_={campo: stmt.excluded[campo] for campo in CAMPOS_PRODUTO + ('data_atualizacao',)}
+    )
+
+
+def _em_lotes(valores: List[Any], tamanho: int) -> Iterable[List[Any]]:
+    for inicio in range(0, len(valores), tamanho):
+        yield valores[inicio:inicio + tamanho]
+
+
+def aplicar_delta(produtos: Iterable[Dict[str, Any]], remover_ausentes: bool = True,
+                  agora: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Grava apenas as diferenças entre os produtos recebidos e o catálogo local.
+    
+    Novos e alterados vão num único INSERT ... ON CONFLICT executado em lote
+    (executemany). Produtos inalterados só são tocados quando trazem uma
+    data_atualizacao mais nova que a gravada: a data é atualizada (sem
+    contar como alteração), para que a marca d'água da sincronização
+    incremental avance além deles. Não faz commit.
+    
+    Args:
+        produtos: Produtos já normalizados
+        remover_ausentes: Remove produtos locais que não vieram na carga (carga completa)
+        agora: Data de atualização gravada nos produtos alterados
+        
+    Returns:
+        Dict[str, int]: Quantidades de inseridos, atualizados, inalterados e removidos
+    """
+    agora = agora or datetime.utcnow()
+    recebidos = {produto['id']: produto for produto in produtos}
+    
+    colunas = [getattr(Produto, campo) for campo in CAMPOS_PRODUTO]
+    existentes, datas = {}, {}
+    for linha in db.session.query(Produto.id, Produto.data_atualizacao, *colunas):
+        existentes[linha[0]] = tuple(linha[2:])
+        datas[linha[0]] = linha[1]
+    
+    novos, alterados, so_data = [], [], []
+    for produto_id, produto in recebidos.items():
+        atual = existentes.get(produto_id)
+        if atual is None:
+            novos.append({**produto, 'data_atualizacao': produto.get('data_atualizacao') or agora})
+        elif atual != tuple(produto[campo] for campo in CAMPOS_PRODUTO):
+            alterados.append({**produto, 'data_atualizacao': produto.get('data_atualizacao') or agora})
+        elif produto.get('data_atualizacao') and (datas[produto_id] is None
+                                                  or produto['data_atualizacao'] > datas[produto_id]):
+            so_data.append({'id': produto_id, 'data_atualizacao': produto['data_atualizacao']})
+    
+    removidos = sorted(set(existentes) - set(recebidos)) if remover_ausentes else []
+    
+    upsert = _insert_com_upsert()
+    if upsert is not None and (novos or alterados):
+        db.session.execute(upsert, novos + alterados)
+    elif upsert is None:
+        if novos:
+            db.session.execute(insert(Produto), novos)
+        if alterados:
+            db.session.execute(update(Produto), alterados)
+    if so_data:
+        db.session.execute(update(Produto), so_data)
+    
+    for lote in _em_lotes(removidos, TAMANHO_LOTE_IDS):
+        db.session.execute(Produto.__table__.delete().where(Produto.__table__.c.id.in_(lote)))
+    
+    return {
+        'inseridos': len(novos),
+        'atualizados': len(alterados),
+        'inalterados': len(recebidos) - len(novos) - len(alterados),
+        'removidos': len(removidos),
+    }
+
+
+def novo_lote() -> str:
+    """
+    Inicia uma carga completa na tabela de sombra
+    
+    Returns:
+        str: Identificador do lote, usado nas etapas seguintes
+    """
+    # Descartar lotes de sincronizações interrompidas
+    limite = datetime.utcnow() - VALIDADE_LOTE
+    db.session.execute(ProdutoStaging.__table__.delete().where(ProdutoStaging.criado_em < limite))
+    return uuid.uuid4().hex
+
+
+def gravar_lote(lote: str, produtos: List[Dict[str, Any]], agora: Optional[datetime] = None) -> None:
+    """Acrescenta produtos normalizados ao lote, num INSERT em lote. Não faz commit."""
+    if not produtos:
+        return
+    agora = agora or datetime.utcnow()
+    db.session.execute(insert(ProdutoStaging), [
+        {'data_atualizacao': agora, **produto, 'lote': lote, 'criado_em': agora}
+        for produto in produtos
+    ])
+
+
+def trocar_catalogo(lote: str) -> int:
+    """
+    Substitui o catálogo ativo pelo conteúdo do lote.
+    
+    A troca é feita no banco (DELETE + INSERT ... SELECT) e fica visível de uma
+    vez no commit: leitores de outras conexões continuam vendo o catálogo
+    anterior até lá, e a transação de escrita na tabela ativa é curta
+    independentemente de como o lote foi montado. Não faz commit.
+    
+    Returns:
+        int: Quantidade de produtos do novo catálogo
+    """
+    produtos = Produto.__table__
+    staging = ProdutoStaging.__table__
+    colunas = ('id',) + CAMPOS_PRODUTO + ('data_atualizacao',)
+    
+    total = db.session.execute(
+        select(func.count()).select_from(staging).where(staging.c.lote == lote)
+    ).scalar_one()
+    
+    db.session.execute(produtos.delete())
+    db.session.execute(produtos.insert().from_select(
+        colunas, select(*(staging.c[coluna] for coluna in colunas)).where(staging.c.lote == lote)
+    ))
+    descartar_lote(lote)
+    return total
+
+
+def descartar_lote(lote: str) -> None:
+    """Remove as linhas de um lote da tabela de sombra. Não faz commit."""
+    db.session.execute(ProdutoStaging.__table__.delete().where(ProdutoStaging.lote == lote))
+
+
+def ler_ndjson(stream: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """
+    Lê produtos de um corpo NDJSON (um objeto JSON por linha), um de cada vez
+    
+    Args:
+        stream: Corpo da requisição
+        
+    Returns:
+        Iterator[Dict]: Produtos normalizados, sem carregar o corpo inteiro em memória
+        
+    Raises:
+        ValueError: Se uma linha não for JSON válido ou não for um produto válido
+    """
+    for numero, linha in enumerate(stream, 1):
+        linha = linha.strip()
+        if not linha:
+            continue
+        try:
+            yield normalizar_produto(json.loads(linha))
+        except ValueError as e:
+            raise ValueError(f'Linha {numero}: {e}') from e
+
+
+def carregar_lote_ndjson(lote: str, stream: IO[bytes], tamanho_lote: int = TAMANHO_LOTE_NDJSON,
+                         acumulador: Optional[HashCatalogo] = None) -> int:
+    """
+    Grava no lote os produtos de um corpo NDJSON, com commit a cada `tamanho_lote` produtos.
+    
+    A memória usada fica limitada ao tamanho do lote e a escrita começa antes
+    do fim do upload. Como tudo vai para a tabela de sombra, os commits
+    parciais não aparecem no catálogo ativo. Se `acumulador` for informado,
+    cada produto lido é somado ao hash do catálogo.
+    
+    Returns:
+        int: Quantidade de produtos gravados
+    """
+    total = 0
+    pendentes = []
+    for produto in ler_ndjson(stream):
+        if acumulador is not None:
+            acumulador.adicionar(produto)
+        pendentes.append(produto)
+        if len(pendentes) >= tamanho_lote:
+            gravar_lote(lote, pendentes)
+            db.session.commit()
+            total += len(pendentes)
+            pendentes = []
+    if pendentes:
+        gravar_lote(lote, pendentes)
+        db.session.commit()
+        total += len(pendentes)
+    return total
@@ -0,0 +1,316 @@
+"""
+Sincronização incremental do catálogo puxada do serviço de produtos
+"""
+import http.client
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from flask import Flask
+
+from src.models.pedido import db
+from src.services.catalogo import (
+    avancar_marca_sync, incrementar_versao_catalogo, ler_marca_sync, publicar_versao_catalogo
+)
+from src.services.sincronizacao import aplicar_delta, normalizar_produto
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+EXTENSAO = 'sync_produtos'
+
+# Intervalo entre consultas bem-sucedidas ao serviço de produtos
+INTERVALO_PADRAO_SEGUNDOS = 30
+
+# Espera inicial após uma falha (dobrada a cada falha seguida) e o teto do backoff
+BACKOFF_INICIAL_SEGUNDOS = 1
+BACKOFF_MAXIMO_SEGUNDOS = 300
+
+TIMEOUT_PADRAO_SEGUNDOS = 10
+
+# Conexões keep-alive mantidas abertas por destino
+CONEXOES_POR_DESTINO = 4
+
+# Arquivo de trava que elege um único processo sincronizador por host (workers do gunicorn)
+TRAVA_PADRAO = os.path.join(tempfile.gettempdir(), 'pedidos-sync-produtos.lock')
+
+logger = logging.getLogger(__name__)
+
+
+class ErroSincronizacao(Exception):
+    """Resposta inesperada do serviço de produtos"""
+
+
+class SessaoHTTP:
+    """
+    Pool de conexões HTTP/1.1 keep-alive para um único destino.
+    
+    Reutiliza a mesma conexão TCP entre consultas, evitando um handshake
+    (e, em HTTPS, uma negociação TLS) a cada sincronização. Uma conexão
+    reaproveitada que o servidor já fechou é refeita uma vez, de forma transparente.
+    """
+    
+    def __init__(self, url_base: str, timeout: float = TIMEOUT_PADRAO_SEGUNDOS,
+                 tamanho: int = CONEXOES_POR_DESTINO):
+        partes = urlsplit(url_base)
+        if partes.scheme not in ('http', 'https'):
+            raise ValueError(f'Esquema não suportado: {url_base}')
+        self._classe = http.client.HTTPSConnection if partes.scheme == 'https' else http.client.HTTPConnection
+        self._host = partes.hostname
+        self._porta = partes.port
+        self.caminho = partes.path or '/'
+        self.timeout = timeout
+        self._livres: 'queue.LifoQueue[http.client.HTTPConnection]' = queue.LifoQueue(maxsize=tamanho)
+        self.conexoes_abertas = 0
+    
+    def _nova_conexao(self) -> http.client.HTTPConnection:
+        self.conexoes_abertas += 1
+        return self._classe(self._host, self._porta, timeout=self.timeout)
+    
+    def _devolver(self, conexao: http.client.HTTPConnection) -> None:
+        try:
+            self._livres.put_nowait(conexao)
+        except queue.Full:
+            conexao.close()
+    
+    def get_json(self, parametros: Optional[Dict[str, str]] = None) -> Tuple[int, Any]:
+        """
+        GET no caminho da URL base com os parâmetros informados
+        
+        Returns:
+            Tuple[int, Any]: Status HTTP e corpo JSON decodificado (None se vazio)
+        """
+        alvo = self.caminho + (f'?{urlencode(parametros)}' if parametros else '')
+        cabecalhos = {'Accept': 'application/json', 'Connection': 'keep-alive'}
+        
+        try:
+            conexao, reaproveitada = self._livres.get_nowait(), True
+        except queue.Empty:
+            conexao, reaproveitada = self._nova_conexao(), False
+        
+        try:
+            try:
+                conexao.request('GET', alvo, headers=cabecalhos)
+                resposta = conexao.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reaproveitada:
+                    raise
+                # O servidor fechou a conexão ociosa: refazer numa conexão nova
+                conexao.close()
+                conexao = self._nova_conexao()
+                conexao.request('GET', alvo, headers=cabecalhos)
+                resposta = conexao.getresponse()
+            corpo = resposta.read()
+        except BaseException:
+            conexao.close()
+            raise
+        
+        if resposta.will_close:
+            conexao.close()
+        else:
+            self._devolver(conexao)
+        
+        return resposta.status, json.loads(corpo) if corpo else None
+    
+    def fechar(self) -> None:
+        while True:
+            try:
+                self._livres.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class TravaExclusiva:
+    """
+    Trava de arquivo (flock) não bloqueante, disputada pelos processos do mesmo host.
+    
+    Só o processo que a obtém sincroniza; os demais tentam de novo a cada
+    intervalo. O sistema libera a trava quando o processo dono termina,
+    então outro worker assume se ele morrer ou for reciclado.
+    """
+    
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._arquivo = None
+    
+    @property
+    def obtida(self) -> bool:
+        return self._arquivo is not None
+    
+    def tentar(self) -> bool:
+        """Obtém a trava se estiver livre; True se este processo a detém"""
+        if self._arquivo is not None:
+            return True
+        arquivo = open(self.caminho, 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(arquivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                arquivo.close()
+                return False
+        self._arquivo = arquivo
+        return True
+    
+    def liberar(self) -> None:
+        if self._arquivo is not None:
+            # Fechar o arquivo desfaz o flock
+            self._arquivo.close()
+            self._arquivo = None
+
+
+def _data_utc(valor: str) -> datetime:
+    """Converte um timestamp ISO 8601 para datetime UTC sem fuso, como gravado no banco"""
+    data = datetime.fromisoformat(valor.replace('Z', '+00:00'))
+    if data.tzinfo is not None:
+        data = data.astimezone(timezone.utc).replace(tzinfo=None)
+    return data
+
+
+class ClienteSyncProdutos:
+    """
+    Consulta periodicamente `GET <PRODUTOS_SYNC_URL>?since=<timestamp>` e aplica as mudanças.
+    
+    O `since` é a maior data_atualizacao já recebida por esta consulta,
+    guardada em CatalogoMeta.marca_sync, e segue só o relógio do serviço de
+    produtos. Ela não é lida de Produto.data_atualizacao: as cargas
+    enviadas (/api/produtos/sync) gravam ali o relógio local no momento em
+    que são aplicadas, o que pularia as mudanças feitas no serviço entre a
+    foto enviada e a aplicação. Sem marca (primeira consulta), vem o
+    catálogo inteiro. Produtos repetidos na fronteira do `since` não geram
+    escrita (aplicar_delta ignora inalterados).
+    Só produtos alterados chegam; remoções devem vir como `disponivel: false`.
+    Com uma trava, só o processo que a detém consulta o serviço.
+    """
+    
+    def __init__(self, app: Flask, url: str, sessao: Optional[SessaoHTTP] = None,
+                 intervalo: float = INTERVALO_PADRAO_SEGUNDOS,
+                 backoff_inicial: float = BACKOFF_INICIAL_SEGUNDOS,
+                 backoff_maximo: float = BACKOFF_MAXIMO_SEGUNDOS,
+                 trava: Optional[TravaExclusiva] = None):
+        self.app = app
+        self.sessao = sessao or SessaoHTTP(url)
+        self.trava = trava
+        self.intervalo = intervalo
+        self.backoff_inicial = backoff_inicial
+        self.backoff_maximo = backoff_maximo
+        self.falhas = 0
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def proxima_espera(self) -> float:
+        """Intervalo normal sem falhas; backoff exponencial limitado após falhas seguidas"""
+        if not self.falhas:
+            return self.intervalo
+        return min(self.backoff_inicial * 2 ** (self.falhas - 1), self.backoff_maximo)
+    
+    def sincronizar(self) -> Dict[str, int]:
+        """
+        Executa uma consulta incremental e grava as diferenças
+        
+        Returns:
+            Dict[str, int]: Contagens de aplicar_delta e a versão do catálogo
+        
+        Raises:
+            ErroSincronizacao: Se o serviço responder com erro ou conteúdo inválido
+        """
+        with self.app.app_context():
+            ultima = ler_marca_sync()
+            db.session.close()
+            
+            status, dados = self.sessao.get_json({'since': ultima.isoformat()} if ultima else None)
+            if status != 200:
+                raise ErroSincronizacao(f'Serviço de produtos respondeu {status}')
+            if not isinstance(dados, dict) or not isinstance(dados.get('produtos'), list):
+                raise ErroSincronizacao('Resposta sem lista de produtos')
+            
+            try:
+                produtos = []
+                for produto_data in dados['produtos']:
+                    produto = normalizar_produto(produto_data)
+                    if produto_data.get('data_atualizacao'):
+                        produto['data_atualizacao'] = _data_utc(produto_data['data_atualizacao'])
+                    produtos.append(produto)
+            except (ValueError, TypeError, AttributeError) as e:
+                raise ErroSincronizacao(str(e)) from e
+            
+            try:
+                contagens = aplicar_delta(produtos, remover_ausentes=False)
+                datas = [produto['data_atualizacao'] for produto in produtos if produto.get('data_atualizacao')]
+                if datas:
+                    avancar_marca_sync(max(datas))
+                versao = None
+                if contagens['inseridos'] or contagens['atualizados']:
+                    # Carga parcial: o hash de conteúdo do catálogo deixa de ser conhecido
+                    versao = incrementar_versao_catalogo()
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            
+            if versao is not None:
+                publicar_versao_catalogo(versao)
+            return {**contagens, 'versao': versao}
+    
+    def executar(self) -> None:
+        """Laço da thread: sincroniza, espera e recua exponencialmente enquanto houver falhas"""
+        while not self._parar.is_set():
+            if self.trava is not None and not self.trava.tentar():
+                # Outro processo sincroniza; assumir se ele terminar
+                self._parar.wait(self.intervalo)
+                continue
+            try:
+                self.sincronizar()
+                self.falhas = 0
+            except Exception as e:
+                self.falhas += 1
+                logger.warning('Falha ao sincronizar produtos (%d seguidas): %s', self.falhas, e)
+            self._parar.wait(self.proxima_espera())
+    
+    def iniciar(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.executar, name='sync-produtos', daemon=True)
+            self._thread.start()
+    
+    def parar(self, timeout: Optional[float] = None) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.sessao.fechar()
+        if self.trava is not None:
+            self.trava.liberar()
+
+
+def iniciar_sync_produtos(app: Flask) -> Optional[ClienteSyncProdutos]:
+    """
+    Inicia a sincronização puxada se PRODUTOS_SYNC_URL estiver configurada.
+    
+    Desligada por padrão: sem a URL o catálogo continua sendo recebido
+    apenas por POST /api/produtos/sync. Com vários workers, cada um inicia
+    o cliente, mas só o dono da trava PRODUTOS_SYNC_TRAVA (arquivo; vazio
+    desliga a trava) consulta o serviço de produtos.
+    """
+    url = app.config.get('PRODUTOS_SYNC_URL')
+    if not url:
+        return None
+    
+    cliente = app.extensions.get(EXTENSAO)
+    if cliente is None:
+        caminho_trava = app.config.get('PRODUTOS_SYNC_TRAVA', TRAVA_PADRAO)
+        cliente = ClienteSyncProdutos(
+            app, url,
+            sessao=SessaoHTTP(url, timeout=app.config.get('PRODUTOS_SYNC_TIMEOUT_SEGUNDOS', TIMEOUT_PADRAO_SEGUNDOS)),
+            intervalo=app.config.get('PRODUTOS_SYNC_INTERVALO_SEGUNDOS', INTERVALO_PADRAO_SEGUNDOS),
+            backoff_maximo=app.config.get('PRODUTOS_SYNC_BACKOFF_MAXIMO_SEGUNDOS', BACKOFF_MAXIMO_SEGUNDOS),
+            trava=TravaExclusiva(caminho_trava) if caminho_trava else None,
+        )
+        app.extensions[EXTENSAO] = cliente
+        cliente.iniciar()
+    return cliente
@@ -0,0 +1,29 @@
+"""
+Contador de alterações dos pedidos, base das ETags das listagens
+"""
+from sqlalchemy import update
+
+from src.models.pedido import PedidosMeta, db
+
+
+def ler_versao_pedidos() -> int:
+    """Versão atual dos pedidos gravada no banco, numa leitura pela chave primária (0 se nunca alterados)"""
+    versao = db.session.query(PedidosMeta.versao).filter(PedidosMeta.id == 1).scalar()
+    return versao or 0
+
+
+def incrementar_versao_pedidos() -> None:
+    """
+    Incrementa a versão dos pedidos na transação corrente. Não faz commit.
+    
+    Deve acompanhar toda gravação em pedidos. O UPDATE trava a linha até o
+    commit, então as versões seguem a ordem dos commits, ao contrário de
+    data_atualizacao, gravada antes dele: uma transação que confirma depois
+    de outra com data posterior ainda muda a versão.
+    """
+    tabela = PedidosMeta.__table__
+    resultado = db.session.execute(update(tabela).where(tabela.c.id == 1).values(versao=tabela.c.versao + 1))
+    if resultado.rowcount == 0:
+        # Banco sem a linha semeada por inicializar_banco()
+        db.session.add(PedidosMeta(id=1, versao=1))
+        db.session.flush()
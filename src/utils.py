@@ -3,7 +3,8 @@ Funções utilitárias para o microsserviço de pedidos
 """
 from decimal import Decimal
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import base64
 import json
 
 def calcular_total_pedido(itens: List[Dict[str, Any]]) -> Decimal:
@@ -286,3 +287,38 @@ def validar_dados_pedido_completo(dados: Dict[str, Any]) -> Dict[str, Any]:
         'resumo': gerar_resumo_pedido(dados) if len(erros) == 0 else None
     }
 
+
+def codificar_cursor(data_criacao: datetime, pedido_id: int) -> str:
+    """
+    Gera o cursor opaco de paginação a partir da chave (data_criacao, id)
+    
+    Args:
+        data_criacao: Data de criação do último pedido da página
+        pedido_id: ID do último pedido da página
+        
+    Returns:
+        str: Cursor codificado em base64 (seguro para URL)
+    """
+    bruto = f"{data_criacao.isoformat()}|{pedido_id}"
+    return base64.urlsafe_b64encode(bruto.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decodificar_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Recupera a chave (data_criacao, id) de um cursor de paginação
+    
+    Args:
+        cursor: Cursor recebido do cliente
+        
+    Returns:
+        Tuple[datetime, int]: Data de criação e ID do último pedido visto
+        
+    Raises:
+        ValueError: Se o cursor estiver malformado
+    """
+    try:
+        preenchimento = '=' * (-len(cursor) % 4)
+        bruto = base64.urlsafe_b64decode(cursor + preenchimento).decode('utf-8')
+        data_texto, id_texto = bruto.split('|')
+        return datetime.fromisoformat(data_texto), int(id_texto)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Cursor inválido') from e
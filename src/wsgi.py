@@ -0,0 +1,61 @@
+"""
+Ponto de entrada WSGI de produção
+
+    gunicorn -c gunicorn.conf.py src.wsgi:app
+
+A aplicação é criada na importação; com preload_app isso acontece uma
+única vez no processo mestre, antes do fork. Threads de fundo e conexões
+não sobrevivem ao fork, então são iniciadas em cada worker pelos ganchos
+do gunicorn.conf.py, que chamam as funções abaixo.
+"""
+from typing import Optional
+
+from flask import Flask
+
+from src.main import create_app
+from src.models.pedido import db
+from src.services.eventos import EXTENSAO as EXTENSAO_EVENTOS
+from src.services.propagacao import EXTENSAO as EXTENSAO_PROPAGACAO, iniciar_propagacao_eventos
+from src.services.sync_produtos import EXTENSAO as EXTENSAO_SYNC, iniciar_sync_produtos
+
+app = create_app()
+
+
+def iniciar_worker(app: Flask) -> None:
+    """
+    Prepara um worker recém-criado pelo fork
+    
+    Descarta (sem fechar) conexões que o mestre tenha aberto, para que os
+    processos não compartilhem sockets do banco, inicia a propagação das
+    alterações gravadas por outros workers para o barramento de eventos
+    local e a sincronização puxada do catálogo, se configurada.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+    iniciar_propagacao_eventos(app)
+    iniciar_sync_produtos(app)
+
+
+def liberar_conexoes_longas(app: Flask) -> None:
+    """Encerra streams SSE e long-polls em espera, para que o worker termine dentro do graceful_timeout"""
+    barramento = app.extensions.get(EXTENSAO_EVENTOS)
+    if barramento is not None:
+        barramento.encerrar()
+
+
+def encerrar_worker(app: Flask, timeout: Optional[float] = None) -> None:
+    """
+    Desligamento do worker: libera as conexões longas, para as threads de fundo e fecha o pool do banco
+    
+    Args:
+        app: Aplicação do worker
+        timeout: Espera máxima por cada thread de fundo, em segundos
+    """
+    liberar_conexoes_longas(app)
+    for extensao in (EXTENSAO_PROPAGACAO, EXTENSAO_SYNC):
+        servico = app.extensions.get(extensao)
+        if servico is not None:
+            servico.parar(timeout)
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
@@ -52,3 +52,48 @@ def setup_db(app):
         db.session.rollback()
         db.session.close()
 
+
+@pytest.fixture(scope='function')
+def banco_uri():
+    """URI do banco da aplicação de teste; sobrescreva no módulo para usar um arquivo"""
+    return 'sqlite:///:memory:'
+
+@pytest.fixture(scope='function')
+def api_app(banco_uri):
+    """Aplicação criada pela factory do pacote src, com banco isolado por teste"""
+    from src.main import create_app
+    from src.models.migracoes import inicializar_banco
+    from src.models.pedido import db as src_db
+    
+    api = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': banco_uri,
+        'SQLALCHEMY_ENGINE_OPTIONS': {},
+    })
+    
+    with api.app_context():
+        inicializar_banco()
+        yield api
+        src_db.session.remove()
+        src_db.engine.dispose()
+
+@pytest.fixture(scope='function')
+def api_client(api_app):
+    """Cliente de teste para a aplicação ligada aos módulos do pacote src"""
+    return api_app.test_client()
+
+@pytest.fixture(scope='function')
+def contador_consultas(api_app):
+    """Registra os comandos SQL executados no engine da aplicação de teste"""
+    from sqlalchemy import event
+    from src.models.pedido import db as src_db
+    
+    comandos = []
+    
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        comandos.append(statement)
+    
+    engine = src_db.engine
+    event.listen(engine, 'before_cursor_execute', registrar)
+    yield comandos
+    event.remove(engine, 'before_cursor_execute', registrar)
@@ -0,0 +1,67 @@
+"""
+Servidor HTTP local que imita o endpoint incremental do serviço de produtos
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class ServidorProdutos:
+    """
+    Responde `GET /api/produtos?since=<iso>` com os produtos atualizados depois de `since`.
+    
+    Fala HTTP/1.1 com keep-alive, conta as conexões aceitas e pode falhar
+    (HTTP 503) um número configurável de vezes, para testar o backoff.
+    """
+    
+    def __init__(self):
+        self.produtos = []
+        self.consultas = []
+        self.conexoes = 0
+        self.falhas_pendentes = 0
+        servidor = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def setup(self):
+                super().setup()
+                servidor.conexoes += 1
+            
+            def do_GET(self):
+                partes = urlsplit(self.path)
+                since = parse_qs(partes.query).get('since', [None])[0]
+                servidor.consultas.append(since)
+                
+                if servidor.falhas_pendentes:
+                    servidor.falhas_pendentes -= 1
+                    self._responder(503, {'erro': 'indisponível'})
+                    return
+                
+                produtos = [p for p in servidor.produtos if since is None or p['data_atualizacao'] > since]
+                self._responder(200, {'produtos': produtos})
+            
+            def _responder(self, status, dados):
+                corpo = json.dumps(dados).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+            
+            def log_message(self, *args):
+                pass
+        
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._httpd.server_address[1]}/api/produtos'
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
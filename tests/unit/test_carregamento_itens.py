@@ -0,0 +1,89 @@
+import pytest
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+from src.models.pedido import Pedido, ItemPedido, StatusPedido, db
+from src.services.fila import FilaProducao, reconstruir_fila
+
+
+def criar_pedidos_com_itens(quantidade, cliente_id='12345678901'):
+    """Cria pedidos com dois itens cada"""
+    inicio = datetime(2024, 1, 1, 12, 0, 0)
+    for i in range(quantidade):
+        pedido = Pedido(cliente_id=cliente_id, total=Decimal('23.50'), data_criacao=inicio + timedelta(minutes=i))
+        pedido.itens.append(ItemPedido(produto_id=1, nome_produto='Hambúrguer', categoria='Lanche',
+                                       quantidade=1, preco_unitario=Decimal('15.50')))
+        pedido.itens.append(ItemPedido(produto_id=2, nome_produto='Batata', categoria='Acompanhamento',
+                                       quantidade=1, preco_unitario=Decimal('8.00')))
+        db.session.add(pedido)
+    db.session.commit()
+    db.session.expire_all()
+
+
+def consultas_da_requisicao(api_client, contador_consultas, url):
+    """Executa a requisição e devolve quantas consultas SELECT ela disparou"""
+    contador_consultas.clear()
+    response = api_client.get(url)
+    assert response.status_code == 200
+    return len([c for c in contador_consultas if c.lstrip().upper().startswith('SELECT')])
+
+
+class TestCarregamentoItens:
+    """As rotas de listagem carregam os itens em lote, com número fixo de consultas"""
+    
+    @pytest.mark.parametrize('url,esperado', [
+        ('/api/pedidos?limit=200', 3),  # marca d'água do ETag + pedidos + itens
+        ('/api/pedidos/cliente/12345678901', 2),
+    ])
+    def test_numero_de_consultas_nao_depende_da_quantidade(self, api_client, contador_consultas, url, esperado):
+        criar_pedidos_com_itens(3)
+        poucos = consultas_da_requisicao(api_client, contador_consultas, url)
+        
+        criar_pedidos_com_itens(40)
+        muitos = consultas_da_requisicao(api_client, contador_consultas, url)
+        
+        assert poucos == muitos == esperado
+    
+    def test_reconstrucao_da_fila_com_numero_fixo_de_consultas(self, api_app, contador_consultas):
+        criar_pedidos_com_itens(3)
+        contador_consultas.clear()
+        reconstruir_fila(FilaProducao())
+        poucos = len(contador_consultas)
+        
+        criar_pedidos_com_itens(40)
+        contador_consultas.clear()
+        reconstruir_fila(FilaProducao())
+        
+        assert poucos == len(contador_consultas) == 2
+    
+    def test_itens_serializados(self, api_client):
+        criar_pedidos_com_itens(2)
+        dados = api_client.get('/api/pedidos').get_json()
+        assert all(len(p['itens']) == 2 for p in dados['pedidos'])
+
+
+class TestCriacaoPedido:
+    """POST /api/pedidos grava pedido e itens num único flush e não relê nada"""
+    
+    ITENS = [
+        {'produto_id': 1, 'nome_produto': 'Hambúrguer', 'categoria': 'Lanche', 'quantidade': 2, 'preco_unitario': 15.50},
+        {'produto_id': 2, 'nome_produto': 'Batata', 'categoria': 'Acompanhamento', 'quantidade': 1, 'preco_unitario': 8.00},
+        {'produto_id': 3, 'nome_produto': 'Suco', 'categoria': 'Bebida', 'quantidade': 1, 'preco_unitario': 6.00},
+    ]
+    
+    def test_nenhuma_leitura(self, api_client, contador_consultas):
+        contador_consultas.clear()
+        response = api_client.post('/api/pedidos', json={'cliente_id': '12345678901', 'itens': self.ITENS})
+        
+        assert response.status_code == 201
+        assert [c for c in contador_consultas if c.lstrip().upper().startswith('SELECT')] == []
+        assert len([c for c in contador_consultas if c.startswith('INSERT INTO pedidos')]) == 1
+        # Só o contador de alterações das listagens (versao_pedidos.py)
+        assert [c.split(' SET')[0] for c in contador_consultas if c.startswith('UPDATE')] == ['UPDATE pedidos_meta']
+    
+    def test_resposta_igual_ao_banco(self, api_client):
+        criado = api_client.post('/api/pedidos', json={'cliente_id': '12345678901', 'itens': self.ITENS}).get_json()
+        
+        assert criado['total'] == 45.0
+        assert all(item['id'] for item in criado['itens'])
+        assert api_client.get(f"/api/pedidos/{criado['id']}").get_json() == criado
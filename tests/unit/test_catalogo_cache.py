@@ -0,0 +1,86 @@
+import pytest
+
+from src.models.pedido import CatalogoMeta, Produto, db
+
+CATALOGO = {
+    'produtos': [
+        {'id': 1, 'nome': 'Hambúrguer', 'categoria': 'Lanche', 'preco': 15.50, 'descricao': 'Clássico'},
+        {'id': 2, 'nome': 'Batata Frita', 'categoria': 'Acompanhamento', 'preco': 8.00},
+        {'id': 3, 'nome': 'Suco', 'categoria': 'Bebida', 'preco': 6.00, 'disponivel': False},
+    ]
+}
+
+
+@pytest.fixture
+def catalogo_sincronizado(api_client):
+    response = api_client.post('/api/produtos/sync', json=CATALOGO)
+    assert response.status_code == 200
+    return response.get_json()['versao']
+
+
+class TestCatalogoCache:
+    """GET /api/produtos servido do cache versionado"""
+    
+    def test_conteudo_igual_ao_da_consulta(self, api_client, catalogo_sincronizado):
+        dados = api_client.get('/api/produtos').get_json()
+        
+        assert dados['total'] == 2
+        assert [p['nome'] for p in dados['produtos']] == ['Batata Frita', 'Hambúrguer']
+        assert api_client.get('/api/produtos?categoria=Lanche').get_json()['total'] == 1
+    
+    def test_leituras_entre_sincronizacoes_nao_acessam_o_banco(self, api_client, catalogo_sincronizado, contador_consultas):
+        api_client.get('/api/produtos')
+        api_client.get('/api/produtos?categoria=Lanche')
+        
+        contador_consultas.clear()
+        for _ in range(5):
+            api_client.get('/api/produtos')
+            api_client.get('/api/produtos?categoria=Lanche')
+        
+        assert contador_consultas == []
+    
+    def test_etag_e_304(self, api_client, catalogo_sincronizado):
+        etag = api_client.get('/api/produtos').headers['ETag']
+        
+        response = api_client.get('/api/produtos', headers={'If-None-Match': etag})
+        
+        assert response.status_code == 304
+        assert etag != api_client.get('/api/produtos?categoria=Lanche').headers['ETag']
+    
+    def test_sincronizacao_incrementa_versao_e_invalida(self, api_client, catalogo_sincronizado):
+        etag = api_client.get('/api/produtos').headers['ETag']
+        
+        novo = {'produtos': [{'id': 9, 'nome': 'Milkshake', 'categoria': 'Sobremesa', 'preco': 12.00}]}
+        versao = api_client.post('/api/produtos/sync', json=novo).get_json()['versao']
+        response = api_client.get('/api/produtos', headers={'If-None-Match': etag})
+        
+        assert versao == catalogo_sincronizado + 1
+        assert response.status_code == 200
+        assert [p['nome'] for p in response.get_json()['produtos']] == ['Milkshake']
+    
+    def test_revalida_versao_gravada_por_outro_processo(self, api_app, api_client, catalogo_sincronizado):
+        api_app.config['CATALOGO_REVALIDACAO_SEGUNDOS'] = 0.000001
+        assert api_client.get('/api/produtos?categoria=Bebida').get_json()['total'] == 0
+        
+        # Outro worker sincronizou: a versão no banco mudou sem passar por este processo
+        db.session.add(Produto(id=10, nome='Água', categoria='Bebida', preco=3))
+        db.session.get(CatalogoMeta, 1).versao += 1
+        db.session.commit()
+        
+        assert api_client.get('/api/produtos?categoria=Bebida').get_json()['total'] == 1
+    
+    def test_catalogo_vazio(self, api_client):
+        assert api_client.get('/api/produtos').get_json() == {'produtos': [], 'total': 0}
+    
+    @pytest.mark.parametrize('categoria', ['a"b', 'Bebida☕'])
+    def test_categoria_com_aspas_ou_fora_do_latin1(self, api_client, catalogo_sincronizado, categoria):
+        response = api_client.get('/api/produtos', query_string={'categoria': categoria})
+        etag = response.headers['ETag']
+        
+        assert response.status_code == 200
+        assert response.get_json() == {'produtos': [], 'total': 0}
+        # O servidor escreve os cabeçalhos em Latin-1
+        assert etag.isascii()
+        assert api_client.get('/api/produtos', query_string={'categoria': categoria},
+                              headers={'If-None-Match': etag}).status_code == 304
+        assert etag != api_client.get('/api/produtos?categoria=Lanche').headers['ETag']
@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from src.config import CAMINHO_SQLITE_PADRAO, configurar_banco, opcoes_engine, uri_banco
+
+
+class TestUriBanco:
+    
+    def test_padrao_sqlite_do_projeto(self):
+        assert uri_banco({}) == f'sqlite:///{CAMINHO_SQLITE_PADRAO}'
+    
+    def test_sqlalchemy_database_uri_tem_prioridade(self):
+        ambiente = {'SQLALCHEMY_DATABASE_URI': 'sqlite:////tmp/a.db', 'DATABASE_URL': 'postgresql://x/y'}
+        assert uri_banco(ambiente) == 'sqlite:////tmp/a.db'
+    
+    def test_database_url_com_esquema_antigo(self):
+        assert uri_banco({'DATABASE_URL': 'postgres://u:s@db:5432/pedidos'}) == 'postgresql://u:s@db:5432/pedidos'
+
+
+class TestOpcoesEngine:
+    
+    @pytest.mark.parametrize('uri', ['sqlite:///:memory:', 'sqlite://'])
+    def test_sqlite_em_memoria_sem_pool(self, uri):
+        assert opcoes_engine(uri, {'WSGI_THREADS': '8'}) == {}
+    
+    def test_sqlite_em_arquivo_dimensionado_pelas_threads(self):
+        opcoes = opcoes_engine('sqlite:////tmp/pedidos.db', {'WSGI_THREADS': '4', 'CONEXOES_LONGAS_MAXIMO': '32'})
+        assert opcoes == {'pool_size': 6, 'max_overflow': 32, 'pool_timeout': 30}
+    
+    def test_sqlite_aceita_o_pool_calculado(self, tmp_path):
+        opcoes = opcoes_engine(f"sqlite:///{tmp_path / 'pedidos.db'}", {'WSGI_THREADS': '4'})
+        engine = create_engine(f"sqlite:///{tmp_path / 'pedidos.db'}", **opcoes)
+        
+        assert isinstance(engine.pool, QueuePool)
+        assert (engine.pool.size(), engine.pool._max_overflow) == (6, 32)
+        engine.dispose()
+    
+    def test_postgres_dimensionado_pelas_threads(self):
+        opcoes = opcoes_engine('postgresql://db/pedidos', {'WSGI_THREADS': '8'})
+        assert opcoes == {
+            'pool_size': 10,
+            'max_overflow': 5,
+            'pool_recycle': 1800,
+            'pool_timeout': 30,
+            'pool_pre_ping': True,
+        }
+    
+    def test_limite_total_dividido_entre_workers(self):
+        opcoes = opcoes_engine('postgresql://db/pedidos', {
+            'WSGI_THREADS': '8', 'WEB_CONCURRENCY': '4', 'DB_MAX_CONEXOES': '24'
+        })
+        assert (opcoes['pool_size'], opcoes['max_overflow']) == (6, 0)
+    
+    def test_variaveis_explicitas(self):
+        opcoes = opcoes_engine('postgresql://db/pedidos', {
+            'DB_POOL_SIZE': '3', 'DB_MAX_OVERFLOW': '0', 'DB_POOL_RECYCLE': '600', 'DB_POOL_PRE_PING': '0'
+        })
+        assert (opcoes['pool_size'], opcoes['max_overflow'], opcoes['pool_recycle'], opcoes['pool_pre_ping']) == \
+            (3, 0, 600, False)
+    
+    def test_json_mesclado_por_cima(self):
+        opcoes = opcoes_engine('postgresql://db/pedidos', {
+            'SQLALCHEMY_ENGINE_OPTIONS': '{"pool_size": 20, "echo": true}'
+        })
+        assert opcoes['pool_size'] == 20
+        assert opcoes['echo'] is True
+
+
+class TestConfigurarBanco:
+    
+    def test_cria_diretorio_do_sqlite(self, tmp_path):
+        config = {}
+        caminho = tmp_path / 'dados' / 'pedidos.db'
+        
+        configurar_banco(config, {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{caminho}'})
+        
+        assert config['SQLALCHEMY_DATABASE_URI'] == f'sqlite:///{caminho}'
+        assert config['SQLALCHEMY_ENGINE_OPTIONS']['pool_size'] == 3
+        assert caminho.parent.is_dir()
@@ -0,0 +1,106 @@
+import pytest
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+from src.models.pedido import Pedido, StatusPedido, db
+from src.services.cache import CacheTTL
+from src.services.estatisticas import calcular_estatisticas
+
+
+def criar_pedido(status, total, data_criacao):
+    db.session.add(Pedido(status=status, total=Decimal(total), data_criacao=data_criacao))
+
+
+@pytest.fixture
+def pedidos_do_dia(api_app):
+    agora = datetime(2024, 6, 1, 12, 30, 0)
+    criar_pedido(StatusPedido.RECEBIDO, '10.00', agora - timedelta(minutes=10))
+    criar_pedido(StatusPedido.RECEBIDO, '15.50', agora - timedelta(minutes=20))
+    criar_pedido(StatusPedido.PRONTO, '20.00', agora - timedelta(hours=1, minutes=5))
+    criar_pedido(StatusPedido.FINALIZADO, '30.25', agora - timedelta(hours=2))
+    criar_pedido(StatusPedido.FINALIZADO, '99.00', agora - timedelta(days=3))
+    db.session.commit()
+    return agora
+
+
+class TestCalcularEstatisticas:
+    """Agregações feitas com GROUP BY no banco"""
+    
+    def test_contagens_e_receita_por_status(self, pedidos_do_dia):
+        estatisticas = calcular_estatisticas(24, agora=pedidos_do_dia)
+        
+        assert estatisticas['por_status'] == {
+            'Recebido': {'pedidos': 2, 'receita': Decimal('25.50')},
+            'Em preparação': {'pedidos': 0, 'receita': Decimal('0.00')},
+            'Pronto': {'pedidos': 1, 'receita': Decimal('20.00')},
+            'Finalizado': {'pedidos': 2, 'receita': Decimal('129.25')},
+        }
+        assert estatisticas['total_pedidos'] == 5
+        assert estatisticas['em_fila'] == 3
+        assert estatisticas['receita_total'] == Decimal('174.75')
+    
+    def test_serie_por_hora_na_janela(self, pedidos_do_dia):
+        estatisticas = calcular_estatisticas(24, agora=pedidos_do_dia)
+        
+        assert estatisticas['por_hora'] == [
+            {'hora': '2024-06-01T10:00:00', 'pedidos': 1, 'receita': Decimal('30.25')},
+            {'hora': '2024-06-01T11:00:00', 'pedidos': 1, 'receita': Decimal('20.00')},
+            {'hora': '2024-06-01T12:00:00', 'pedidos': 2, 'receita': Decimal('25.50')},
+        ]
+    
+    def test_numero_fixo_de_consultas(self, pedidos_do_dia, contador_consultas):
+        contador_consultas.clear()
+        calcular_estatisticas(24, agora=pedidos_do_dia)
+        assert len(contador_consultas) == 2
+        assert all('GROUP BY' in comando for comando in contador_consultas)
+
+
+class TestRotaEstatisticas:
+    """GET /api/pedidos/stats"""
+    
+    def test_resposta_json(self, api_client, pedidos_do_dia):
+        dados = api_client.get('/api/pedidos/stats?horas=168').get_json()
+        
+        assert dados['por_status']['Recebido'] == {'pedidos': 2, 'receita': 25.5}
+        assert dados['total_pedidos'] == 5
+        assert dados['janela_horas'] == 168
+    
+    def test_cache_curto(self, api_client, pedidos_do_dia, contador_consultas):
+        api_client.get('/api/pedidos/stats')
+        contador_consultas.clear()
+        api_client.get('/api/pedidos/stats')
+        assert contador_consultas == []
+    
+    @pytest.mark.parametrize('horas', ['0', '1000', 'abc'])
+    def test_janela_invalida(self, api_client, horas):
+        assert api_client.get(f'/api/pedidos/stats?horas={horas}').status_code == 400
+
+
+class TestCacheTTL:
+    """Cache com capacidade limitada e expiração"""
+    
+    def test_expira(self):
+        agora = [0.0]
+        cache = CacheTTL(ttl=5, relogio=lambda: agora[0])
+        cache.definir('a', 1)
+        assert cache.obter('a') == 1
+        agora[0] = 5.0
+        assert cache.obter('a') is None
+    
+    def test_descarta_o_menos_usado(self):
+        cache = CacheTTL(capacidade=2)
+        cache.definir('a', 1)
+        cache.definir('b', 2)
+        cache.obter('a')
+        cache.definir('c', 3)
+        assert cache.obter('b') is None
+        assert cache.obter('a') == 1
+        assert len(cache) == 2
+    
+    def test_obter_ou_calcular(self):
+        cache = CacheTTL()
+        chamadas = []
+        calcular = lambda: chamadas.append(1) or 'valor'
+        assert cache.obter_ou_calcular('k', calcular) == 'valor'
+        assert cache.obter_ou_calcular('k', calcular) == 'valor'
+        assert len(chamadas) == 1
@@ -0,0 +1,135 @@
+import pytest
+from datetime import datetime
+
+from src.models.pedido import StatusPedido, db
+from src.services.pedidos_lote import atualizar_status_em_lote
+from src.services.versao_pedidos import ler_versao_pedidos
+
+ITEM = {
+    'produto_id': 1,
+    'nome_produto': 'Hambúrguer',
+    'categoria': 'Lanche',
+    'quantidade': 1,
+    'preco_unitario': 15.50
+}
+
+
+def criar_pedido(api_client):
+    return api_client.post('/api/pedidos', json={'itens': [ITEM]}).get_json()['id']
+
+
+@pytest.mark.parametrize('url', ['/api/pedidos', '/api/pedidos?status=Recebido&limit=10', '/api/pedidos/fila'])
+class TestETagListagens:
+    """Listagens respondem 304 enquanto nada mudou"""
+    
+    def test_304_quando_nada_mudou(self, api_client, url):
+        criar_pedido(api_client)
+        primeira = api_client.get(url)
+        etag = primeira.headers['ETag']
+        
+        segunda = api_client.get(url, headers={'If-None-Match': etag})
+        
+        assert primeira.status_code == 200
+        assert segunda.status_code == 304
+        assert segunda.data == b''
+        assert segunda.headers['ETag'] == etag
+    
+    def test_etag_muda_com_novo_pedido_e_com_status(self, api_client, url):
+        pedido_id = criar_pedido(api_client)
+        etag1 = api_client.get(url).headers['ETag']
+        
+        criar_pedido(api_client)
+        etag2 = api_client.get(url).headers['ETag']
+        api_client.put(f'/api/pedidos/{pedido_id}/status', json={'status': 'Em preparação'})
+        resposta = api_client.get(url, headers={'If-None-Match': etag2})
+        
+        assert len({etag1, etag2, resposta.headers['ETag']}) == 3
+        assert resposta.status_code == 200
+
+
+class TestETagPedido:
+    """GET /api/pedidos/<id> condicional"""
+    
+    def test_304_sem_carregar_itens(self, api_client, contador_consultas):
+        pedido_id = criar_pedido(api_client)
+        etag = api_client.get(f'/api/pedidos/{pedido_id}').headers['ETag']
+        
+        contador_consultas.clear()
+        response = api_client.get(f'/api/pedidos/{pedido_id}', headers={'If-None-Match': etag})
+        
+        assert response.status_code == 304
+        assert not any('itens_pedido' in comando for comando in contador_consultas)
+    
+    def test_etag_muda_com_status(self, api_client):
+        pedido_id = criar_pedido(api_client)
+        etag = api_client.get(f'/api/pedidos/{pedido_id}').headers['ETag']
+        api_client.put(f'/api/pedidos/{pedido_id}/status', json={'status': 'Pronto'})
+        
+        response = api_client.get(f'/api/pedidos/{pedido_id}', headers={'If-None-Match': etag})
+        
+        assert response.status_code == 200
+        assert response.get_json()['status'] == 'Pronto'
+    
+    def test_etag_fraco_nao_vale_como_forte(self, api_client):
+        pedido_id = criar_pedido(api_client)
+        etag = api_client.get(f'/api/pedidos/{pedido_id}').headers['ETag']
+        
+        response = api_client.get(f'/api/pedidos/{pedido_id}', headers={'If-None-Match': 'W/' + etag})
+        
+        assert response.status_code == 200
+
+
+class TestETagFila:
+    """O ETag da fila depende apenas do conteúdo"""
+    
+    def test_fila_304_sem_consultar_o_banco(self, api_client, contador_consultas):
+        criar_pedido(api_client)
+        etag = api_client.get('/api/pedidos/fila').headers['ETag']
+        
+        contador_consultas.clear()
+        response = api_client.get('/api/pedidos/fila', headers={'If-None-Match': etag})
+        
+        assert response.status_code == 304
+        assert contador_consultas == []
+    
+    def test_ressincronizacao_sem_mudanca_mantem_etag(self, api_app, api_client):
+        from src.services.fila import obter_fila, reconstruir_fila
+        criar_pedido(api_client)
+        etag = api_client.get('/api/pedidos/fila').headers['ETag']
+        
+        reconstruir_fila(obter_fila())
+        
+        assert api_client.get('/api/pedidos/fila').headers['ETag'] == etag
+
+
+class TestETagCommitTardio:
+    """A versão dos pedidos segue a ordem dos commits, não data_atualizacao"""
+    
+    def test_alteracao_com_data_anterior_muda_etag(self, api_client):
+        primeiro = criar_pedido(api_client)
+        criar_pedido(api_client)
+        etag = api_client.get('/api/pedidos').headers['ETag']
+        
+        # Transação que marcou data_atualizacao antes do segundo pedido e só confirmou agora
+        atualizar_status_em_lote([primeiro], StatusPedido.PRONTO, agora=datetime(2000, 1, 1))
+        db.session.commit()
+        response = api_client.get('/api/pedidos', headers={'If-None-Match': etag})
+        
+        assert response.status_code == 200
+        assert response.get_json()['pedidos'][-1]['status'] == 'Pronto'
+    
+    def test_toda_gravacao_incrementa_a_versao(self, api_client):
+        versoes = [ler_versao_pedidos()]
+        pedido_id = criar_pedido(api_client)
+        versoes.append(ler_versao_pedidos())
+        api_client.put(f'/api/pedidos/{pedido_id}/status', json={'status': 'Pronto'})
+        versoes.append(ler_versao_pedidos())
+        api_client.put('/api/pedidos/status', json={'ids': [pedido_id], 'status': 'Finalizado'})
+        versoes.append(ler_versao_pedidos())
+        api_client.post('/api/pedidos/batch', json={'pedidos': [{'itens': [ITEM]}]})
+        versoes.append(ler_versao_pedidos())
+        # Lote sem pedidos existentes não grava nada
+        api_client.put('/api/pedidos/status', json={'ids': [999], 'status': 'Pronto'})
+        versoes.append(ler_versao_pedidos())
+        
+        assert versoes == [0, 1, 2, 3, 4, 4]
@@ -0,0 +1,123 @@
+import time
+import pytest
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+from src.models.pedido import Pedido, StatusPedido, db
+from src.services.fila import FilaProducao
+
+
+def payload(pedido_id, status='Recebido', minuto=0, atualizacao=0):
+    """Pedido serializado no formato de Pedido.to_dict()"""
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    return {
+        'id': pedido_id,
+        'status': status,
+        'data_criacao': (base + timedelta(minutes=minuto)).isoformat(),
+        'data_atualizacao': (base + timedelta(minutes=minuto, seconds=atualizacao)).isoformat(),
+        'itens': [],
+    }
+
+
+ITEM = {
+    'produto_id': 1,
+    'nome_produto': 'Hambúrguer',
+    'categoria': 'Lanche',
+    'quantidade': 1,
+    'preco_unitario': 15.50
+}
+
+
+class TestFilaProducao:
+    """Testes da estrutura ordenada em memória"""
+    
+    def test_ordena_por_data_de_criacao_e_id(self):
+        fila = FilaProducao()
+        fila.carregar([payload(3, minuto=2), payload(1, minuto=0)])
+        fila.registrar(payload(2, minuto=2))
+        
+        assert [p['id'] for p in fila.listar()] == [1, 2, 3]
+    
+    def test_finalizado_sai_da_fila(self):
+        fila = FilaProducao()
+        fila.carregar([payload(1), payload(2, minuto=1)])
+        fila.registrar(payload(1, status='Finalizado', atualizacao=5))
+        
+        assert [p['id'] for p in fila.listar()] == [2]
+        assert len(fila) == 1
+    
+    def test_mudanca_de_status_substitui_entrada(self):
+        fila = FilaProducao()
+        fila.carregar([payload(1)])
+        fila.registrar(payload(1, status='Pronto', atualizacao=5))
+        
+        assert [p['status'] for p in fila.listar()] == ['Pronto']
+    
+    def test_ignora_estado_mais_antigo(self):
+        fila = FilaProducao()
+        fila.carregar([payload(1, status='Pronto', atualizacao=10)])
+        fila.registrar(payload(1, status='Em preparação', atualizacao=5))
+        
+        assert fila.listar()[0]['status'] == 'Pronto'
+    
+    def test_alteracoes_durante_carga_sao_reaplicadas(self):
+        fila = FilaProducao()
+        fila.iniciar_carga()
+        fila.registrar(payload(2, minuto=1))
+        fila.carregar([payload(1)])
+        
+        assert [p['id'] for p in fila.listar()] == [1, 2]
+    
+    def test_versao_muda_a_cada_alteracao(self):
+        fila = FilaProducao()
+        fila.carregar([])
+        versao = fila.versao
+        fila.registrar(payload(1))
+        assert fila.versao > versao
+    
+    def test_ressincronizacao(self):
+        assert FilaProducao().precisa_recarregar()
+        
+        fila = FilaProducao(intervalo_ressincronizacao=0)
+        fila.carregar([])
+        assert not fila.precisa_recarregar()
+
+
+class TestRotaFila:
+    """GET /api/pedidos/fila servido da fila em memória"""
+    
+    def test_fila_reflete_criacao_e_status_sem_consultar_o_banco(self, api_client, contador_consultas):
+        assert api_client.get('/api/pedidos/fila').get_json()['total'] == 0
+        
+        id1 = api_client.post('/api/pedidos', json={'itens': [ITEM]}).get_json()['id']
+        id2 = api_client.post('/api/pedidos', json={'itens': [ITEM]}).get_json()['id']
+        api_client.put(f'/api/pedidos/{id1}/status', json={'status': 'Finalizado'})
+        api_client.put(f'/api/pedidos/{id2}/status', json={'status': 'Pronto'})
+        
+        contador_consultas.clear()
+        dados = api_client.get('/api/pedidos/fila').get_json()
+        
+        assert contador_consultas == []
+        assert [(p['id'], p['status']) for p in dados['fila']] == [(id2, 'Pronto')]
+        assert dados['fila'][0]['itens'][0]['nome_produto'] == 'Hambúrguer'
+    
+    def test_fila_carregada_do_banco_no_primeiro_acesso(self, api_client):
+        inicio = datetime(2024, 1, 1, 12, 0, 0)
+        for i, status in enumerate(StatusPedido):
+            db.session.add(Pedido(status=status, total=Decimal('5.00'), data_criacao=inicio + timedelta(minutes=i)))
+        db.session.commit()
+        
+        dados = api_client.get('/api/pedidos/fila').get_json()
+        
+        assert [p['status'] for p in dados['fila']] == ['Recebido', 'Em preparação', 'Pronto']
+    
+    def test_ressincroniza_com_o_banco_quando_vencida(self, api_app, api_client):
+        api_app.config['FILA_RESSINCRONIZACAO_SEGUNDOS'] = 0.001
+        api_client.get('/api/pedidos/fila')
+        
+        # Pedido gravado por outro processo, sem passar pelas rotas
+        db.session.add(Pedido(total=Decimal('5.00')))
+        db.session.commit()
+        
+        time.sleep(0.01)
+        assert api_client.get('/api/pedidos/fila').get_json()['total'] == 1
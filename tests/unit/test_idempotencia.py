@@ -0,0 +1,114 @@
+import pytest
+from datetime import datetime, timedelta
+
+import src.routes.pedidos as rotas
+from src.models.pedido import ChaveIdempotencia, Pedido, db
+from src.services.eventos import obter_barramento
+from src.services.idempotencia import comando_expurgar_idempotencia, expurgar_chaves_expiradas
+
+PEDIDO = {
+    'cliente_id': '12345678901',
+    'itens': [{'produto_id': 1, 'nome_produto': 'Hambúrguer', 'categoria': 'Lanche',
+               'quantidade': 1, 'preco_unitario': 15.50}]
+}
+
+
+def criar(api_client, chave, corpo=PEDIDO):
+    return api_client.post('/api/pedidos', json=corpo, headers={'Idempotency-Key': chave})
+
+
+class TestIdempotencia:
+    """POST /api/pedidos com Idempotency-Key"""
+    
+    def test_repeticao_devolve_resposta_original(self, api_client):
+        primeira = criar(api_client, 'quiosque-1-0001')
+        segunda = criar(api_client, 'quiosque-1-0001')
+        
+        assert primeira.status_code == segunda.status_code == 201
+        assert segunda.get_json() == primeira.get_json()
+        assert segunda.headers['Idempotent-Replayed'] == 'true'
+        assert 'Idempotent-Replayed' not in primeira.headers
+        assert Pedido.query.count() == 1
+    
+    def test_repeticao_nao_executa_insercao(self, api_client, contador_consultas):
+        criar(api_client, 'quiosque-1-0001')
+        barramento = obter_barramento()
+        sequencia = barramento.ultima_sequencia
+        contador_consultas.clear()
+        
+        criar(api_client, 'quiosque-1-0001')
+        
+        assert len(contador_consultas) == 1
+        assert 'FROM chaves_idempotencia' in contador_consultas[0]
+        assert barramento.ultima_sequencia == sequencia
+    
+    def test_chaves_diferentes_criam_pedidos(self, api_client):
+        criar(api_client, 'a')
+        criar(api_client, 'b')
+        assert Pedido.query.count() == 2
+    
+    def test_sem_chave_nada_e_gravado(self, api_client):
+        api_client.post('/api/pedidos', json=PEDIDO)
+        assert ChaveIdempotencia.query.count() == 0
+    
+    def test_mesma_chave_com_outro_corpo(self, api_client):
+        criar(api_client, 'quiosque-1-0001')
+        response = criar(api_client, 'quiosque-1-0001', dict(PEDIDO, cliente_id='98765432100'))
+        
+        assert response.status_code == 422
+        assert Pedido.query.count() == 1
+    
+    @pytest.mark.parametrize('chave', ['', 'x' * 256])
+    def test_chave_invalida(self, api_client, chave):
+        assert criar(api_client, chave).status_code == 400
+    
+    def test_erro_de_validacao_nao_consome_a_chave(self, api_client):
+        assert criar(api_client, 'k', {'itens': [{'produto_id': 99, 'quantidade': 1}]}).status_code == 400
+        assert criar(api_client, 'k').status_code == 201
+    
+    def test_chave_vencida_pode_ser_reutilizada(self, api_app, api_client):
+        api_app.config['IDEMPOTENCIA_TTL_HORAS'] = 1
+        primeira = criar(api_client, 'k').get_json()
+        db.session.get(ChaveIdempotencia, 'k').criado_em = datetime.utcnow() - timedelta(hours=2)
+        db.session.commit()
+        
+        segunda = criar(api_client, 'k').get_json()
+        
+        assert segunda['id'] != primeira['id']
+        assert ChaveIdempotencia.query.count() == 1
+    
+    def test_duplicata_concorrente_devolve_resposta_da_primeira(self, api_client, monkeypatch):
+        primeira = criar(api_client, 'k').get_json()
+        
+        # A segunda requisição não vê a chave na leitura inicial, como se a
+        # primeira ainda não tivesse feito commit, e colide só na gravação
+        buscar_chave = rotas.buscar_chave
+        chamadas = []
+        
+        def buscar_antes_do_commit(chave):
+            chamadas.append(chave)
+            return None if len(chamadas) == 1 else buscar_chave(chave)
+        
+        monkeypatch.setattr(rotas, 'buscar_chave', buscar_antes_do_commit)
+        segunda = criar(api_client, 'k')
+        
+        assert segunda.status_code == 201
+        assert segunda.get_json() == primeira
+        assert Pedido.query.count() == 1
+
+
+class TestExpurgo:
+    
+    def test_remove_apenas_vencidas(self, api_app, api_client):
+        criar(api_client, 'antiga')
+        criar(api_client, 'nova')
+        db.session.get(ChaveIdempotencia, 'antiga').criado_em = datetime.utcnow() - timedelta(days=2)
+        db.session.commit()
+        
+        assert expurgar_chaves_expiradas() == 1
+        assert [c.chave for c in ChaveIdempotencia.query.all()] == ['nova']
+    
+    def test_comando_cli(self, api_app):
+        resultado = api_app.test_cli_runner().invoke(comando_expurgar_idempotencia)
+        assert resultado.exit_code == 0
+        assert '0 chave(s)' in resultado.output
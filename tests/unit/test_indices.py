@@ -0,0 +1,105 @@
+import pytest
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, inspect, text
+
+from src.models.pedido import Pedido, ItemPedido, StatusPedido, db
+from src.models.migracoes import aplicar_migracoes
+from src.utils import codificar_cursor
+
+
+@pytest.fixture
+def planos_de_consulta(api_app):
+    """Captura os SELECTs executados e devolve uma função que gera o EXPLAIN QUERY PLAN de cada um"""
+    capturados = []
+    
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            capturados.append((statement, parameters))
+    
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', registrar)
+    
+    def planos():
+        resultado = []
+        with engine.connect() as conn:
+            for statement, parameters in capturados:
+                linhas = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+                resultado.append((statement, [linha[-1] for linha in linhas]))
+        capturados.clear()
+        return resultado
+    
+    yield planos
+    event.remove(engine, 'before_cursor_execute', registrar)
+
+
+def popular():
+    inicio = datetime(2024, 1, 1, 12, 0, 0)
+    for i in range(20):
+        pedido = Pedido(cliente_id=f'{i % 4:011d}', status=list(StatusPedido)[i % 4],
+                        total=Decimal('8.00'), data_criacao=inicio + timedelta(minutes=i))
+        pedido.itens.append(ItemPedido(produto_id=1, nome_produto='Batata', categoria='Acompanhamento',
+                                       quantidade=1, preco_unitario=Decimal('8.00')))
+        db.session.add(pedido)
+    db.session.commit()
+
+
+class TestPlanosDeConsulta:
+    """Cada rota de leitura usa índice em vez de varredura completa da tabela"""
+    
+    @pytest.mark.parametrize('url', [
+        '/api/pedidos',
+        '/api/pedidos?status=Pronto',
+        '/api/pedidos?cliente_id=00000000001',
+        '/api/pedidos?status=Pronto&cliente_id=00000000001',
+        '/api/pedidos?limit=5&cursor=' + codificar_cursor(datetime(2024, 1, 1, 12, 10), 11),
+        '/api/pedidos?status=Recebido&limit=5&cursor=' + codificar_cursor(datetime(2024, 1, 1, 12, 10), 11),
+        '/api/pedidos/cliente/00000000002',
+        '/api/pedidos/fila',
+    ])
+    def test_rota_usa_indice(self, api_client, planos_de_consulta, url):
+        popular()
+        planos_de_consulta()
+        
+        assert api_client.get(url).status_code == 200
+        
+        planos = planos_de_consulta()
+        assert planos
+        for statement, detalhes in planos:
+            for detalhe in detalhes:
+                varredura = detalhe.startswith('SCAN') and detalhe != 'SCAN CONSTANT ROW'
+                assert not (varredura and 'USING' not in detalhe), (statement, detalhes)
+            # Busca pela chave primária (ex.: versão dos pedidos para a ETag) também conta
+            assert any('USING' in detalhe and ('INDEX' in detalhe or 'PRIMARY KEY' in detalhe)
+                       for detalhe in detalhes), (statement, detalhes)
+    
+    def test_listagem_geral_sem_ordenacao_temporaria(self, api_client, planos_de_consulta):
+        popular()
+        planos_de_consulta()
+        api_client.get('/api/pedidos?limit=5')
+        statement, detalhes = next(p for p in planos_de_consulta() if 'ORDER BY' in p[0])
+        assert not any('TEMP B-TREE' in detalhe for detalhe in detalhes), detalhes
+
+
+class TestMigracaoIndices:
+    """A migração cria índices ausentes em bancos criados sem eles"""
+    
+    def test_cria_indices_ausentes_e_e_idempotente(self, api_app):
+        for tabela in db.metadata.sorted_tables:
+            for indice in tabela.indexes:
+                indice.drop(bind=db.engine)
+        
+        criados = aplicar_migracoes()
+        
+        assert set(criados) == {
+            'ix_pedidos_data_criacao_id',
+            'ix_pedidos_status_data_criacao',
+            'ix_pedidos_cliente_id_data_criacao',
+            'ix_pedidos_data_atualizacao',
+            'ix_itens_pedido_pedido_id',
+            'ix_chaves_idempotencia_criado_em',
+        }
+        nomes = {indice['name'] for indice in inspect(db.engine).get_indexes('pedidos')}
+        assert 'ix_pedidos_status_data_criacao' in nomes
+        assert aplicar_migracoes() == []
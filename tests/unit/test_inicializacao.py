@@ -0,0 +1,95 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import inspect
+
+from src.main import create_app
+from src.models.pedido import db
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Orçamentos de partida a frio (melhor de algumas execuções, para absorver ruído da máquina)
+ORCAMENTO_IMPORTACAO_SEGUNDOS = 1.0   # `import src.main`, medido por -X importtime
+ORCAMENTO_CREATE_APP_SEGUNDOS = 0.25  # create_app() após a importação
+EXECUCOES = 3
+
+
+@pytest.fixture
+def caminho_banco(tmp_path):
+    return tmp_path / 'pedidos.db'
+
+
+def _python(codigo, caminho_banco, *opcoes):
+    ambiente = {**os.environ, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{caminho_banco}'}
+    ambiente.pop('PRODUTOS_SYNC_URL', None)
+    return subprocess.run(
+        [sys.executable, *opcoes, '-c', codigo],
+        cwd=RAIZ, env=ambiente, capture_output=True, text=True, check=True
+    )
+
+
+def _importacao_segundos(stderr, modulo='src.main'):
+    """Tempo acumulado do módulo no relatório do -X importtime (microssegundos na 2ª coluna)"""
+    for linha in stderr.splitlines():
+        partes = [parte.strip() for parte in linha.split('|')]
+        if len(partes) == 3 and partes[2] == modulo:
+            return int(partes[1]) / 1e6
+    raise AssertionError(f'{modulo} ausente do relatório de importtime')
+
+
+class TestImportacaoSemEfeitos:
+    
+    def test_importar_nao_cria_app_nem_banco(self, caminho_banco):
+        saida = _python('import src.main as m; print(m._app is None)', caminho_banco)
+        
+        assert saida.stdout.strip() == 'True'
+        assert not caminho_banco.exists()
+    
+    def test_create_app_nao_conecta_ao_banco(self, caminho_banco):
+        _python('from src.main import create_app; create_app()', caminho_banco)
+        
+        assert not caminho_banco.exists()
+    
+    def test_app_do_modulo_criado_sob_demanda(self, caminho_banco):
+        saida = _python('import src.main as m; a = m.app; print(type(a).__name__, a is m.app)', caminho_banco)
+        
+        assert saida.stdout.strip() == 'Flask True'
+
+
+class TestOrcamentoPartida:
+    
+    def test_importacao_dentro_do_orcamento(self, caminho_banco):
+        tempos = [
+            _importacao_segundos(_python('import src.main', caminho_banco, '-X', 'importtime').stderr)
+            for _ in range(EXECUCOES)
+        ]
+        
+        assert min(tempos) < ORCAMENTO_IMPORTACAO_SEGUNDOS, f'import src.main: {min(tempos):.3f}s'
+    
+    def test_create_app_dentro_do_orcamento(self, caminho_banco):
+        codigo = (
+            'import time; from src.main import create_app; '
+            'inicio = time.perf_counter(); create_app(); print(time.perf_counter() - inicio)'
+        )
+        tempos = [float(_python(codigo, caminho_banco).stdout) for _ in range(EXECUCOES)]
+        
+        assert min(tempos) < ORCAMENTO_CREATE_APP_SEGUNDOS, f'create_app(): {min(tempos):.3f}s'
+
+
+class TestInicializarBanco:
+    
+    def test_comando_cria_tabelas_e_indices(self, caminho_banco):
+        app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{caminho_banco}'})
+        
+        with app.app_context():
+            assert inspect(db.engine).get_table_names() == []
+            
+            resultado = app.test_cli_runner().invoke(args=['inicializar-banco'])
+            
+            assert resultado.exit_code == 0, resultado.output
+            assert set(inspect(db.engine).get_table_names()) == set(db.metadata.tables)
+            # Idempotente: a segunda execução não cria nada
+            assert 'Schema atualizado (0 ' in app.test_cli_runner().invoke(args=['inicializar-banco']).output
+            db.engine.dispose()
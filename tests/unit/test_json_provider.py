@@ -0,0 +1,91 @@
+import json
+import pytest
+from decimal import Decimal
+from datetime import datetime, date
+
+from flask import Flask
+
+import src.json_provider as json_provider
+from src.json_provider import PedidosJSONProvider
+from src.models.pedido import StatusPedido
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def app_json(request, monkeypatch):
+    """Aplicação com o provedor, exercitado com e sem o orjson disponível"""
+    if request.param == 'orjson':
+        if json_provider.orjson is None:
+            pytest.skip('orjson não instalado')
+    else:
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    app = Flask(__name__)
+    app.json = PedidosJSONProvider(app)
+    return app
+
+
+@pytest.fixture
+def provedor(app_json):
+    return app_json.json
+
+
+DOCUMENTO = {
+    'total': Decimal('31.50'),
+    'criado': datetime(2024, 1, 2, 3, 4, 5, 600000),
+    'dia': date(2024, 1, 2),
+    'status': StatusPedido.EM_PREPARACAO,
+    'itens': [{'preco': Decimal('8.00')}],
+}
+
+
+class TestPedidosJSONProvider:
+    """Codificação dos tipos do domínio nos dois caminhos (orjson e stdlib)"""
+    
+    def test_tipos_do_dominio(self, provedor):
+        assert json.loads(provedor.dumps(DOCUMENTO)) == {
+            'total': 31.5,
+            'criado': '2024-01-02T03:04:05.600000',
+            'dia': '2024-01-02',
+            'status': 'Em preparação',
+            'itens': [{'preco': 8.0}],
+        }
+    
+    def test_formato_de_data_igual_ao_to_dict(self, provedor):
+        data = datetime(2024, 1, 2, 3, 4, 5)
+        assert provedor.dumps(data) == json.dumps(data.isoformat())
+    
+    def test_chaves_ordenadas_e_utf8(self, provedor):
+        texto = provedor.dumps({'b': 'preparação', 'a': 1})
+        assert texto.index('"a"') < texto.index('"b"')
+        assert 'preparação' in texto
+    
+    def test_resposta(self, app_json):
+        with app_json.app_context():
+            response = app_json.json.response(DOCUMENTO)
+        assert response.mimetype == 'application/json'
+        assert response.data.endswith(b'\n')
+        assert json.loads(response.data)['status'] == 'Em preparação'
+    
+    def test_mesma_saida_nos_dois_caminhos(self, monkeypatch):
+        app = Flask(__name__)
+        app.json = PedidosJSONProvider(app)
+        com_orjson = app.json.dumps(DOCUMENTO)
+        monkeypatch.setattr(json_provider, 'orjson', None)
+        sem_orjson = app.json.dumps(DOCUMENTO)
+        assert json.loads(com_orjson) == json.loads(sem_orjson)
+    
+    def test_inteiro_grande_usa_fallback(self, provedor):
+        assert json.loads(provedor.dumps({'n': 2 ** 70})) == {'n': 2 ** 70}
+    
+    def test_tipo_desconhecido(self, provedor):
+        with pytest.raises(TypeError):
+            provedor.dumps({'x': object()})
+
+
+class TestRespostasDaApi:
+    """As rotas usam o provedor da aplicação"""
+    
+    def test_resposta_em_utf8(self, api_client):
+        item = {'produto_id': 1, 'nome_produto': 'Pão de Queijo', 'categoria': 'Lanche',
+                'quantidade': 1, 'preco_unitario': 5.0}
+        response = api_client.post('/api/pedidos', json={'itens': [item]})
+        assert 'Pão de Queijo'.encode('utf-8') in response.data
@@ -0,0 +1,61 @@
+import json
+import pytest
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+from src.models.pedido import Pedido, ItemPedido, StatusPedido, db
+
+
+def criar_pedidos(quantidade):
+    inicio = datetime(2024, 1, 1, 12, 0, 0)
+    for i in range(quantidade):
+        pedido = Pedido(cliente_id='12345678901' if i % 2 else None, total=Decimal('8.00'),
+                        status=StatusPedido.PRONTO if i % 3 == 0 else StatusPedido.RECEBIDO,
+                        data_criacao=inicio + timedelta(minutes=i))
+        pedido.itens.append(ItemPedido(produto_id=2, nome_produto='Batata', categoria='Acompanhamento',
+                                       quantidade=1, preco_unitario=Decimal('8.00')))
+        db.session.add(pedido)
+    db.session.commit()
+
+
+class TestListagemStreaming:
+    """GET /api/pedidos?stream=true"""
+    
+    def test_documento_completo_e_valido(self, api_client):
+        criar_pedidos(250)
+        
+        response = api_client.get('/api/pedidos?stream=true')
+        dados = json.loads(response.data)
+        
+        assert response.mimetype == 'application/json'
+        assert dados['total'] == 250
+        assert [p['id'] for p in dados['pedidos']] == list(range(250, 0, -1))
+        assert dados['pedidos'][0]['itens'][0]['nome_produto'] == 'Batata'
+    
+    def test_mesmo_conteudo_da_listagem_paginada(self, api_client):
+        criar_pedidos(30)
+        
+        paginada = api_client.get('/api/pedidos?limit=200&status=Pronto').get_json()
+        streaming = json.loads(api_client.get('/api/pedidos?stream=1&status=Pronto').data)
+        
+        assert streaming['pedidos'] == paginada['pedidos']
+        assert streaming['total'] == paginada['total']
+    
+    def test_enviado_em_lotes(self, api_app, api_client):
+        api_app.config['TAMANHO_LOTE_STREAM'] = 10
+        criar_pedidos(35)
+        
+        response = api_client.get('/api/pedidos?stream=true', buffered=False)
+        partes = list(response.response)
+        response.close()
+        
+        # Abertura, 4 lotes (10+10+10+5) e fechamento
+        assert len(partes) == 6
+        assert json.loads(b''.join(partes))['total'] == 35
+    
+    def test_sem_resultados(self, api_client):
+        dados = json.loads(api_client.get('/api/pedidos?stream=true&cliente_id=00000000000').data)
+        assert dados == {'pedidos': [], 'total': 0}
+    
+    def test_filtro_invalido_responde_400(self, api_client):
+        assert api_client.get('/api/pedidos?stream=true&status=Invalido').status_code == 400
@@ -0,0 +1,117 @@
+import threading
+import time
+import pytest
+
+from src.services.eventos import EXTENSAO_LIMITE
+
+ITEM = {
+    'produto_id': 1,
+    'nome_produto': 'Hambúrguer',
+    'categoria': 'Lanche',
+    'quantidade': 1,
+    'preco_unitario': 15.50
+}
+
+
+@pytest.fixture
+def pedido_id(api_client):
+    return api_client.post('/api/pedidos', json={'itens': [ITEM]}).get_json()['id']
+
+
+def atualizar_em_segundo_plano(api_app, pedido_id, status, atraso):
+    """Atualiza o status a partir de outra thread, como faria a tela da cozinha"""
+    def executar():
+        time.sleep(atraso)
+        with api_app.test_client() as outro_cliente:
+            outro_cliente.put(f'/api/pedidos/{pedido_id}/status', json={'status': status})
+    thread = threading.Thread(target=executar)
+    thread.start()
+    return thread
+
+
+class TestLongPollStatus:
+    """GET /api/pedidos/<id>/status?wait=&since="""
+    
+    def test_responde_imediatamente_se_status_ja_mudou(self, api_client, pedido_id):
+        inicio = time.monotonic()
+        dados = api_client.get(f'/api/pedidos/{pedido_id}/status?since=Pronto&wait=5').get_json()
+        
+        assert time.monotonic() - inicio < 1
+        assert dados['status'] == 'Recebido'
+        assert dados['alterado'] is True
+    
+    def test_acordado_pela_atualizacao_de_status(self, api_app, api_client, pedido_id):
+        thread = atualizar_em_segundo_plano(api_app, pedido_id, 'Pronto', atraso=0.1)
+        
+        inicio = time.monotonic()
+        dados = api_client.get(f'/api/pedidos/{pedido_id}/status?since=Recebido&wait=10').get_json()
+        decorrido = time.monotonic() - inicio
+        thread.join()
+        
+        assert decorrido < 5
+        assert dados['status'] == 'Pronto'
+        assert dados['alterado'] is True
+    
+    def test_nao_consulta_o_banco_durante_a_espera(self, api_app, api_client, pedido_id, contador_consultas):
+        thread = atualizar_em_segundo_plano(api_app, pedido_id, 'Pronto', atraso=0.2)
+        contador_consultas.clear()
+        api_client.get(f'/api/pedidos/{pedido_id}/status?since=Recebido&wait=10')
+        thread.join()
+        
+        # Uma leitura inicial do long-poll; as demais vêm da atualização feita pela outra thread
+        leituras_do_long_poll = [c for c in contador_consultas if c.lstrip().startswith('SELECT pedidos.status')]
+        assert len(leituras_do_long_poll) == 1
+    
+    def test_timeout_sem_mudanca(self, api_client, pedido_id):
+        dados = api_client.get(f'/api/pedidos/{pedido_id}/status?since=Recebido&wait=0.05').get_json()
+        assert dados['status'] == 'Recebido'
+        assert dados['alterado'] is False
+    
+    def test_sem_since_responde_status_atual(self, api_client, pedido_id):
+        dados = api_client.get(f'/api/pedidos/{pedido_id}/status').get_json()
+        assert dados == {
+            'id': pedido_id,
+            'status': 'Recebido',
+            'data_atualizacao': dados['data_atualizacao'],
+            'alterado': False
+        }
+    
+    def test_espera_limitada_pela_configuracao(self, api_app, api_client, pedido_id):
+        api_app.config['LONG_POLL_MAXIMO_SEGUNDOS'] = 0.05
+        inicio = time.monotonic()
+        api_client.get(f'/api/pedidos/{pedido_id}/status?since=Recebido&wait=30')
+        assert time.monotonic() - inicio < 2
+    
+    @pytest.mark.parametrize('consulta', ['since=Inexistente', 'wait=abc'])
+    def test_parametros_invalidos(self, api_client, pedido_id, consulta):
+        assert api_client.get(f'/api/pedidos/{pedido_id}/status?{consulta}').status_code == 400
+    
+    def test_pedido_inexistente(self, api_client):
+        assert api_client.get('/api/pedidos/999/status?since=Recebido&wait=1').status_code == 404
+    
+    def test_acima_do_limite_responde_503(self, api_app, api_client, pedido_id):
+        api_app.config['CONEXOES_LONGAS_MAXIMO'] = 1
+        respostas = []
+        
+        def aguardar():
+            with api_app.test_client() as outro_cliente:
+                respostas.append(outro_cliente.get(f'/api/pedidos/{pedido_id}/status?since=Recebido&wait=5'))
+        
+        thread = threading.Thread(target=aguardar)
+        thread.start()
+        limite = time.monotonic() + 5
+        while EXTENSAO_LIMITE not in api_app.extensions or not api_app.extensions[EXTENSAO_LIMITE].abertas:
+            assert time.monotonic() < limite
+            time.sleep(0.01)
+        
+        recusada = api_client.get(f'/api/pedidos/{pedido_id}/status?since=Recebido&wait=5')
+        # Consultas sem espera não ocupam vaga
+        imediata = api_client.get(f'/api/pedidos/{pedido_id}/status')
+        api_client.put(f'/api/pedidos/{pedido_id}/status', json={'status': 'Pronto'})
+        thread.join(timeout=5)
+        
+        assert recusada.status_code == 503
+        assert recusada.headers['Retry-After'] == '5'
+        assert imediata.status_code == 200
+        assert respostas[0].get_json()['status'] == 'Pronto'
+        assert api_app.extensions[EXTENSAO_LIMITE].abertas == 0
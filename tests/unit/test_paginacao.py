@@ -0,0 +1,95 @@
+import pytest
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+from src.models.pedido import Pedido, StatusPedido, db
+from src.utils import codificar_cursor, decodificar_cursor
+
+
+def criar_pedidos(quantidade, inicio=datetime(2024, 1, 1, 12, 0, 0), **campos):
+    """Cria pedidos com datas de criação crescentes"""
+    pedidos = []
+    for i in range(quantidade):
+        pedido = Pedido(total=Decimal('10.00'), data_criacao=inicio + timedelta(minutes=i), **campos)
+        db.session.add(pedido)
+        pedidos.append(pedido)
+    db.session.commit()
+    return pedidos
+
+
+class TestCursor:
+    """Testes para a codificação do cursor de paginação"""
+    
+    def test_cursor_ida_e_volta(self):
+        data = datetime(2024, 5, 1, 10, 30, 15, 123456)
+        assert decodificar_cursor(codificar_cursor(data, 42)) == (data, 42)
+    
+    def test_cursor_opaco(self):
+        cursor = codificar_cursor(datetime(2024, 5, 1), 7)
+        assert '|' not in cursor
+        assert '2024' not in cursor
+    
+    @pytest.mark.parametrize('cursor', ['', 'abc', '!!!', codificar_cursor(datetime(2024, 1, 1), 1)[:-3]])
+    def test_cursor_invalido(self, cursor):
+        with pytest.raises(ValueError):
+            decodificar_cursor(cursor)
+
+
+class TestPaginacaoPedidos:
+    """Testes para a paginação por cursor de GET /api/pedidos"""
+    
+    def test_percorre_todas_as_paginas_sem_repetir(self, api_client):
+        criar_pedidos(7)
+        
+        vistos = []
+        cursor = None
+        while True:
+            url = '/api/pedidos?limit=3' + (f'&cursor={cursor}' if cursor else '')
+            dados = api_client.get(url).get_json()
+            vistos.extend(p['id'] for p in dados['pedidos'])
+            cursor = dados['next_cursor']
+            if cursor is None:
+                break
+        
+        assert vistos == [7, 6, 5, 4, 3, 2, 1]
+    
+    def test_ultima_pagina_sem_cursor(self, api_client):
+        criar_pedidos(3)
+        dados = api_client.get('/api/pedidos?limit=3').get_json()
+        assert dados['total'] == 3
+        assert dados['limit'] == 3
+        assert dados['next_cursor'] is None
+    
+    def test_desempate_por_id_com_mesma_data(self, api_client):
+        mesma_data = datetime(2024, 1, 1, 12, 0, 0)
+        for _ in range(4):
+            db.session.add(Pedido(total=Decimal('1.00'), data_criacao=mesma_data))
+        db.session.commit()
+        
+        pagina1 = api_client.get('/api/pedidos?limit=2').get_json()
+        pagina2 = api_client.get(f"/api/pedidos?limit=2&cursor={pagina1['next_cursor']}").get_json()
+        
+        assert [p['id'] for p in pagina1['pedidos']] == [4, 3]
+        assert [p['id'] for p in pagina2['pedidos']] == [2, 1]
+    
+    def test_filtros_combinados_com_cursor(self, api_client):
+        criar_pedidos(4, cliente_id='11111111111', status=StatusPedido.PRONTO)
+        criar_pedidos(4, cliente_id='22222222222', status=StatusPedido.PRONTO)
+        criar_pedidos(4, cliente_id='11111111111', status=StatusPedido.RECEBIDO)
+        
+        url = '/api/pedidos?limit=3&status=Pronto&cliente_id=11111111111'
+        pagina1 = api_client.get(url).get_json()
+        pagina2 = api_client.get(f"{url}&cursor={pagina1['next_cursor']}").get_json()
+        
+        ids = [p['id'] for p in pagina1['pedidos'] + pagina2['pedidos']]
+        assert ids == [4, 3, 2, 1]
+        assert pagina2['next_cursor'] is None
+    
+    def test_limite_maximo_aplicado(self, api_client):
+        dados = api_client.get('/api/pedidos?limit=100000').get_json()
+        assert dados['limit'] == 200
+    
+    @pytest.mark.parametrize('consulta', ['limit=0', 'limit=abc', 'cursor=invalido'])
+    def test_parametros_invalidos(self, api_client, consulta):
+        response = api_client.get(f'/api/pedidos?{consulta}')
+        assert response.status_code == 400
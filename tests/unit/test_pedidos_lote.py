@@ -0,0 +1,113 @@
+import pytest
+from decimal import Decimal
+
+from src.models.pedido import ItemPedido, Pedido, Produto, db
+from src.services.eventos import obter_barramento
+from src.services.fila import obter_fila
+
+
+@pytest.fixture
+def catalogo(api_app):
+    db.session.add_all([
+        Produto(id=1, nome='Hambúrguer', categoria='Lanche', preco=Decimal('15.50')),
+        Produto(id=2, nome='Suco', categoria='Bebida', preco=Decimal('6.00')),
+    ])
+    db.session.commit()
+
+
+def pedido(*produto_ids, cliente_id=None):
+    return {'cliente_id': cliente_id, 'itens': [{'produto_id': produto_id, 'quantidade': 1} for produto_id in produto_ids]}
+
+
+def enviar(api_client, pedidos):
+    return api_client.post('/api/pedidos/batch', json={'pedidos': pedidos})
+
+
+class TestCriarPedidosLote:
+    """POST /api/pedidos/batch"""
+    
+    def test_cria_todos(self, catalogo, api_client):
+        response = enviar(api_client, [pedido(1, 2, cliente_id='12345678901'), pedido(2), {
+            'itens': [{'produto_id': 9, 'nome_produto': 'Água', 'categoria': 'Bebida',
+                       'quantidade': 2, 'preco_unitario': 3.00}]
+        }])
+        dados = response.get_json()
+        
+        assert response.status_code == 201
+        assert dados['criados'] == 3
+        assert [r['total'] for r in dados['resultados']] == [21.5, 6.0, 6.0]
+        assert [r['indice'] for r in dados['resultados']] == [0, 1, 2]
+        
+        primeiro = api_client.get(f"/api/pedidos/{dados['resultados'][0]['id']}").get_json()
+        assert primeiro['cliente_id'] == '12345678901'
+        assert [item['nome_produto'] for item in primeiro['itens']] == ['Hambúrguer', 'Suco']
+        assert ItemPedido.query.count() == 4
+    
+    def test_insercoes_em_lote(self, catalogo, api_client, contador_consultas):
+        enviar(api_client, [pedido(1, 2) for _ in range(20)])
+        
+        insercoes = [c for c in contador_consultas if c.startswith('INSERT')]
+        produtos = [c for c in contador_consultas if 'FROM produtos' in c]
+        assert len(insercoes) == 2
+        assert 'RETURNING' in insercoes[0]
+        assert len(produtos) == 1
+        assert Pedido.query.count() == 20
+    
+    def test_tamanho_do_lote_configuravel(self, catalogo, api_app, api_client, contador_consultas):
+        api_app.config['PEDIDOS_LOTE_TAMANHO'] = 3
+        
+        enviar(api_client, [pedido(1) for _ in range(7)])
+        
+        assert len([c for c in contador_consultas if c.startswith('INSERT INTO pedidos')]) == 3
+        assert Pedido.query.count() == 7
+    
+    def test_resultado_parcial(self, catalogo, api_client):
+        response = enviar(api_client, [pedido(1), pedido(99), {'itens': []}, pedido(2)])
+        dados = response.get_json()
+        
+        assert response.status_code == 207
+        assert (dados['criados'], dados['rejeitados']) == (2, 2)
+        assert '99' in dados['resultados'][1]['erro']
+        assert 'erro' in dados['resultados'][2]
+        assert 'id' in dados['resultados'][3]
+        assert Pedido.query.count() == 2
+    
+    def test_nenhum_valido(self, catalogo, api_client):
+        response = enviar(api_client, [pedido(99)])
+        assert response.status_code == 400
+        assert Pedido.query.count() == 0
+    
+    @pytest.mark.parametrize('corpo', [{}, {'pedidos': []}, {'pedidos': 'x'}])
+    def test_corpo_invalido(self, api_client, corpo):
+        assert api_client.post('/api/pedidos/batch', json=corpo).status_code == 400
+    
+    def test_limite_por_requisicao(self, catalogo, api_app, api_client):
+        api_app.config['PEDIDOS_LOTE_LIMITE'] = 2
+        assert enviar(api_client, [pedido(1)] * 3).status_code == 400
+    
+    def test_notifica_fila_e_stream(self, catalogo, api_client):
+        obter_fila()
+        barramento = obter_barramento()
+        inicio = barramento.ultima_sequencia
+        
+        dados = enviar(api_client, [pedido(1), pedido(2)]).get_json()
+        
+        ids = [r['id'] for r in dados['resultados']]
+        assert [p['id'] for p in obter_fila().listar()] == ids
+        eventos = barramento.eventos_desde(inicio)
+        assert [(e.tipo, e.dados['id']) for e in eventos] == [('pedido_criado', ids[0]), ('pedido_criado', ids[1])]
+    
+    def test_resultados_iguais_ao_gravado(self, api_client):
+        obter_fila()
+        response = enviar(api_client, [{
+            'itens': [{'produto_id': 9, 'nome_produto': 'Água', 'categoria': 'Bebida',
+                       'quantidade': 3, 'preco_unitario': 10.005}]
+        }])
+        [resultado] = response.get_json()['resultados']
+        gravado = api_client.get(f"/api/pedidos/{resultado['id']}").get_json()
+        [evento] = obter_barramento().eventos_desde(0)
+        [na_fila] = obter_fila().listar()
+        
+        assert resultado['total'] == gravado['total'] == 30.03
+        assert evento.dados == gravado
+        assert na_fila == gravado
@@ -0,0 +1,93 @@
+import pytest
+from decimal import Decimal
+
+from src.models.pedido import ItemPedido, Produto, db
+from src.services.itens_pedido import montar_itens
+
+
+@pytest.fixture
+def catalogo(api_app):
+    db.session.add_all([
+        Produto(id=1, nome='Hambúrguer', categoria='Lanche', preco=Decimal('15.50')),
+        Produto(id=2, nome='Suco', categoria='Bebida', preco=Decimal('6.00')),
+        Produto(id=3, nome='Milkshake', categoria='Sobremesa', preco=Decimal('12.00'), disponivel=False),
+    ])
+    db.session.commit()
+
+
+def criar(api_client, itens):
+    return api_client.post('/api/pedidos', json={'cliente_id': '12345678901', 'itens': itens})
+
+
+class TestMontarItens:
+    
+    def test_resolve_pelo_catalogo(self, catalogo):
+        itens, total = montar_itens([{'produto_id': 1, 'quantidade': 2}, {'produto_id': 2, 'quantidade': 1}])
+        
+        assert [(i.nome_produto, i.categoria, i.preco_unitario) for i in itens] == [
+            ('Hambúrguer', 'Lanche', Decimal('15.50')),
+            ('Suco', 'Bebida', Decimal('6.00')),
+        ]
+        assert total == Decimal('37.00')
+    
+    def test_item_precificado_usado_como_enviado(self, api_app):
+        itens, total = montar_itens([{'produto_id': 9, 'nome_produto': 'Água', 'categoria': 'Bebida',
+                                      'quantidade': 1, 'preco_unitario': 3.5}])
+        assert itens[0].nome_produto == 'Água'
+        assert total == Decimal('3.5')
+    
+    @pytest.mark.parametrize('item', [
+        {'produto_id': 1},
+        {'quantidade': 1},
+        {'produto_id': 1, 'quantidade': 0},
+        {'produto_id': 1, 'quantidade': '2'},
+        {'produto_id': 'abc', 'quantidade': 1},
+    ])
+    def test_item_invalido(self, catalogo, item):
+        with pytest.raises(ValueError):
+            montar_itens([item])
+    
+    def test_produto_indisponivel_ou_inexistente(self, catalogo):
+        with pytest.raises(ValueError, match='3, 99'):
+            montar_itens([{'produto_id': 99, 'quantidade': 1}, {'produto_id': 3, 'quantidade': 1}])
+
+
+class TestCriarPedidoPrecificado:
+    """POST /api/pedidos com itens só com produto_id e quantidade"""
+    
+    def test_cria_com_precos_do_catalogo(self, catalogo, api_client):
+        response = criar(api_client, [{'produto_id': 1, 'quantidade': 2, 'observacoes': 'Sem cebola'},
+                                      {'produto_id': 2, 'quantidade': 1}])
+        dados = response.get_json()
+        
+        assert response.status_code == 201
+        assert dados['total'] == 37.0
+        assert dados['itens'][0]['nome_produto'] == 'Hambúrguer'
+        assert dados['itens'][0]['observacoes'] == 'Sem cebola'
+    
+    def test_uma_consulta_ao_catalogo(self, catalogo, api_client, contador_consultas):
+        criar(api_client, [{'produto_id': produto_id, 'quantidade': 1} for produto_id in (1, 2, 1, 2)])
+        
+        consultas = [c for c in contador_consultas if 'FROM produtos' in c]
+        assert len(consultas) == 1
+        assert ' IN ' in consultas[0]
+    
+    def test_itens_completos_nao_consultam_catalogo(self, catalogo, api_client, contador_consultas):
+        criar(api_client, [{'produto_id': 1, 'nome_produto': 'Hambúrguer', 'categoria': 'Lanche',
+                            'quantidade': 1, 'preco_unitario': 15.50}])
+        assert not any('FROM produtos' in c for c in contador_consultas)
+    
+    def test_produto_desconhecido_nao_grava_pedido(self, catalogo, api_client):
+        response = criar(api_client, [{'produto_id': 1, 'quantidade': 1}, {'produto_id': 99, 'quantidade': 1}])
+        
+        assert response.status_code == 400
+        assert '99' in response.get_json()['erro']
+        assert ItemPedido.query.count() == 0
+    
+    def test_resposta_igual_ao_gravado(self, api_client):
+        response = criar(api_client, [{'produto_id': 9, 'nome_produto': 'Água', 'categoria': 'Bebida',
+                                       'quantidade': 3, 'preco_unitario': 10.005}])
+        dados = response.get_json()
+        
+        assert (dados['total'], dados['itens'][0]['preco_unitario']) == (30.03, 10.01)
+        assert api_client.get(f"/api/pedidos/{dados['id']}").get_json() == dados
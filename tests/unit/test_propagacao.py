@@ -0,0 +1,119 @@
+import threading
+import time
+import pytest
+
+from src.main import create_app
+from src.models.pedido import db
+from src.services.eventos import obter_barramento
+from src.services.propagacao import PropagadorEventos, iniciar_propagacao_eventos
+
+ITEM = {
+    'produto_id': 1,
+    'nome_produto': 'Hambúrguer',
+    'categoria': 'Lanche',
+    'quantidade': 1,
+    'preco_unitario': 15.50
+}
+
+
+@pytest.fixture
+def banco_uri(tmp_path):
+    return f"sqlite:///{tmp_path / 'pedidos.db'}"
+
+
+@pytest.fixture
+def outro_worker(banco_uri):
+    """Segunda aplicação no mesmo banco, com barramento próprio, como outro worker do gunicorn"""
+    outro = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': banco_uri, 'SQLALCHEMY_ENGINE_OPTIONS': {}})
+    yield outro.test_client()
+    with outro.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def propagador(api_app):
+    propagador = PropagadorEventos(api_app, intervalo=0.05)
+    propagador.verificar()
+    yield propagador
+    propagador.parar(timeout=5)
+
+
+def eventos_locais():
+    return [(evento.tipo, evento.dados) for evento in obter_barramento().eventos_desde(0)]
+
+
+class TestPropagadorEventos:
+    
+    def test_pedido_criado_em_outro_processo(self, propagador, outro_worker):
+        pedido = outro_worker.post('/api/pedidos', json={'itens': [ITEM]}).get_json()
+        
+        assert propagador.verificar() == 1
+        
+        [(tipo, dados)] = eventos_locais()
+        assert tipo == 'pedido_criado'
+        assert dados == pedido
+    
+    def test_status_alterado_em_outro_processo(self, propagador, outro_worker):
+        pedido_id = outro_worker.post('/api/pedidos', json={'itens': [ITEM]}).get_json()['id']
+        propagador.verificar()
+        
+        outro_worker.put(f'/api/pedidos/{pedido_id}/status', json={'status': 'Em preparação'})
+        
+        assert propagador.verificar() == 1
+        tipo, dados = eventos_locais()[-1]
+        assert tipo == 'status_alterado'
+        assert (dados['id'], dados['status']) == (pedido_id, 'Em preparação')
+    
+    def test_lote_de_outro_processo_vira_um_evento_por_pedido(self, propagador, outro_worker):
+        ids = [outro_worker.post('/api/pedidos', json={'itens': [ITEM]}).get_json()['id'] for _ in range(3)]
+        propagador.verificar()
+        
+        outro_worker.put('/api/pedidos/status', json={'ids': ids, 'status': 'Pronto'})
+        
+        assert propagador.verificar() == 3
+        alterados = [dados['id'] for tipo, dados in eventos_locais() if tipo == 'status_alterado']
+        assert sorted(alterados) == ids
+    
+    def test_gravacoes_locais_nao_sao_republicadas(self, propagador, api_client):
+        pedido_id = api_client.post('/api/pedidos', json={'itens': [ITEM]}).get_json()['id']
+        api_client.put(f'/api/pedidos/{pedido_id}/status', json={'status': 'Pronto'})
+        api_client.put('/api/pedidos/status', json={'ids': [pedido_id], 'status': 'Finalizado'})
+        eventos = len(eventos_locais())
+        
+        assert propagador.verificar() == 0
+        assert propagador.verificar() == 0
+        assert len(eventos_locais()) == eventos
+    
+    def test_alteracoes_anteriores_a_partida_nao_sao_republicadas(self, api_app, outro_worker):
+        outro_worker.post('/api/pedidos', json={'itens': [ITEM]})
+        propagador = PropagadorEventos(api_app)
+        
+        assert propagador.verificar() == 0
+        assert propagador.verificar() == 0
+        assert eventos_locais() == []
+    
+    def test_long_poll_acordado_por_alteracao_em_outro_processo(self, api_app, api_client, outro_worker):
+        pedido_id = outro_worker.post('/api/pedidos', json={'itens': [ITEM]}).get_json()['id']
+        api_app.config['EVENTOS_PROPAGACAO_SEGUNDOS'] = 0.05
+        propagador = iniciar_propagacao_eventos(api_app)
+        try:
+            with api_app.test_client() as cozinha:
+                def atualizar():
+                    time.sleep(0.2)
+                    outro_worker.put(f'/api/pedidos/{pedido_id}/status', json={'status': 'Pronto'})
+                
+                thread = threading.Thread(target=atualizar)
+                thread.start()
+                inicio = time.monotonic()
+                dados = cozinha.get(f'/api/pedidos/{pedido_id}/status?since=Recebido&wait=10').get_json()
+                decorrido = time.monotonic() - inicio
+                thread.join()
+        finally:
+            propagador.parar(timeout=5)
+        
+        assert dados['status'] == 'Pronto'
+        assert decorrido < 5
+    
+    def test_desligada_com_intervalo_zero(self, api_app):
+        api_app.config['EVENTOS_PROPAGACAO_SEGUNDOS'] = 0
+        assert iniciar_propagacao_eventos(api_app) is None
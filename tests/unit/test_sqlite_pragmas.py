@@ -0,0 +1,66 @@
+import threading
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import create_engine
+
+from src.models.pedido import Pedido, db
+from src.models.sqlite import PRAGMAS_PADRAO, aplicar_pragmas_sqlite, ler_pragmas
+
+
+@pytest.fixture
+def banco_uri(tmp_path):
+    return f"sqlite:///{tmp_path / 'pedidos.db'}"
+
+
+@pytest.fixture
+def engine(banco_uri):
+    engine = create_engine(banco_uri)
+    yield engine
+    engine.dispose()
+
+
+class TestPragmasSqlite:
+    
+    def test_aplicados_em_cada_conexao(self, engine):
+        assert aplicar_pragmas_sqlite(engine)
+        
+        valores = ler_pragmas(engine, PRAGMAS_PADRAO)
+        
+        assert valores['journal_mode'] == 'wal'
+        assert valores['synchronous'] == 1  # NORMAL
+        assert valores['busy_timeout'] == 5000
+        assert valores['cache_size'] == -20000
+        assert valores['temp_store'] == 2  # MEMORY
+    
+    def test_pragmas_personalizados(self, engine):
+        aplicar_pragmas_sqlite(engine, {'busy_timeout': 250})
+        assert ler_pragmas(engine, ['busy_timeout', 'journal_mode']) == {'busy_timeout': 250, 'journal_mode': 'delete'}
+    
+    def test_ignora_outros_bancos(self):
+        engine = SimpleNamespace(dialect=SimpleNamespace(name='postgresql'))
+        assert aplicar_pragmas_sqlite(engine) is False
+    
+    def test_leitura_nao_bloqueia_durante_escrita(self, api_app, banco_uri):
+        """Em WAL um leitor vê o último commit mesmo com outra conexão em transação exclusiva"""
+        engine = db.engine
+        aplicar_pragmas_sqlite(engine, dict(PRAGMAS_PADRAO, busy_timeout=100))
+        engine.dispose()
+        db.session.add(Pedido(total=10))
+        db.session.commit()
+        
+        with engine.connect() as escritor:
+            escritor.exec_driver_sql('BEGIN EXCLUSIVE')
+            escritor.exec_driver_sql('INSERT INTO pedidos (status, total, data_criacao, data_atualizacao) '
+                                     "VALUES ('RECEBIDO', 5, '2024-01-01', '2024-01-01')")
+            resultado = []
+            leitor = threading.Thread(target=lambda: resultado.append(ler_total(engine)))
+            leitor.start()
+            leitor.join(timeout=5)
+            escritor.exec_driver_sql('ROLLBACK')
+        
+        assert resultado == [1]
+
+
+def ler_total(engine):
+    with engine.connect() as conexao:
+        return conexao.exec_driver_sql('SELECT count(*) FROM pedidos').scalar()
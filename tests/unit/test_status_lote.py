@@ -0,0 +1,109 @@
+import threading
+import time
+import pytest
+
+from src.models.pedido import Pedido, StatusPedido, db
+from src.services.eventos import obter_barramento
+from src.services.fila import obter_fila
+
+ITEM = {
+    'produto_id': 1,
+    'nome_produto': 'Hambúrguer',
+    'categoria': 'Lanche',
+    'quantidade': 1,
+    'preco_unitario': 15.50
+}
+
+
+@pytest.fixture
+def pedido_ids(api_client):
+    return [api_client.post('/api/pedidos', json={'itens': [ITEM]}).get_json()['id'] for _ in range(3)]
+
+
+def atualizar(api_client, ids, status):
+    return api_client.put('/api/pedidos/status', json={'ids': ids, 'status': status})
+
+
+class TestStatusEmLote:
+    """PUT /api/pedidos/status"""
+    
+    def test_atualiza_e_informa_inexistentes(self, api_client, pedido_ids):
+        response = atualizar(api_client, pedido_ids[:2] + [999], 'Pronto')
+        dados = response.get_json()
+        
+        assert response.status_code == 200
+        assert dados['status'] == 'Pronto'
+        assert dados['atualizados'] == pedido_ids[:2]
+        assert dados['nao_encontrados'] == [999]
+        assert [db.session.get(Pedido, i).status for i in pedido_ids] == [
+            StatusPedido.PRONTO, StatusPedido.PRONTO, StatusPedido.RECEBIDO
+        ]
+    
+    def test_um_unico_update(self, api_client, pedido_ids, contador_consultas):
+        atualizar(api_client, pedido_ids, 'Finalizado')
+        
+        updates = [c for c in contador_consultas if c.startswith('UPDATE pedidos ')]
+        assert len(updates) == 1
+        assert ' IN ' in updates[0]
+        assert not any(c.startswith('SELECT') for c in contador_consultas)
+    
+    @pytest.mark.parametrize('corpo', [
+        {'ids': [1]},
+        {'status': 'Pronto'},
+        {'ids': [], 'status': 'Pronto'},
+        {'ids': ['1'], 'status': 'Pronto'},
+        {'ids': [1], 'status': 'Voando'},
+    ])
+    def test_corpo_invalido(self, api_client, corpo):
+        assert api_client.put('/api/pedidos/status', json=corpo).status_code == 400
+    
+    def test_limite_por_requisicao(self, api_app, api_client):
+        api_app.config['PEDIDOS_STATUS_LOTE_LIMITE'] = 2
+        assert atualizar(api_client, [1, 2, 3], 'Pronto').status_code == 400
+    
+    def test_atualiza_fila_sem_recarregar(self, api_client, pedido_ids, contador_consultas):
+        obter_fila()
+        atualizar(api_client, pedido_ids[:2], 'Finalizado')
+        atualizar(api_client, pedido_ids[2:], 'Pronto')
+        contador_consultas.clear()
+        
+        fila = obter_fila().listar()
+        
+        assert [(p['id'], p['status']) for p in fila] == [(pedido_ids[2], 'Pronto')]
+        assert contador_consultas == []
+    
+    def test_pedido_que_volta_para_producao_recarrega_fila(self, api_client, pedido_ids):
+        obter_fila()
+        atualizar(api_client, pedido_ids, 'Finalizado')
+        assert obter_fila().listar() == []
+        
+        atualizar(api_client, pedido_ids[:1], 'Recebido')
+        
+        assert [p['id'] for p in obter_fila().listar()] == pedido_ids[:1]
+    
+    def test_um_evento_para_o_lote(self, api_client, pedido_ids):
+        barramento = obter_barramento()
+        inicio = barramento.ultima_sequencia
+        
+        atualizar(api_client, pedido_ids, 'Pronto')
+        
+        eventos = barramento.eventos_desde(inicio)
+        assert len(eventos) == 1
+        assert eventos[0].tipo == 'status_alterado_lote'
+        assert eventos[0].dados['ids'] == pedido_ids
+    
+    def test_acorda_long_poll(self, api_app, api_client, pedido_ids):
+        def executar():
+            time.sleep(0.1)
+            with api_app.test_client() as outro_cliente:
+                atualizar(outro_cliente, pedido_ids, 'Pronto')
+        thread = threading.Thread(target=executar)
+        thread.start()
+        
+        inicio = time.monotonic()
+        dados = api_client.get(f'/api/pedidos/{pedido_ids[1]}/status?since=Recebido&wait=10').get_json()
+        thread.join()
+        
+        assert time.monotonic() - inicio < 5
+        assert dados['status'] == 'Pronto'
+        assert dados['alterado'] is True
@@ -0,0 +1,159 @@
+import json
+import threading
+import pytest
+
+from src.services.eventos import BarramentoEventos, fluxo_sse, obter_limite_conexoes
+
+ITEM = {
+    'produto_id': 1,
+    'nome_produto': 'Hambúrguer',
+    'categoria': 'Lanche',
+    'quantidade': 1,
+    'preco_unitario': 15.50
+}
+
+
+def abrir_stream(api_client, **headers):
+    """Abre o stream SSE e devolve a resposta e o iterador de mensagens (já sem o preâmbulo retry)"""
+    response = api_client.get('/api/pedidos/stream', headers=headers, buffered=False)
+    mensagens = iter(response.response)
+    assert next(mensagens).startswith(b'retry:')
+    return response, mensagens
+
+
+def campos(mensagem):
+    """Interpreta uma mensagem SSE em dicionário de campos"""
+    resultado = {}
+    for linha in mensagem.decode('utf-8').strip().split('\n'):
+        chave, _, valor = linha.partition(': ')
+        resultado[chave] = valor
+    return resultado
+
+
+class TestBarramentoEventos:
+    """Testes do buffer de eventos compartilhado"""
+    
+    def test_eventos_desde_sequencia(self):
+        barramento = BarramentoEventos()
+        for i in range(3):
+            barramento.publicar('teste', {'i': i}, f'{{"i": {i}}}')
+        
+        assert [e.dados['i'] for e in barramento.eventos_desde(1)] == [1, 2]
+        assert barramento.eventos_desde(3) == []
+    
+    def test_lacuna_quando_buffer_excedido(self):
+        barramento = BarramentoEventos(capacidade=2)
+        for i in range(5):
+            barramento.publicar('teste', {}, '{}')
+        
+        assert barramento.eventos_desde(1) is None
+        assert len(barramento.eventos_desde(3)) == 2
+    
+    def test_id_de_outra_execucao_e_desconhecido(self):
+        barramento = BarramentoEventos()
+        barramento.publicar('teste', {}, '{}')
+        
+        assert barramento.sequencia_do_id(barramento.id_evento(1)) == 1
+        assert barramento.sequencia_do_id('abc-1') is None
+        assert barramento.sequencia_do_id(barramento.id_evento(99)) is None
+    
+    def test_um_escritor_para_centenas_de_assinantes(self):
+        barramento = BarramentoEventos()
+        recebidos = []
+        prontos = threading.Barrier(201)
+        
+        def assinante():
+            fluxo = fluxo_sse(barramento, None, heartbeat=5)
+            next(fluxo)
+            prontos.wait()
+            recebidos.append(next(fluxo))
+        
+        threads = [threading.Thread(target=assinante) for _ in range(200)]
+        for thread in threads:
+            thread.start()
+        prontos.wait()
+        evento = barramento.publicar('pedido_criado', {'id': 1}, '{"id": 1}')
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        assert len(recebidos) == 200
+        assert all(mensagem is evento.mensagem for mensagem in recebidos)
+    
+    def test_encerrar_libera_assinantes(self):
+        barramento = BarramentoEventos()
+        fluxo = fluxo_sse(barramento, None, heartbeat=5)
+        next(fluxo)
+        barramento.encerrar()
+        assert list(fluxo) == []
+
+
+class TestRotaStream:
+    """GET /api/pedidos/stream"""
+    
+    def test_cabecalhos(self, api_client):
+        response, _ = abrir_stream(api_client)
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['Cache-Control'] == 'no-cache'
+        response.close()
+    
+    def test_recebe_criacao_e_mudanca_de_status_sem_consultar_o_banco(self, api_client, contador_consultas):
+        response, mensagens = abrir_stream(api_client)
+        
+        pedido = api_client.post('/api/pedidos', json={'itens': [ITEM]}).get_json()
+        api_client.put(f"/api/pedidos/{pedido['id']}/status", json={'status': 'Pronto'})
+        
+        contador_consultas.clear()
+        criado = campos(next(mensagens))
+        alterado = campos(next(mensagens))
+        response.close()
+        
+        assert contador_consultas == []
+        assert criado['event'] == 'pedido_criado'
+        assert alterado['event'] == 'status_alterado'
+        assert json.loads(alterado['data'])['status'] == 'Pronto'
+    
+    def test_retoma_a_partir_do_last_event_id(self, api_client):
+        response, mensagens = abrir_stream(api_client)
+        for _ in range(3):
+            api_client.post('/api/pedidos', json={'itens': [ITEM]})
+        primeiro = campos(next(mensagens))
+        response.close()
+        
+        response, mensagens = abrir_stream(api_client, **{'Last-Event-ID': primeiro['id']})
+        seguintes = [campos(next(mensagens)) for _ in range(2)]
+        response.close()
+        
+        assert [m['event'] for m in seguintes] == ['pedido_criado', 'pedido_criado']
+        assert [json.loads(m['data'])['id'] for m in seguintes] == [2, 3]
+    
+    def test_last_event_id_desconhecido_gera_reset(self, api_client):
+        response, mensagens = abrir_stream(api_client, **{'Last-Event-ID': 'outra-execucao-7'})
+        assert campos(next(mensagens))['event'] == 'reset'
+        response.close()
+    
+    def test_heartbeat(self, api_app, api_client):
+        api_app.config['SSE_HEARTBEAT_SEGUNDOS'] = 0.01
+        response, mensagens = abrir_stream(api_client)
+        assert next(mensagens) == b': heartbeat\n\n'
+        response.close()
+    
+    def test_acima_do_limite_responde_503(self, api_app, api_client):
+        api_app.config['CONEXOES_LONGAS_MAXIMO'] = 2
+        abertos = [abrir_stream(api_client)[0] for _ in range(2)]
+        
+        response = api_client.get('/api/pedidos/stream')
+        
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '5'
+        assert 'erro' in response.get_json()
+        for aberto in abertos:
+            aberto.close()
+    
+    def test_stream_fechado_libera_a_vaga(self, api_app, api_client):
+        api_app.config['CONEXOES_LONGAS_MAXIMO'] = 1
+        response, _ = abrir_stream(api_client)
+        response.close()
+        
+        response, _ = abrir_stream(api_client)
+        response.close()
+        assert obter_limite_conexoes().abertas == 0
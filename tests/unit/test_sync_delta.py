@@ -0,0 +1,92 @@
+import pytest
+from decimal import Decimal
+
+from src.models.pedido import Produto, db
+from src.services.sincronizacao import aplicar_delta, normalizar_produto
+
+CATALOGO = [
+    {'id': 1, 'nome': 'Hambúrguer', 'categoria': 'Lanche', 'preco': 15.50, 'descricao': 'Clássico'},
+    {'id': 2, 'nome': 'Batata Frita', 'categoria': 'Acompanhamento', 'preco': 8.00},
+    {'id': 3, 'nome': 'Suco', 'categoria': 'Bebida', 'preco': 6.00},
+]
+
+
+def sincronizar_delta(api_client, produtos):
+    return api_client.post('/api/produtos/sync?modo=delta', json={'produtos': produtos})
+
+
+class TestNormalizarProduto:
+    
+    def test_tipos(self):
+        produto = normalizar_produto({'id': '7', 'nome': 'Água', 'categoria': 'Bebida', 'preco': 3.1})
+        assert produto == {'id': 7, 'nome': 'Água', 'categoria': 'Bebida', 'preco': Decimal('3.10'),
+                           'descricao': None, 'disponivel': True}
+    
+    @pytest.mark.parametrize('dados', [{'id': 1}, {'id': 1, 'nome': 'X', 'categoria': 'Y', 'preco': 'abc'}])
+    def test_invalido(self, dados):
+        with pytest.raises(ValueError):
+            normalizar_produto(dados)
+
+
+class TestSyncDelta:
+    """POST /api/produtos/sync?modo=delta"""
+    
+    def test_carga_inicial_insere_tudo(self, api_client):
+        dados = sincronizar_delta(api_client, CATALOGO).get_json()
+        
+        assert (dados['inseridos'], dados['atualizados'], dados['inalterados'], dados['removidos']) == (3, 0, 0, 0)
+        assert Produto.query.count() == 3
+    
+    def test_contagens_e_apenas_linhas_alteradas(self, api_client, contador_consultas):
+        sincronizar_delta(api_client, CATALOGO)
+        
+        nova_carga = [dict(CATALOGO[0], preco=16.90), CATALOGO[1],
+                      {'id': 4, 'nome': 'Sorvete', 'categoria': 'Sobremesa', 'preco': 9.00}]
+        contador_consultas.clear()
+        dados = sincronizar_delta(api_client, nova_carga).get_json()
+        
+        assert (dados['inseridos'], dados['atualizados'], dados['inalterados'], dados['removidos']) == (1, 1, 1, 1)
+        assert db.session.get(Produto, 1).preco == Decimal('16.90')
+        assert db.session.get(Produto, 3) is None
+        assert db.session.get(Produto, 4).nome == 'Sorvete'
+        
+        escritas = [c for c in contador_consultas if c.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))]
+        upserts = [c for c in escritas if 'INSERT INTO produtos' in c]
+        assert len(upserts) == 1 and 'ON CONFLICT' in upserts[0]
+        remocoes = [c for c in escritas if c.lstrip().startswith('DELETE FROM produtos')]
+        assert len(remocoes) == 1 and ' IN ' in remocoes[0]
+    
+    def test_carga_identica_nao_escreve_nem_muda_versao(self, api_client, contador_consultas):
+        versao = sincronizar_delta(api_client, CATALOGO).get_json()['versao']
+        etag = api_client.get('/api/produtos').headers['ETag']
+        
+        contador_consultas.clear()
+        dados = sincronizar_delta(api_client, CATALOGO).get_json()
+        
+        assert dados['resultado'] == 'not_modified'
+        assert dados['versao'] == versao
+        assert not any(c.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')) for c in contador_consultas)
+        assert api_client.get('/api/produtos', headers={'If-None-Match': etag}).status_code == 304
+    
+    def test_alteracao_invalida_o_cache(self, api_client):
+        sincronizar_delta(api_client, CATALOGO)
+        api_client.get('/api/produtos')
+        
+        sincronizar_delta(api_client, [dict(CATALOGO[0], disponivel=False)] + CATALOGO[1:])
+        
+        assert api_client.get('/api/produtos').get_json()['total'] == 2
+    
+    def test_modo_no_corpo(self, api_client):
+        dados = api_client.post('/api/produtos/sync', json={'modo': 'delta', 'produtos': CATALOGO}).get_json()
+        assert dados['modo'] == 'delta'
+    
+    def test_produto_invalido(self, api_client):
+        assert sincronizar_delta(api_client, [{'id': 1, 'nome': 'Sem preço'}]).status_code == 400
+    
+    def test_sem_remover_ausentes(self, api_app):
+        aplicar_delta([normalizar_produto(p) for p in CATALOGO])
+        contagens = aplicar_delta([normalizar_produto(CATALOGO[0])], remover_ausentes=False)
+        db.session.commit()
+        
+        assert contagens['removidos'] == 0
+        assert Produto.query.count() == 3
@@ -0,0 +1,111 @@
+import json
+from decimal import Decimal
+from sqlalchemy import inspect, text
+
+from src.models.pedido import CatalogoMeta, Produto, ProdutoStaging, db
+from src.models.migracoes import aplicar_migracoes
+from src.services.catalogo import ler_meta_catalogo
+from src.services.sincronizacao import HashCatalogo, hash_catalogo, normalizar_produto
+
+CATALOGO = [
+    {'id': 1, 'nome': 'Hambúrguer', 'categoria': 'Lanche', 'preco': 15.50, 'descricao': 'Clássico'},
+    {'id': 2, 'nome': 'Batata Frita', 'categoria': 'Acompanhamento', 'preco': 8.00},
+    {'id': 3, 'nome': 'Suco', 'categoria': 'Bebida', 'preco': 6.00},
+]
+
+ESCRITAS = ('INSERT', 'UPDATE', 'DELETE')
+
+
+def normalizados(produtos):
+    return [normalizar_produto(produto) for produto in produtos]
+
+
+def escritas(consultas):
+    return [c for c in consultas if c.lstrip().upper().startswith(ESCRITAS)]
+
+
+class TestHashCatalogo:
+    
+    def test_independente_da_ordem(self):
+        assert hash_catalogo(normalizados(CATALOGO)) == hash_catalogo(normalizados(CATALOGO[::-1]))
+    
+    def test_muda_com_qualquer_campo(self):
+        original = hash_catalogo(normalizados(CATALOGO))
+        assert hash_catalogo(normalizados([dict(CATALOGO[0], preco=15.51)] + CATALOGO[1:])) != original
+        assert hash_catalogo(normalizados([dict(CATALOGO[0], disponivel=False)] + CATALOGO[1:])) != original
+        assert hash_catalogo(normalizados(CATALOGO[:2])) != original
+    
+    def test_mesma_representacao_do_preco(self):
+        assert hash_catalogo(normalizados([dict(CATALOGO[0], preco='15.5')])) == \
+            hash_catalogo(normalizados([dict(CATALOGO[0], preco=Decimal('15.50'))]))
+    
+    def test_incremental_igual_ao_completo(self):
+        acumulador = HashCatalogo()
+        for produto in normalizados(CATALOGO):
+            acumulador.adicionar(produto)
+        assert acumulador.hexdigest() == hash_catalogo(normalizados(CATALOGO))
+        assert len(acumulador.hexdigest()) == 64
+
+
+class TestSyncHash:
+    """POST /api/produtos/sync com carga idêntica à última gravada"""
+    
+    def test_carga_repetida_nao_escreve(self, api_client, contador_consultas):
+        versao = api_client.post('/api/produtos/sync', json={'produtos': CATALOGO}).get_json()['versao']
+        etag = api_client.get('/api/produtos').headers['ETag']
+        
+        contador_consultas.clear()
+        response = api_client.post('/api/produtos/sync', json={'produtos': CATALOGO[::-1]})
+        dados = response.get_json()
+        
+        assert response.status_code == 200
+        assert dados['resultado'] == 'not_modified'
+        assert dados['versao'] == versao
+        assert escritas(contador_consultas) == []
+        assert api_client.get('/api/produtos', headers={'If-None-Match': etag}).status_code == 304
+    
+    def test_carga_diferente_grava_e_guarda_hash(self, api_client):
+        api_client.post('/api/produtos/sync', json={'produtos': CATALOGO})
+        alterado = [dict(CATALOGO[0], preco=16)] + CATALOGO[1:]
+        
+        dados = api_client.post('/api/produtos/sync', json={'produtos': alterado}).get_json()
+        
+        assert 'resultado' not in dados
+        assert db.session.get(Produto, 1).preco == Decimal('16.00')
+        assert ler_meta_catalogo() == (dados['versao'], hash_catalogo(normalizados(alterado)))
+    
+    def test_delta_sem_hash_gravado_registra_hash(self, api_client):
+        api_client.post('/api/produtos/sync', json={'produtos': CATALOGO})
+        db.session.get(CatalogoMeta, 1).hash_conteudo = None
+        db.session.commit()
+        
+        dados = api_client.post('/api/produtos/sync?modo=delta', json={'produtos': CATALOGO}).get_json()
+        
+        assert dados['inalterados'] == 3
+        assert ler_meta_catalogo()[1] == hash_catalogo(normalizados(CATALOGO))
+        repetida = api_client.post('/api/produtos/sync?modo=delta', json={'produtos': CATALOGO}).get_json()
+        assert repetida['resultado'] == 'not_modified'
+    
+    def test_ndjson_repetido_descarta_lote(self, api_client):
+        corpo = ''.join(json.dumps(produto) + '\n' for produto in CATALOGO).encode('utf-8')
+        versao = api_client.post('/api/produtos/sync', json={'produtos': CATALOGO}).get_json()['versao']
+        
+        response = api_client.post('/api/produtos/sync', data=corpo, content_type='application/x-ndjson')
+        dados = response.get_json()
+        
+        assert dados['resultado'] == 'not_modified'
+        assert dados['versao'] == versao
+        assert dados['total'] == 3
+        assert ProdutoStaging.query.count() == 0
+
+
+class TestMigracaoColunas:
+    
+    def test_adiciona_coluna_anulavel_ausente(self, api_app):
+        db.session.execute(text('ALTER TABLE catalogo_meta DROP COLUMN hash_conteudo'))
+        db.session.commit()
+        
+        assert 'catalogo_meta.hash_conteudo' in aplicar_migracoes()
+        colunas = {coluna['name'] for coluna in inspect(db.engine).get_columns('catalogo_meta')}
+        assert 'hash_conteudo' in colunas
+        assert aplicar_migracoes() == []
@@ -0,0 +1,70 @@
+import io
+import json
+import pytest
+
+from src.models.pedido import Produto, ProdutoStaging, db
+from src.services.sincronizacao import ler_ndjson
+
+
+def ndjson(produtos):
+    return ''.join(json.dumps(produto) + '\n' for produto in produtos).encode('utf-8')
+
+
+def produtos(quantidade, prefixo='Produto'):
+    return [{'id': i, 'nome': f'{prefixo} {i}', 'categoria': 'Lanche', 'preco': 10 + i} for i in range(1, quantidade + 1)]
+
+
+def sincronizar(api_client, corpo):
+    return api_client.post('/api/produtos/sync', data=corpo, content_type='application/x-ndjson')
+
+
+class TestLerNdjson:
+    
+    def test_ignora_linhas_vazias(self):
+        corpo = io.BytesIO(b'\n' + ndjson(produtos(2)) + b'\n\n')
+        assert [p['id'] for p in ler_ndjson(corpo)] == [1, 2]
+    
+    def test_erro_indica_a_linha(self):
+        corpo = io.BytesIO(ndjson(produtos(2)) + b'{"id": 3\n')
+        with pytest.raises(ValueError, match='Linha 3'):
+            list(ler_ndjson(corpo))
+
+
+class TestSyncNdjson:
+    """POST /api/produtos/sync com Content-Type application/x-ndjson"""
+    
+    def test_carga_completa(self, api_client):
+        sincronizar(api_client, ndjson(produtos(3, 'Antigo')))
+        response = sincronizar(api_client, ndjson(produtos(7)))
+        dados = response.get_json()
+        
+        assert response.status_code == 200
+        assert dados['total'] == 7
+        assert Produto.query.count() == 7
+        assert ProdutoStaging.query.count() == 0
+        assert api_client.get('/api/produtos').get_json()['total'] == 7
+    
+    def test_grava_em_lotes_limitados(self, api_app, api_client, contador_consultas):
+        api_app.config['SYNC_TAMANHO_LOTE_NDJSON'] = 2
+        
+        sincronizar(api_client, ndjson(produtos(5)))
+        
+        insercoes = [c for c in contador_consultas if c.startswith('INSERT INTO produtos_staging')]
+        assert len(insercoes) == 3
+    
+    def test_linha_invalida_preserva_catalogo_e_descarta_lote(self, api_app, api_client):
+        api_app.config['SYNC_TAMANHO_LOTE_NDJSON'] = 2
+        sincronizar(api_client, ndjson(produtos(3, 'Antigo')))
+        
+        corpo = ndjson(produtos(4)) + b'nao e json\n'
+        response = sincronizar(api_client, corpo)
+        
+        assert response.status_code == 400
+        assert 'Linha 5' in response.get_json()['erro']
+        assert sorted(p.nome for p in Produto.query.all()) == ['Antigo 1', 'Antigo 2', 'Antigo 3']
+        assert ProdutoStaging.query.count() == 0
+    
+    def test_json_continua_funcionando(self, api_client):
+        response = api_client.post('/api/produtos/sync', json={'produtos': produtos(2)})
+        assert response.status_code == 200
+        assert Produto.query.count() == 2
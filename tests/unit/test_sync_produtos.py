@@ -0,0 +1,219 @@
+import time
+import pytest
+from datetime import datetime
+from decimal import Decimal
+
+from src.models.pedido import Produto, db
+from src.services.catalogo import ler_versao_catalogo
+from src.services.sync_produtos import (
+    ClienteSyncProdutos, ErroSincronizacao, SessaoHTTP, TravaExclusiva, iniciar_sync_produtos
+)
+from tests.fixtures.servidor_produtos import ServidorProdutos
+
+
+def produto(id, preco, data_atualizacao, **extras):
+    return {'id': id, 'nome': f'Produto {id}', 'categoria': 'Lanche', 'preco': preco,
+            'data_atualizacao': data_atualizacao, **extras}
+
+
+@pytest.fixture
+def servidor():
+    with ServidorProdutos() as servidor:
+        yield servidor
+
+
+@pytest.fixture
+def cliente(api_app, servidor):
+    cliente = ClienteSyncProdutos(api_app, servidor.url, intervalo=30, backoff_inicial=1, backoff_maximo=8)
+    yield cliente
+    cliente.sessao.fechar()
+
+
+class TestSessaoHTTP:
+    
+    def test_reutiliza_conexao(self, servidor):
+        sessao = SessaoHTTP(servidor.url)
+        for _ in range(5):
+            assert sessao.get_json()[0] == 200
+        sessao.fechar()
+        
+        assert sessao.conexoes_abertas == 1
+        assert servidor.conexoes == 1
+    
+    def test_esquema_invalido(self):
+        with pytest.raises(ValueError):
+            SessaoHTTP('ftp://produtos')
+
+
+class TestClienteSyncProdutos:
+    
+    def test_carga_inicial_sem_since(self, cliente, servidor):
+        servidor.produtos = [produto(1, 10, '2025-01-01T10:00:00'), produto(2, 12, '2025-01-01T11:00:00')]
+        
+        resultado = cliente.sincronizar()
+        
+        assert servidor.consultas == [None]
+        assert resultado['inseridos'] == 2
+        assert resultado['versao'] == ler_versao_catalogo() == 1
+        assert db.session.get(Produto, 2).data_atualizacao == datetime(2025, 1, 1, 11)
+    
+    def test_incremental_usa_maior_data_atualizacao(self, cliente, servidor):
+        servidor.produtos = [produto(1, 10, '2025-01-01T10:00:00'), produto(2, 12, '2025-01-01T11:00:00')]
+        cliente.sincronizar()
+        
+        servidor.produtos[0] = produto(1, 11, '2025-01-01T12:00:00')
+        resultado = cliente.sincronizar()
+        
+        assert servidor.consultas[-1] == '2025-01-01T11:00:00'
+        assert (resultado['inseridos'], resultado['atualizados']) == (0, 1)
+        assert db.session.get(Produto, 1).preco == Decimal('11.00')
+        assert Produto.query.count() == 2
+    
+    def test_sem_mudancas_preserva_versao(self, cliente, servidor):
+        servidor.produtos = [produto(1, 10, '2025-01-01T10:00:00')]
+        cliente.sincronizar()
+        
+        resultado = cliente.sincronizar()
+        
+        assert resultado['versao'] is None
+        assert ler_versao_catalogo() == 1
+    
+    def test_data_mais_nova_sem_mudanca_avanca_marca_dagua(self, cliente, servidor):
+        servidor.produtos = [produto(1, 10, '2025-01-01T10:00:00')]
+        cliente.sincronizar()
+        
+        # Produto "tocado" no serviço de produtos: mesma ficha, data nova
+        servidor.produtos = [produto(1, 10, '2025-01-01T15:00:00')]
+        resultado = cliente.sincronizar()
+        cliente.sincronizar()
+        
+        assert resultado['inalterados'] == 1
+        assert resultado['versao'] is None
+        assert ler_versao_catalogo() == 1
+        assert db.session.get(Produto, 1).data_atualizacao == datetime(2025, 1, 1, 15)
+        assert servidor.consultas[-1] == '2025-01-01T15:00:00'
+    
+    def test_envio_completo_nao_avanca_a_marca_dagua(self, api_client, cliente, servidor):
+        servidor.produtos = [produto(1, 10, '2025-01-01T10:00:00')]
+        cliente.sincronizar()
+        
+        # Carga enviada com uma foto do serviço; ela grava o relógio local nos produtos
+        api_client.post('/api/produtos/sync', json={'produtos': [
+            {'id': 1, 'nome': 'Produto 1', 'categoria': 'Lanche', 'preco': 10},
+        ]})
+        # Mudança feita no serviço depois da foto e antes da aplicação da carga
+        servidor.produtos.append(produto(2, 7, '2025-01-01T11:00:00'))
+        resultado = cliente.sincronizar()
+        
+        assert servidor.consultas[-1] == '2025-01-01T10:00:00'
+        assert resultado['inseridos'] == 1
+        assert db.session.get(Produto, 2).preco == Decimal('7.00')
+    
+    def test_sem_marca_dagua_carrega_tudo(self, api_client, cliente, servidor):
+        # Catálogo só recebido por envio: a primeira consulta puxada vem sem since
+        api_client.post('/api/produtos/sync', json={'produtos': [
+            {'id': 1, 'nome': 'Produto 1', 'categoria': 'Lanche', 'preco': 10},
+        ]})
+        servidor.produtos = [produto(1, 10, '2025-01-01T10:00:00'), produto(2, 7, '2025-01-01T11:00:00')]
+        
+        cliente.sincronizar()
+        cliente.sincronizar()
+        
+        assert servidor.consultas == [None, '2025-01-01T11:00:00']
+        assert Produto.query.count() == 2
+    
+    def test_data_com_fuso_convertida_para_utc(self, cliente, servidor):
+        servidor.produtos = [produto(1, 10, '2025-01-01T10:00:00-03:00')]
+        cliente.sincronizar()
+        assert db.session.get(Produto, 1).data_atualizacao == datetime(2025, 1, 1, 13)
+    
+    def test_erro_http(self, cliente, servidor):
+        servidor.falhas_pendentes = 1
+        with pytest.raises(ErroSincronizacao):
+            cliente.sincronizar()
+    
+    def test_produto_invalido(self, cliente, servidor):
+        servidor.produtos = [{'id': 1, 'data_atualizacao': '2025-01-01T10:00:00'}]
+        with pytest.raises(ErroSincronizacao):
+            cliente.sincronizar()
+        assert Produto.query.count() == 0
+
+
+class TestBackoff:
+    
+    def test_espera_dobra_ate_o_teto(self, cliente):
+        esperas = []
+        for falhas in range(6):
+            cliente.falhas = falhas
+            esperas.append(cliente.proxima_espera())
+        assert esperas == [30, 1, 2, 4, 8, 8]
+    
+    def test_laco_recua_e_se_recupera(self, api_app, servidor):
+        servidor.falhas_pendentes = 2
+        servidor.produtos = [produto(1, 10, '2025-01-01T10:00:00')]
+        cliente = ClienteSyncProdutos(api_app, servidor.url, intervalo=0.01, backoff_inicial=0.01)
+        esperas = []
+        
+        def proxima_espera():
+            esperas.append(cliente.falhas)
+            if len(esperas) == 3:
+                cliente._parar.set()
+            return 0
+        
+        cliente.proxima_espera = proxima_espera
+        cliente.executar()
+        
+        assert esperas == [1, 2, 0]
+        assert Produto.query.count() == 1
+
+
+class TestTravaExclusiva:
+    
+    def test_um_dono_por_vez(self, tmp_path):
+        caminho = str(tmp_path / 'sync.lock')
+        primeira, segunda = TravaExclusiva(caminho), TravaExclusiva(caminho)
+        
+        assert primeira.tentar()
+        assert not segunda.tentar()
+        
+        primeira.liberar()
+        assert segunda.tentar()
+        segunda.liberar()
+    
+    def test_so_o_dono_da_trava_consulta(self, api_app, servidor, tmp_path):
+        caminho = str(tmp_path / 'sync.lock')
+        outro_worker = TravaExclusiva(caminho)
+        assert outro_worker.tentar()
+        cliente = ClienteSyncProdutos(api_app, servidor.url, intervalo=0.02, trava=TravaExclusiva(caminho))
+        
+        cliente.iniciar()
+        try:
+            time.sleep(0.2)
+            assert servidor.consultas == []
+            
+            # O dono terminou: este processo assume a sincronização
+            outro_worker.liberar()
+            limite = time.monotonic() + 5
+            while not servidor.consultas and time.monotonic() < limite:
+                time.sleep(0.02)
+            assert servidor.consultas
+            assert cliente.trava.obtida
+        finally:
+            cliente.parar(timeout=5)
+        assert not cliente.trava.obtida
+
+
+class TestIniciarSyncProdutos:
+    
+    def test_desligado_sem_url(self, api_app):
+        assert iniciar_sync_produtos(api_app) is None
+    
+    def test_inicia_thread_uma_vez(self, api_app, servidor, tmp_path):
+        api_app.config['PRODUTOS_SYNC_URL'] = servidor.url
+        api_app.config['PRODUTOS_SYNC_TRAVA'] = str(tmp_path / 'sync.lock')
+        cliente = iniciar_sync_produtos(api_app)
+        try:
+            assert iniciar_sync_produtos(api_app) is cliente
+        finally:
+            cliente.parar(timeout=5)
+        assert not cliente._thread.is_alive()
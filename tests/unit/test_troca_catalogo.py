@@ -0,0 +1,94 @@
+import pytest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from src.models.pedido import Produto, ProdutoStaging, db
+from src.services.sincronizacao import descartar_lote, gravar_lote, normalizar_produto, novo_lote, trocar_catalogo
+
+ANTIGO = [{'id': i, 'nome': f'Antigo {i}', 'categoria': 'Lanche', 'preco': 10} for i in range(1, 4)]
+NOVO = [{'id': i, 'nome': f'Novo {i}', 'categoria': 'Bebida', 'preco': 5} for i in range(10, 15)]
+
+
+@pytest.fixture
+def banco_uri(tmp_path):
+    # Banco em arquivo: cada conexão tem sua própria visão transacional
+    return f"sqlite:///{tmp_path / 'catalogo.db'}"
+
+
+@pytest.fixture
+def leitor(banco_uri):
+    """Conexão independente, como a de outro worker"""
+    engine = create_engine(banco_uri)
+    
+    def ler_nomes():
+        with engine.connect() as conn:
+            return [linha[0] for linha in conn.execute(text('SELECT nome FROM produtos ORDER BY id'))]
+    
+    yield ler_nomes
+    engine.dispose()
+
+
+class TestTrocaAtomicaDoCatalogo:
+    """A carga completa é montada na tabela de sombra e trocada de uma vez"""
+    
+    def test_leitores_veem_o_catalogo_anterior_ate_o_commit(self, api_client, leitor):
+        api_client.post('/api/produtos/sync', json={'produtos': ANTIGO})
+        
+        lote = novo_lote()
+        gravar_lote(lote, [normalizar_produto(p) for p in NOVO])
+        db.session.commit()
+        # Lote montado (e até já confirmado na sombra): catálogo ativo intacto
+        assert leitor() == ['Antigo 1', 'Antigo 2', 'Antigo 3']
+        
+        assert trocar_catalogo(lote) == 5
+        db.session.flush()
+        # Troca feita mas não confirmada: outra conexão ainda vê o catálogo completo anterior
+        assert leitor() == ['Antigo 1', 'Antigo 2', 'Antigo 3']
+        
+        db.session.commit()
+        assert leitor() == [f'Novo {i}' for i in range(10, 15)]
+        assert ProdutoStaging.query.count() == 0
+    
+    def test_sync_completo_pela_rota(self, api_client, leitor):
+        api_client.post('/api/produtos/sync', json={'produtos': ANTIGO})
+        response = api_client.post('/api/produtos/sync', json={'produtos': NOVO})
+        
+        assert response.status_code == 200
+        assert leitor() == [f'Novo {i}' for i in range(10, 15)]
+        assert api_client.get('/api/produtos').get_json()['total'] == 5
+    
+    def test_leitor_em_andamento_termina_com_a_versao_anterior(self, api_client):
+        api_client.post('/api/produtos/sync', json={'produtos': ANTIGO})
+        corpo_anterior = api_client.get('/api/produtos').data
+        
+        api_client.post('/api/produtos/sync', json={'produtos': NOVO})
+        
+        # Os bytes já entregues a um leitor não são alterados pela nova geração
+        assert b'Antigo 1' in corpo_anterior
+        assert b'Novo 10' in api_client.get('/api/produtos').data
+    
+    def test_falha_antes_da_troca_preserva_o_catalogo(self, api_client, leitor):
+        api_client.post('/api/produtos/sync', json={'produtos': ANTIGO})
+        
+        response = api_client.post('/api/produtos/sync', json={'produtos': NOVO + [{'id': 99, 'nome': 'Sem preço'}]})
+        
+        assert response.status_code == 400
+        assert leitor() == ['Antigo 1', 'Antigo 2', 'Antigo 3']
+    
+    def test_lotes_abandonados_sao_descartados(self, api_app):
+        antigo = novo_lote()
+        gravar_lote(antigo, [normalizar_produto(NOVO[0])], agora=datetime.utcnow() - timedelta(hours=2))
+        db.session.commit()
+        
+        novo_lote()
+        db.session.commit()
+        
+        assert ProdutoStaging.query.filter_by(lote=antigo).count() == 0
+    
+    def test_descartar_lote(self, api_app):
+        lote = novo_lote()
+        gravar_lote(lote, [normalizar_produto(p) for p in NOVO])
+        descartar_lote(lote)
+        db.session.commit()
+        assert ProdutoStaging.query.count() == 0
@@ -0,0 +1,181 @@
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.services.eventos import obter_barramento
+from src.services.sync_produtos import EXTENSAO as EXTENSAO_SYNC
+from src.wsgi import encerrar_worker, iniciar_worker
+from tests.fixtures.servidor_produtos import ServidorProdutos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PEDIDO = {
+    'cliente_id': '12345678901',
+    'itens': [{'produto_id': 1, 'nome_produto': 'Hambúrguer', 'categoria': 'Lanche',
+               'quantidade': 1, 'preco_unitario': 18.90}]
+}
+
+
+class TestCicloDoWorker:
+    
+    def test_inicia_e_encerra_servicos(self, api_app, tmp_path):
+        with ServidorProdutos() as servidor:
+            api_app.config['PRODUTOS_SYNC_URL'] = servidor.url
+            api_app.config['PRODUTOS_SYNC_TRAVA'] = str(tmp_path / 'sync.lock')
+            barramento = obter_barramento()
+            
+            iniciar_worker(api_app)
+            cliente = api_app.extensions[EXTENSAO_SYNC]
+            encerrar_worker(api_app, timeout=5)
+        
+        assert barramento.encerrado
+        assert not cliente._thread.is_alive()
+    
+    def test_encerrar_sem_servicos_iniciados(self, api_app):
+        encerrar_worker(api_app, timeout=1)
+        
+        assert EXTENSAO_SYNC not in api_app.extensions
+
+
+def _porta_livre():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def subir_gunicorn(tmp_path):
+    """Sobe o gunicorn de produção (gunicorn.conf.py) num banco novo; devolve (processo, porta)"""
+    pytest.importorskip('gunicorn')
+    processos = []
+    
+    def subir(**variaveis):
+        porta = _porta_livre()
+        ambiente = {
+            **os.environ,
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'pedidos.db'}",
+            'PRODUTOS_SYNC_TRAVA': str(tmp_path / 'sync.lock'),
+            'PORT': str(porta),
+            'WEB_CONCURRENCY': '2',
+            'WSGI_THREADS': '2',
+            'GRACEFUL_TIMEOUT': '30',
+        }
+        ambiente.pop('PRODUTOS_SYNC_URL', None)
+        ambiente.update(variaveis)
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'src.main', 'inicializar-banco'],
+                       cwd=RAIZ, env=ambiente, capture_output=True, check=True)
+        processo = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'src.wsgi:app'],
+            cwd=RAIZ, env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        processos.append(processo)
+        
+        limite = time.monotonic() + 15
+        while True:
+            try:
+                conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=5)
+                conexao.request('GET', '/api/health')
+                if conexao.getresponse().status == 200:
+                    conexao.close()
+                    return processo, porta
+            except OSError:
+                if time.monotonic() > limite or processo.poll() is not None:
+                    pytest.fail('gunicorn não subiu')
+                time.sleep(0.1)
+    
+    yield subir
+    
+    for processo in processos:
+        if processo.poll() is None:
+            processo.kill()
+            processo.wait()
+
+
+class TestServidorProducao:
+    
+    def test_atende_e_encerra_com_stream_aberto(self, subir_gunicorn):
+        processo, porta = subir_gunicorn()
+        
+        conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=5)
+        conexao.request('POST', '/api/pedidos', body=json.dumps(PEDIDO),
+                        headers={'Content-Type': 'application/json'})
+        resposta = conexao.getresponse()
+        assert resposta.status == 201
+        pedido_id = json.loads(resposta.read())['id']
+        
+        conexao.request('GET', f'/api/pedidos/{pedido_id}')
+        assert conexao.getresponse().status == 200
+        conexao.close()
+        
+        stream = http.client.HTTPConnection('127.0.0.1', porta, timeout=10)
+        stream.request('GET', '/api/pedidos/stream')
+        resposta_stream = stream.getresponse()
+        assert resposta_stream.readline().startswith(b'retry:')
+        
+        # O stream aberto não segura o worker até o graceful_timeout (30 s)
+        inicio = time.monotonic()
+        processo.send_signal(signal.SIGTERM)
+        assert processo.wait(timeout=10) == 0
+        assert time.monotonic() - inicio < 10
+        stream.close()
+    
+    def test_um_unico_worker_consulta_o_servico_de_produtos(self, subir_gunicorn):
+        with ServidorProdutos() as servidor:
+            subir_gunicorn(PRODUTOS_SYNC_URL=servidor.url, WEB_CONCURRENCY='3')
+            # Cada worker inicia o cliente ao subir; só o dono da trava consulta
+            time.sleep(1)
+            
+            assert servidor.consultas == [None]
+    
+    def test_stream_recebe_pedidos_criados_em_outros_workers(self, subir_gunicorn):
+        _, porta = subir_gunicorn(EVENTOS_PROPAGACAO_SEGUNDOS='0.2')
+        stream = http.client.HTTPConnection('127.0.0.1', porta, timeout=10)
+        stream.request('GET', '/api/pedidos/stream')
+        resposta_stream = stream.getresponse()
+        assert resposta_stream.readline().startswith(b'retry:')
+        
+        criados = set()
+        for _ in range(6):
+            # Conexão nova a cada pedido: o gunicorn distribui entre os workers
+            conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=5)
+            conexao.request('POST', '/api/pedidos', body=json.dumps(PEDIDO),
+                            headers={'Content-Type': 'application/json'})
+            criados.add(json.loads(conexao.getresponse().read())['id'])
+            conexao.close()
+        
+        recebidos = set()
+        tipo = None
+        while recebidos != criados:
+            linha = resposta_stream.readline().decode('utf-8').strip()
+            if linha.startswith('event:'):
+                tipo = linha.split(':', 1)[1].strip()
+            elif linha.startswith('data:') and tipo == 'pedido_criado':
+                recebidos.add(json.loads(linha.split(':', 1)[1])['id'])
+        stream.close()
+    
+    def test_streams_abertos_nao_esgotam_as_threads(self, subir_gunicorn):
+        _, porta = subir_gunicorn(WEB_CONCURRENCY='1', WSGI_THREADS='2', CONEXOES_LONGAS_MAXIMO='2')
+        threads = 2 + 2
+        
+        streams, status = [], []
+        for _ in range(threads):
+            stream = http.client.HTTPConnection('127.0.0.1', porta, timeout=5)
+            stream.request('GET', '/api/pedidos/stream')
+            status.append(stream.getresponse().status)
+            streams.append(stream)
+        
+        conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=5)
+        conexao.request('GET', '/api/health')
+        
+        assert conexao.getresponse().status == 200
+        assert sorted(status) == [200, 200, 503, 503]
+        conexao.close()
+        for stream in streams:
+            stream.close()